@@ -0,0 +1,68 @@
+from dataclasses import replace
+
+from src.engine.actions.tactical_action import ActivateCommand
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState, Phase
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import Player
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import SyntheticGameConfig, generate_state
+
+FULL_PLAYER_COUNT = 8
+FULL_SYSTEM_COUNT = 61
+
+
+def make_engine() -> GameEngine:
+    return GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+
+
+FULL_GAME_CONFIG = SyntheticGameConfig(
+    player_count=FULL_PLAYER_COUNT,
+    system_count=FULL_SYSTEM_COUNT,
+    tactic_tokens=(3, 3),
+    fleet_tokens=(3, 3),
+    strategy_tokens=(2, 2),
+    ready_card_probability=0.0,
+    passed_probability=0.0,
+    board_token_probability=0.0,
+)
+
+
+def make_full_state() -> GameState:
+    """An action-phase state at the size of a full eight-player game, nobody having acted."""
+    state: GameState = generate_state(config=FULL_GAME_CONFIG, seed=0)
+    return replace(state, active_player=min(state.players, key=lambda player: player.initiative))
+
+
+def activate(actor: Player, system_id: int) -> ActivateCommand:
+    return ActivateCommand(
+        actor=actor, command_type=CommandType.INITIATE_TACTICAL_ACTION, system_id=system_id
+    )
+
+
+def next_scripted_command(state: GameState) -> Command:
+    """Activate the lowest free system while tactic tokens last, otherwise pass."""
+    actor: Player = state.active_player
+    if state.has_taken_turn:
+        return Command(actor=actor, command_type=CommandType.END_TURN)
+    if actor.command_sheet.tactic:
+        free: frozenset[int] = state.occupancy.system_ids - state.occupancy.activated_systems(
+            player_name=actor.name
+        )
+        if free:
+            return activate(actor=actor, system_id=min(free))
+    return Command(actor=actor, command_type=CommandType.PASS_ACTION)
+
+
+def play_scripted_action_phase(engine: GameEngine, state: GameState) -> list[CommandResult]:
+    results: list[CommandResult] = []
+    while state.phase == Phase.ACTION:
+        result: CommandResult = engine.apply_command(
+            state=state, command=next_scripted_command(state)
+        )
+        if not result.success:
+            raise RuntimeError(f"Scripted command rejected: {result.info}")
+        results.append(result)
+        state = result.new_state
+    return results
@@ -0,0 +1,198 @@
+# A small benchmark harness: each benchmark is timed in calibrated rounds, the results can be
+# saved as a JSON baseline, and a later run can be compared against that baseline, failing any
+# benchmark that regressed by more than the configured threshold.
+#
+# Saving only adds benchmarks the baseline does not have yet; existing entries are replaced only
+# when named with --benchmark-rebaseline, so that a run on a noisy machine cannot silently move
+# every figure. A baseline records the Python version it was timed on; comparing against one from
+# another major.minor version still gates, but warns that the baseline should be re-recorded.
+import fnmatch
+import json
+import platform
+import statistics
+import time
+import warnings
+from collections.abc import Callable
+from pathlib import Path
+
+import pytest
+
+MIN_ROUND_SECONDS = 0.01
+DEFAULT_ROUNDS = 21
+DEFAULT_THRESHOLD = 0.25
+# A timing fails the comparison only if each of these regressed by more than the threshold, so a
+# single lucky round in the baseline or a single slow stretch in this run does not fail it alone.
+_TIMING_METRICS = ("seconds", "median_seconds")
+
+_RESULTS: dict[str, dict[str, float]] = {}
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("benchmark")
+    group.addoption(
+        "--benchmark-save",
+        type=Path,
+        default=None,
+        help="Add the benchmarks missing from this baseline JSON file to it.",
+    )
+    group.addoption(
+        "--benchmark-rebaseline",
+        action="append",
+        default=[],
+        metavar="PATTERN",
+        help="With --benchmark-save, also replace the saved benchmarks matching this glob.",
+    )
+    group.addoption(
+        "--benchmark-compare",
+        type=Path,
+        default=None,
+        help="Fail benchmarks that regressed against this baseline JSON file.",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed relative regression before a compared benchmark fails (0.25 = 25%%).",
+    )
+
+
+class Benchmark:
+    def __init__(self, name: str, baseline: dict[str, float] | None, threshold: float) -> None:
+        self.name: str = name
+        self.baseline: dict[str, float] | None = baseline
+        self.threshold: float = threshold
+
+    def __call__[T](self, function: Callable[[], T], rounds: int = DEFAULT_ROUNDS) -> T:
+        """Time `function` and return its result. The fastest round is the reported figure."""
+        iterations: int = 1
+        while True:
+            started: float = time.perf_counter()
+            for _ in range(iterations):
+                function()
+            if time.perf_counter() - started >= MIN_ROUND_SECONDS:
+                break
+            iterations *= 2
+        per_call: list[float] = []
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for _ in range(iterations):
+                result: T = function()
+            per_call.append((time.perf_counter() - started) / iterations)
+        self._record(
+            {
+                "seconds": min(per_call),
+                "median_seconds": statistics.median(per_call),
+                "iterations": iterations,
+            },
+            compared=_TIMING_METRICS,
+        )
+        return result
+
+    def record_bytes(self, value: int) -> None:
+        """Record a memory measurement instead of a timing."""
+        self._record({"bytes": value}, compared=("bytes",))
+
+    def _record(self, results: dict[str, float], compared: tuple[str, ...]) -> None:
+        _RESULTS[self.name] = results
+        if self.baseline is None or not all(metric in self.baseline for metric in compared):
+            return
+        baseline: dict[str, float] = self.baseline
+        # The least regressed metric is the one that must exceed the threshold.
+        metric: str = min(compared, key=lambda metric: results[metric] / baseline[metric])
+        regression: float = results[metric] / baseline[metric] - 1
+        if regression > self.threshold:
+            pytest.fail(
+                f"{self.name} regressed by {regression:.0%} "
+                f"({baseline[metric]:.3g} -> {results[metric]:.3g} {metric}), "
+                f"threshold is {self.threshold:.0%}"
+            )
+
+
+def _python_version() -> str:
+    return platform.python_version()
+
+
+def _same_python(recorded: str) -> bool:
+    return recorded.split(".")[:2] == _python_version().split(".")[:2]
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(request: pytest.FixtureRequest) -> dict[str, dict[str, float]]:
+    path: Path | None = request.config.getoption("--benchmark-compare")
+    if path is None:
+        return {}
+    saved: dict = json.loads(path.read_text())
+    recorded: str = saved["machine"]["python"]
+    if not _same_python(recorded):
+        # Still compared: a regression large enough to fail is rarely an interpreter's doing,
+        # and skipping the gate would hide every regression until the baseline is re-recorded.
+        warnings.warn(
+            f"{path} was recorded on Python {recorded}, not {_python_version()}; "
+            "re-record it with --benchmark-rebaseline='*'.",
+            stacklevel=1,
+        )
+    return saved["benchmarks"]
+
+
+@pytest.fixture
+def benchmark(
+    request: pytest.FixtureRequest, benchmark_baseline: dict[str, dict[str, float]]
+) -> Benchmark:
+    return Benchmark(
+        name=request.node.name,
+        baseline=benchmark_baseline.get(request.node.name),
+        threshold=request.config.getoption("--benchmark-threshold"),
+    )
+
+
+def _rebaselined(name: str, patterns: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    path: Path | None = config.getoption("--benchmark-save")
+    if path is None or not path.exists():
+        return
+    existing: dict = json.loads(path.read_text())
+    patterns: list[str] = config.getoption("--benchmark-rebaseline")
+    recorded: str = existing["machine"]["python"]
+    kept: bool = any(not _rebaselined(name, patterns) for name in existing["benchmarks"])
+    if kept and not _same_python(recorded):
+        raise pytest.UsageError(
+            f"{path} was recorded on Python {recorded}, not {_python_version()}; "
+            "re-save all of it with --benchmark-rebaseline='*'"
+        )
+
+
+def pytest_sessionfinish(session: pytest.Session) -> None:
+    path: Path | None = session.config.getoption("--benchmark-save")
+    if path is None or not _RESULTS:
+        return
+    patterns: list[str] = session.config.getoption("--benchmark-rebaseline")
+    saved: dict[str, dict[str, float]] = {}
+    machine: dict[str, str] = {
+        "python": _python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+    }
+    if path.exists():
+        existing: dict = json.loads(path.read_text())
+        saved = existing["benchmarks"]
+        if any(not _rebaselined(name, patterns) for name in saved):
+            machine = existing["machine"]
+    added: dict[str, dict[str, float]] = {
+        name: results
+        for name, results in _RESULTS.items()
+        if name not in saved or _rebaselined(name, patterns)
+    }
+    if path.exists() and not added:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {"machine": machine, "benchmarks": dict(sorted({**saved, **added}.items()))},
+            indent=2,
+        )
+        + "\n"
+    )
@@ -0,0 +1,248 @@
+import subprocess
+import sys
+import threading
+from dataclasses import replace
+from pathlib import Path
+
+import pytest
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.concurrent_session import (
+    ConcurrentGameSession,
+    SessionSnapshot,
+    StaleVersionError,
+)
+from src.engine.core.fingerprint import fingerprint
+from src.engine.core.game_engine import BatchResult, CommandResult, GameEngine
+from src.engine.core.game_session import GameSession
+from src.engine.core.game_state import GameState, Phase, TurnContext
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.result_cache import CommandResultCache
+from src.engine.simulation.perft import PerftResult, perft
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+from src.engine.turns.end_turn import EndTurnEvent
+from src.engine.turns.status_phase import status_phase_cleanup_events
+
+from .common import (
+    activate,
+    make_engine,
+    make_full_state,
+    next_scripted_command,
+    play_scripted_action_phase,
+)
+
+ENGINE: GameEngine = make_engine()
+STATE: GameState = make_full_state()
+ACTOR = STATE.active_player
+AFTER_ACTION: GameState = replace(STATE, turn_context=TurnContext(has_taken_action=True))
+COMMAND_CASES: dict[str, tuple[GameState, Command, bool]] = {
+    "initiate_tactical_action": (STATE, activate(actor=ACTOR, system_id=30), True),
+    "end_turn": (AFTER_ACTION, Command(actor=ACTOR, command_type=CommandType.END_TURN), True),
+    "pass_action": (STATE, Command(actor=ACTOR, command_type=CommandType.PASS_ACTION), True),
+    "rejected_end_turn": (STATE, Command(actor=ACTOR, command_type=CommandType.END_TURN), False),
+}
+
+
+@pytest.mark.parametrize("case", COMMAND_CASES)
+def test_apply_command(benchmark, case: str) -> None:
+    state, command, expected_success = COMMAND_CASES[case]
+    result: CommandResult = benchmark(lambda: ENGINE.apply_command(state=state, command=command))
+    assert result.success == expected_success
+
+
+def test_end_turn_rotation_loop(benchmark) -> None:
+    def rotate_eight_rounds() -> GameState:
+        state: GameState = STATE
+        for _ in range(8 * len(STATE.players)):
+            state = EndTurnEvent().apply(previous_state=state)
+        return state
+
+    assert benchmark(rotate_eight_rounds).active_player == STATE.active_player
+
+
+def test_check_invariants(benchmark) -> None:
+    invariants = make_all_invariants()
+    assert benchmark(lambda: all(invariant.check(state=STATE) for invariant in invariants))
+
+
+def test_full_action_phase(benchmark) -> None:
+    results: list[CommandResult] = benchmark(
+        lambda: play_scripted_action_phase(engine=ENGINE, state=STATE)
+    )
+    assert len(results) > 3 * len(STATE.players)
+
+
+def test_full_action_phase_transactional(benchmark) -> None:
+    engine = GameEngine(
+        rules_engine=ENGINE.rules_engine, invariants=ENGINE.invariants, transactional=True
+    )
+    results: list[CommandResult] = benchmark(
+        lambda: play_scripted_action_phase(engine=engine, state=STATE)
+    )
+    assert (
+        results[-1].new_state
+        == play_scripted_action_phase(engine=ENGINE, state=STATE)[-1].new_state
+    )
+
+
+def test_full_action_phase_unbounded_cascades(benchmark) -> None:
+    """Against test_full_action_phase: the cost of the default cascade budget."""
+    engine = GameEngine(
+        rules_engine=ENGINE.rules_engine, invariants=ENGINE.invariants, cascade_budget=None
+    )
+    results: list[CommandResult] = benchmark(
+        lambda: play_scripted_action_phase(engine=engine, state=STATE)
+    )
+    assert len(results) > 3 * len(STATE.players)
+
+
+def test_full_action_phase_batch(benchmark) -> None:
+    state: GameState = STATE
+    commands: list[Command] = []
+    while state.phase == Phase.ACTION:
+        commands.append(next_scripted_command(state))
+        state = ENGINE.apply_command(state=state, command=commands[-1]).new_state
+    batch: BatchResult = benchmark(lambda: ENGINE.apply_commands(state=STATE, commands=commands))
+    assert batch.new_state == state
+
+
+def test_session_undo_redo_full_action_phase(benchmark) -> None:
+    session = GameSession(initial_state=STATE, engine=ENGINE)
+    session.history.extend(play_scripted_action_phase(engine=ENGINE, state=STATE))
+    tip: GameState = session.current_state
+
+    def undo_then_redo_everything() -> GameState:
+        while session.history:
+            session.undo()
+        while session.current_node.redo_child is not None:
+            session.redo()
+        return session.current_state
+
+    assert benchmark(undo_then_redo_everything) is tip
+
+
+@pytest.mark.parametrize("clients", [1, 8])
+def test_concurrent_session_full_action_phase(benchmark, clients: int) -> None:
+    """Clients racing to play one action phase, each retrying on stale submissions."""
+
+    def play() -> ConcurrentGameSession:
+        session = ConcurrentGameSession(initial_state=STATE, engine=ENGINE)
+
+        def client() -> None:
+            while True:
+                snapshot: SessionSnapshot = session.snapshot()
+                if snapshot.state.phase != Phase.ACTION:
+                    return
+                try:
+                    session.apply_command(
+                        command=next_scripted_command(snapshot.state),
+                        expected_version=snapshot.version,
+                    )
+                except StaleVersionError:
+                    continue
+
+        threads: list[threading.Thread] = [threading.Thread(target=client) for _ in range(clients)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return session
+
+    session: ConcurrentGameSession = benchmark(play)
+    assert session.current_state.phase != Phase.ACTION
+    assert session.version == len(play_scripted_action_phase(engine=ENGINE, state=STATE))
+
+
+def test_full_action_phase_cached(benchmark) -> None:
+    """Replaying an action phase already seen, as a bot re-exploring the same line does."""
+    engine = GameEngine(
+        rules_engine=ENGINE.rules_engine,
+        invariants=ENGINE.invariants,
+        result_cache=CommandResultCache(),
+    )
+    state: GameState = STATE
+    commands: list[Command] = []
+    while state.phase == Phase.ACTION:
+        commands.append(next_scripted_command(state))
+        state = ENGINE.apply_command(state=state, command=commands[-1]).new_state
+
+    def replay() -> GameState:
+        replayed: GameState = STATE
+        for command in commands:
+            replayed = engine.apply_command(state=replayed, command=command).new_state
+        return replayed
+
+    replay()
+    assert benchmark(replay) == state
+
+
+def test_fingerprint(benchmark) -> None:
+    """A new state whose players and systems were all fingerprinted before."""
+    assert len(benchmark(lambda: fingerprint(replace(STATE)))) == 16
+
+
+PERFT_STATE: GameState = generate_state(
+    config=SyntheticGameConfig(
+        player_count=3,
+        system_count=7,
+        tactic_tokens=(2, 3),
+        ready_card_probability=0.0,
+        passed_probability=0.0,
+    ),
+    seed=1,
+)
+
+
+@pytest.mark.parametrize("dedupe", [False, True], ids=["sequences", "distinct"])
+def test_perft_depth_5(benchmark, dedupe: bool) -> None:
+    """Raw engine throughput; divide 1533 applied commands by the time for nodes per second."""
+    result: PerftResult = benchmark(
+        lambda: perft(engine=ENGINE, state=PERFT_STATE, depth=5, dedupe=dedupe), rounds=3
+    )
+    assert result.nodes == 1533
+
+
+SCALES: dict[str, SyntheticGameConfig] = {
+    "3p_19s": SyntheticGameConfig(player_count=3, system_count=19, strategy_cards_per_player=2),
+    "6p_37s": SyntheticGameConfig(player_count=6, system_count=37),
+    "8p_61s": SyntheticGameConfig(player_count=8, system_count=61),
+    "8p_200s": SyntheticGameConfig(player_count=8, system_count=200),
+}
+
+
+@pytest.mark.parametrize("scale", SCALES)
+def test_random_command_stream(benchmark, scale: str) -> None:
+    state: GameState = generate_state(config=SCALES[scale], seed=0)
+    stream = benchmark(
+        lambda: list(generate_command_stream(engine=ENGINE, state=state, seed=0, max_commands=50))
+    )
+    assert all(result.success for _, result in stream)
+
+
+def test_engine_startup(benchmark) -> None:
+    """A fresh interpreter importing the engine and building it, as every worker process does."""
+    script = (
+        "from src.engine.core.game_engine import GameEngine\n"
+        "from src.engine.core.ti4_rules_engine import TI4RulesEngine\n"
+        "GameEngine(rules_engine=TI4RulesEngine())\n"
+    )
+    root = Path(__file__).resolve().parent.parent
+    benchmark(
+        lambda: subprocess.run([sys.executable, "-c", script], cwd=root, check=True), rounds=5
+    )
+
+
+def test_status_phase_cleanup(benchmark) -> None:
+    end_of_round: GameState = play_scripted_action_phase(engine=ENGINE, state=STATE)[-1].new_state
+
+    def clean_up() -> GameState:
+        state: GameState = end_of_round
+        for event in status_phase_cleanup_events():
+            state = event.apply(previous_state=state)
+        return state
+
+    assert not benchmark(clean_up).occupancy.system_masks
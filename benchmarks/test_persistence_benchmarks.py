@@ -0,0 +1,83 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from src.engine.core.command import Command
+from src.engine.core.game_engine import CommandResult
+from src.engine.core.game_state import GameState
+from src.engine.persistence.game_archive import ArchiveCodec, ArchiveWriter, GameArchive
+from src.engine.simulation.analytics import GameStatistics, collect_statistics
+from src.engine.simulation.synthetic import generate_command_stream
+
+from .common import make_engine, make_full_state
+
+ENGINE = make_engine()
+STATE: GameState = make_full_state()
+GAMES: dict[str, list[tuple[Command, CommandResult]]] = {
+    f"game-{seed}": list(
+        generate_command_stream(engine=ENGINE, state=STATE, seed=seed, max_commands=200)
+    )
+    for seed in range(8)
+}
+LAST_GAME: str = f"game-{len(GAMES) - 1}"
+# Late in the last game, where replaying from the start costs most.
+SEEK_MOVE: int = len(GAMES[LAST_GAME]) - 1
+
+
+def _write_archive(path: Path, codec: ArchiveCodec) -> Path:
+    with ArchiveWriter(path, codec=codec) as writer:
+        for game_id, stream in GAMES.items():
+            writer.add_game(game_id, initial_state=STATE, moves=stream)
+    return path
+
+
+@pytest.fixture(scope="module")
+def archives(tmp_path_factory: pytest.TempPathFactory) -> dict[ArchiveCodec, Path]:
+    directory: Path = tmp_path_factory.mktemp("archives")
+    return {
+        codec: _write_archive(directory / f"games.{codec.value}", codec=codec)
+        for codec in ArchiveCodec
+    }
+
+
+@pytest.mark.parametrize("codec", list(ArchiveCodec))
+def test_archive_seek_to_move(benchmark, archives: dict[ArchiveCodec, Path], codec: str) -> None:
+    """Opening the archive and rebuilding the state late in the last game."""
+
+    def seek() -> GameState:
+        with GameArchive(archives[ArchiveCodec(codec)]) as archive:
+            return archive.state_at(LAST_GAME, move=SEEK_MOVE)
+
+    state: GameState = benchmark(seek)
+    assert state == GAMES[LAST_GAME][SEEK_MOVE - 1][1].new_state
+
+
+def test_command_log_replay_to_move(benchmark) -> None:
+    """The same state from a pickled command log, replayed through the engine from the start."""
+    log: bytes = pickle.dumps([command for command, _ in GAMES[LAST_GAME]])
+
+    def replay() -> GameState:
+        state: GameState = STATE
+        for command in pickle.loads(log)[:SEEK_MOVE]:
+            state = ENGINE.apply_command(state=state, command=command).new_state
+        return state
+
+    state: GameState = benchmark(replay)
+    assert state == GAMES[LAST_GAME][SEEK_MOVE - 1][1].new_state
+
+
+@pytest.mark.parametrize("codec", list(ArchiveCodec))
+def test_archive_bytes(benchmark, archives: dict[ArchiveCodec, Path], codec: str) -> None:
+    benchmark.record_bytes(archives[ArchiveCodec(codec)].stat().st_size)
+
+
+def test_command_log_bytes(benchmark) -> None:
+    """Uncompressed per-game pickled logs of commands and results, as stored individually."""
+    benchmark.record_bytes(sum(len(pickle.dumps((STATE, stream))) for stream in GAMES.values()))
+
+
+def test_collect_statistics(benchmark, archives: dict[ArchiveCodec, Path]) -> None:
+    """Streaming every archived game's events into the aggregate statistics, in one process."""
+    statistics: GameStatistics = benchmark(lambda: collect_statistics(archives[ArchiveCodec.ZLIB]))
+    assert statistics.moves == sum(len(stream) for stream in GAMES.values())
@@ -0,0 +1,106 @@
+import asyncio
+import pickle
+
+import numpy as np
+import pytest
+
+from src.engine.core.game_state import GameState
+from src.engine.simulation.evaluation import EvaluationBroker, FeatureEncoder, LinearEvaluator
+from src.engine.simulation.fuzzing import Fuzzer, FuzzReport
+from src.engine.simulation.shared_states import (
+    SharedGame,
+    SharedState,
+    SharedStatePool,
+    detach_all,
+)
+from src.engine.simulation.synthetic import generate_command_stream
+
+from .common import make_engine, make_full_state
+
+STATE: GameState = make_full_state()
+STATES: list[GameState] = [
+    result.new_state
+    for _, result in generate_command_stream(
+        engine=make_engine(), state=STATE, seed=0, max_commands=64
+    )
+]
+ENCODER: FeatureEncoder = FeatureEncoder.for_state(STATE)
+EVALUATOR = LinearEvaluator(
+    weights=np.linspace(-1.0, 1.0, ENCODER.feature_count * len(STATE.players)).reshape(
+        ENCODER.feature_count, len(STATE.players)
+    )
+)
+SEARCHERS = 128
+EVALUATIONS_PER_SEARCHER = 8
+
+
+def _run_searchers(broker: EvaluationBroker, searchers: int) -> int:
+    async def search(index: int) -> int:
+        for step in range(EVALUATIONS_PER_SEARCHER):
+            await broker.evaluate(STATES[(index + step) % len(STATES)])
+        return EVALUATIONS_PER_SEARCHER
+
+    async def run_all() -> int:
+        return sum(await asyncio.gather(*(search(index) for index in range(searchers))))
+
+    return asyncio.run(run_all())
+
+
+@pytest.mark.parametrize("max_batch_size", [1, 16, 128])
+def test_evaluation_broker_throughput(benchmark, max_batch_size: int) -> None:
+    """128 concurrent searches each waiting on 8 evaluations in turn; larger batches win."""
+    broker = EvaluationBroker(
+        evaluator=EVALUATOR, encoder=ENCODER, max_batch_size=max_batch_size, max_delay=0.001
+    )
+    assert benchmark(lambda: _run_searchers(broker, SEARCHERS), rounds=3) == 1024
+
+
+@pytest.mark.parametrize("max_delay", [0.0, 0.001])
+def test_evaluation_broker_lone_search_latency(benchmark, max_delay: float) -> None:
+    """A single search pays the batching deadline on every evaluation, as nothing fills a batch."""
+    broker = EvaluationBroker(evaluator=EVALUATOR, encoder=ENCODER, max_delay=max_delay)
+    assert benchmark(lambda: _run_searchers(broker, 1), rounds=3) == EVALUATIONS_PER_SEARCHER
+
+
+def test_state_transfer_pickle(benchmark) -> None:
+    """Sending every state to a worker as its own pickled task, both ends of the trip."""
+    received: list[GameState] = benchmark(
+        lambda: [pickle.loads(pickle.dumps(state)) for state in STATES]
+    )
+    assert received == STATES
+
+
+def test_state_transfer_shared_memory(benchmark) -> None:
+    """The same trip through one shared block: encode, pickle the handles, decode, release."""
+    with SharedStatePool() as pool:
+        game: SharedGame = pool.publish_game(STATE)
+
+        def transfer() -> list[GameState]:
+            handles: list[SharedState] = pool.publish(game, STATES)
+            received: list[GameState] = [
+                pickle.loads(pickle.dumps(handle)).state for handle in handles
+            ]
+            for handle in handles:
+                pool.release(handle)
+            return received
+
+        assert benchmark(transfer) == STATES
+    detach_all()
+
+
+def test_bytes_per_task_pickle(benchmark) -> None:
+    benchmark.record_bytes(len(pickle.dumps(STATES[-1])))
+
+
+def test_bytes_per_task_shared_memory(benchmark) -> None:
+    with SharedStatePool() as pool:
+        handle: SharedState = pool.publish(pool.publish_game(STATE), [STATES[-1]])[0]
+        benchmark.record_bytes(len(pickle.dumps(handle)))
+
+
+@pytest.mark.parametrize("legal_probability", [0.0, 0.5])
+def test_fuzz_sequences(benchmark, legal_probability: float) -> None:
+    """100 fuzzed sequences of 32 commands with every check; divide for execs per second."""
+    fuzzer = Fuzzer(make_engine(), legal_probability=legal_probability)
+    report: FuzzReport = benchmark(lambda: fuzzer.run(sequences=100), rounds=3)
+    assert report.failures == ()
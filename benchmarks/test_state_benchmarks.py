@@ -0,0 +1,90 @@
+import pytest
+
+from src.engine.core.galaxy_layout import GalaxyLayout
+from src.engine.core.game_engine import CommandResult
+from src.engine.core.game_state import GameState
+from src.engine.core.projection import PlayerView
+from src.engine.util.sizing import deep_getsizeof
+
+from .common import (
+    FULL_SYSTEM_COUNT,
+    make_engine,
+    make_full_state,
+    play_scripted_action_phase,
+)
+
+STATE: GameState = make_full_state()
+
+
+def test_get_system_full_galaxy(benchmark) -> None:
+    def look_up_every_system() -> int:
+        return sum(STATE.get_system(id=system_id).id for system_id in range(FULL_SYSTEM_COUNT))
+
+    assert benchmark(look_up_every_system) == sum(range(FULL_SYSTEM_COUNT))
+
+
+def test_get_player_all_players(benchmark) -> None:
+    names: list[str] = [player.name for player in STATE.players]
+    assert benchmark(lambda: [STATE.get_player(name=name) for name in names]) == list(STATE.players)
+
+
+def test_memory_full_state(benchmark) -> None:
+    benchmark.record_bytes(deep_getsizeof(STATE))
+
+
+def test_memory_per_successor_state(benchmark) -> None:
+    """Bytes each successor adds on top of the states it shares structure with."""
+    results: list[CommandResult] = play_scripted_action_phase(engine=make_engine(), state=STATE)
+    seen: set[int] = set()
+    initial_bytes: int = deep_getsizeof(STATE, seen=seen)
+    total_bytes: int = deep_getsizeof([result.new_state for result in results], seen=seen)
+    assert initial_bytes > 0
+    benchmark.record_bytes(total_bytes // len(results))
+
+
+def test_memory_per_retained_event(benchmark) -> None:
+    results: list[CommandResult] = play_scripted_action_phase(engine=make_engine(), state=STATE)
+    events = [event for result in results for event in result.events]
+    benchmark.record_bytes(deep_getsizeof(events) // len(events))
+
+
+def test_galaxy_layout_build(benchmark) -> None:
+    layout: GalaxyLayout = benchmark(lambda: GalaxyLayout.from_galaxy(STATE.galaxy))
+    assert layout.distances.shape == (FULL_SYSTEM_COUNT, FULL_SYSTEM_COUNT)
+
+
+def test_galaxy_layout_reachability_queries(benchmark) -> None:
+    layout: GalaxyLayout = STATE.layout
+
+    def reachable_within_two() -> int:
+        return sum(len(layout.within(system_id, max_distance=2)) for system_id in layout.system_ids)
+
+    assert benchmark(reachable_within_two) > FULL_SYSTEM_COUNT
+
+
+def test_roll_dice_batch(benchmark) -> None:
+    rolls, _ = benchmark(lambda: STATE.rng.roll_dice(count=100_000))
+    assert len(rolls) == 100_000
+
+
+@pytest.mark.parametrize("incremental", [False, True], ids=["from_scratch", "incremental"])
+def test_player_views_full_action_phase(benchmark, incremental: bool) -> None:
+    """Keeping a view for each of the eight players up to date through an action phase."""
+    results: list[CommandResult] = play_scripted_action_phase(engine=make_engine(), state=STATE)
+    names: list[str] = [player.name for player in STATE.players]
+
+    def follow_game() -> list[PlayerView]:
+        views: list[PlayerView] = [PlayerView.from_state(STATE, viewer=name) for name in names]
+        for result in results:
+            if incremental:
+                views = [
+                    view.advanced(events=result.events, new_state=result.new_state)
+                    for view in views
+                ]
+            else:
+                views = [PlayerView.from_state(result.new_state, viewer=name) for name in names]
+        return views
+
+    assert benchmark(follow_game)[0] == PlayerView.from_state(
+        results[-1].new_state, viewer=names[0]
+    )
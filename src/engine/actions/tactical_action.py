@@ -1,63 +1,80 @@
 from collections.abc import Sequence
 from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import TYPE_CHECKING, ClassVar
 
 from src.engine.core.command import Command, CommandRule, CommandRuleWhenApplicable, CommandType
-from src.engine.core.event import Event, EventRule
+from src.engine.core.event import Event, EventRule, register_event
 from src.engine.core.game_state import GameState
+from src.engine.core.occupancy import CommandTokenIndex
 from src.engine.core.player import CommandSheet
+from src.engine.core.state_builder import BuilderEvent, GameStateBuilder
 from src.engine.tokens import CommandToken
 
+if TYPE_CHECKING:
+    from src.engine.core.projection import ViewChanges
+
 
 @dataclass(frozen=True)
 class ActivateCommand(Command):
     system_id: int
 
 
-class ActivateSystemEvent(Event):
-    def __init__(self, player_id: str, system_id: int) -> None:
-        self.system_id: int = system_id
-        self.player_id: str = player_id
+class TacticalActionEventType(IntEnum):
+    """Type codes of the tactical action events; archived games store them, so never reuse one.
 
-    payload: str = "ActivateSystemEvent"
+    Codes are taken from those reserved for this module in `RULE_REGISTRY`.
+    """
 
-    def apply(self, previous_state: GameState) -> GameState:
-        active_system = previous_state.get_system(id=self.system_id)
-        new_system = replace(
-            active_system,
-            command_tokens=(
-                *active_system.command_tokens,
-                CommandToken(player_name=self.player_id),
-            ),
-        )
-        new_galaxy = {
-            system for system in previous_state.galaxy if system.id != self.system_id
-        }.union({new_system})
-        old_player = previous_state.get_player(name=self.player_id)
-        new_player = replace(
-            old_player,
-            command_sheet=replace(
-                old_player.command_sheet, tactic=old_player.command_sheet.tactic[1:]
-            ),
+    ACTIVATE_SYSTEM = 1
+    TACTICAL_ACTION_COMPLETED = 2
+
+
+@register_event(TacticalActionEventType.ACTIVATE_SYSTEM)
+@dataclass(frozen=True, slots=True)
+class ActivateSystemEvent(BuilderEvent):
+    payload: ClassVar[str] = "ActivateSystemEvent"
+
+    player_id: str
+    system_id: int
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        active_system = builder.get_system(id=self.system_id)
+        builder.replace_system(
+            replace(
+                active_system,
+                command_tokens=(
+                    *active_system.command_tokens,
+                    CommandToken(player_name=self.player_id),
+                ),
+            )
         )
-        players = tuple(
-            new_player if player.name == self.player_id else player
-            for player in previous_state.players
+        old_player = builder.get_player(name=self.player_id)
+        builder.replace_player(
+            replace(
+                old_player,
+                command_sheet=replace(
+                    old_player.command_sheet, tactic=old_player.command_sheet.tactic[1:]
+                ),
+            )
         )
 
-        return replace(
-            previous_state,
-            galaxy=new_galaxy,
-            players=players,
-        )
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.players.add(self.player_id)
+        changes.systems.add(self.system_id)
+        return True
 
 
-class TacticalActionCompletedEvent(Event):
-    payload: str = "TacticalActionCompletedEvent"
+@register_event(TacticalActionEventType.TACTICAL_ACTION_COMPLETED)
+@dataclass(frozen=True, slots=True)
+class TacticalActionCompletedEvent(BuilderEvent):
+    payload: ClassVar[str] = "TacticalActionCompletedEvent"
 
-    def apply(self, previous_state: GameState) -> GameState:
-        return replace(
-            previous_state, turn_context=replace(previous_state.turn_context, has_taken_action=True)
-        )
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        builder.set(turn_context=replace(builder.turn_context, has_taken_action=True))
+
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        return True
 
 
 class InitiateTacticalActionCommandRule(CommandRuleWhenApplicable[ActivateCommand]):
@@ -69,14 +86,12 @@ class InitiateTacticalActionCommandRule(CommandRuleWhenApplicable[ActivateComman
         return command.command_type == CommandType.INITIATE_TACTICAL_ACTION
 
     def is_legal_given_applicable(self, state: GameState, command: ActivateCommand) -> bool:
-        try:
-            system = state.get_system(id=command.system_id)
-        except ValueError:
-            return False
+        occupancy: CommandTokenIndex = state.occupancy
         return (
             (state.active_player == command.actor)
             and not state.has_taken_turn
-            and not any(token.player_name == command.actor.name for token in system.command_tokens)
+            and command.system_id in occupancy.system_ids
+            and not occupancy.has_token(system_id=command.system_id, player_name=command.actor.name)
             and len(command.actor.command_sheet.tactic) > 0
         )
 
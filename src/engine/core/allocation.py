@@ -0,0 +1,124 @@
+import random
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.engine.core.instrumentation import EngineProbe, EngineStep
+
+if TYPE_CHECKING:
+    from src.engine.core.command import Command
+
+
+@dataclass
+class StepAllocations:
+    calls: int = 0
+    # Bytes still allocated when the step finished, summed over calls.
+    net_bytes: int = 0
+    # Most bytes allocated above the starting point at any moment of a call, summed over calls.
+    peak_bytes: int = 0
+    # Memory blocks (roughly, objects) still allocated when the step finished, summed over calls.
+    net_blocks: int = 0
+
+    @property
+    def mean_peak_bytes(self) -> float:
+        return self.peak_bytes / self.calls if self.calls else 0.0
+
+
+@dataclass
+class _OpenStep:
+    start_bytes: int
+    start_blocks: int
+    # The traced peak when the step started; a lower peak at exit was reached before the step.
+    start_peak: int
+    # The highest traced memory seen by steps nested in this one, whose entry reset the peak.
+    nested_peak: int = 0
+
+
+class AllocationProfiler(EngineProbe):
+    """Attributes memory allocated by sampled commands to commands, rules and event types.
+
+    Memory is measured with `tracemalloc`, which is only tracing while a sampled command runs
+    (unless it was already started elsewhere), so unsampled commands run at full speed. The
+    traced peak is only reset when this profiler started tracing, so that the peak of whoever
+    else traces is kept; a step that stays below that earlier peak then reports as its peak the
+    larger of its starting and final memory.
+    Amounts are inclusive: a command's figures include those of its rules and events. Keys are
+    the same as `EngineInstrumentation`'s: command type for commands, class name otherwise.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, seed: int = 0) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {sample_rate}")
+        self.sample_rate: float = sample_rate
+        self.allocations: dict[tuple[EngineStep, str], StepAllocations] = {}
+        self._random: random.Random = random.Random(seed)
+        self._open_steps: list[_OpenStep] = []
+        self._started_tracing: bool = False
+
+    def sample(self, command: Command) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def enter(self, step: EngineStep, name: str) -> None:
+        if not self._open_steps and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        current, peak = tracemalloc.get_traced_memory()
+        if self._started_tracing:
+            if self._open_steps:
+                parent: _OpenStep = self._open_steps[-1]
+                parent.nested_peak = max(parent.nested_peak, peak)
+            tracemalloc.reset_peak()
+            peak = current
+        self._open_steps.append(
+            _OpenStep(start_bytes=current, start_blocks=sys.getallocatedblocks(), start_peak=peak)
+        )
+
+    def exit(self, step: EngineStep, name: str) -> None:
+        blocks: int = sys.getallocatedblocks()
+        current, peak = tracemalloc.get_traced_memory()
+        open_step: _OpenStep = self._open_steps.pop()
+        peak = max(peak, open_step.nested_peak)
+        if peak <= open_step.start_peak:
+            peak = max(current, open_step.start_bytes)
+        if self._open_steps:
+            parent: _OpenStep = self._open_steps[-1]
+            parent.nested_peak = max(parent.nested_peak, peak)
+        allocations: StepAllocations | None = self.allocations.get((step, name))
+        if allocations is None:
+            allocations = self.allocations[(step, name)] = StepAllocations()
+        allocations.calls += 1
+        allocations.net_bytes += current - open_step.start_bytes
+        allocations.peak_bytes += peak - open_step.start_bytes
+        allocations.net_blocks += blocks - open_step.start_blocks
+        if not self._open_steps and self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def reset(self) -> None:
+        self.allocations.clear()
+
+    def top(
+        self, count: int = 10, step: EngineStep | None = None, by: str = "peak_bytes"
+    ) -> list[tuple[EngineStep, str, StepAllocations]]:
+        """The `count` entries allocating the most, by any `StepAllocations` field."""
+        entries: list[tuple[EngineStep, str, StepAllocations]] = [
+            (entry_step, name, allocations)
+            for (entry_step, name), allocations in self.allocations.items()
+            if step is None or entry_step == step
+        ]
+        entries.sort(key=lambda entry: getattr(entry[2], by), reverse=True)
+        return entries[:count]
+
+    def report(self, count: int = 10, step: EngineStep | None = None) -> str:
+        lines: list[str] = [
+            f"{'step':<10} {'name':<36} {'calls':>8} {'peak B':>12} {'net B':>12} "
+            f"{'net blocks':>10}"
+        ]
+        for entry_step, name, allocations in self.top(count=count, step=step):
+            lines.append(
+                f"{entry_step.value:<10} {name:<36} {allocations.calls:>8} "
+                f"{allocations.peak_bytes:>12} {allocations.net_bytes:>12} "
+                f"{allocations.net_blocks:>10}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,105 @@
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.engine.core.event import Event, EventRule
+    from src.engine.core.game_state import GameState
+
+# How many links of the cascade an aborted command reports when it ran out of budget.
+CHAIN_TAIL_LENGTH = 32
+
+
+class CascadeAbortReason(StrEnum):
+    EVENT_BUDGET = "event_budget"
+    TIME_BUDGET = "time_budget"
+    CYCLE = "cycle"
+
+
+@dataclass(frozen=True)
+class CascadeBudget:
+    """Limits on the events one command may resolve.
+
+    A command resolving more than `max_events` events, or still resolving after `max_seconds`,
+    is aborted. Once a cascade has resolved `watch_after` events, every rule that triggers more
+    events is also checked against the rules that triggered before: the same rule triggering on
+    the same event in the same state would trigger the same events forever, so the command is
+    aborted as a cycle. Commands with shorter cascades pay a counter increment per event.
+    """
+
+    max_events: int = 10_000
+    max_seconds: float | None = None
+    watch_after: int = 64
+
+    def __post_init__(self) -> None:
+        if self.max_events < 1:
+            raise ValueError(f"A cascade must be allowed at least one event, got {self.max_events}")
+
+
+@dataclass(frozen=True, slots=True)
+class CascadeLink:
+    """`rule` triggered more events when `event` was resolved."""
+
+    rule: str
+    event: Event
+
+
+class CascadeAbortedError(RuntimeError):
+    def __init__(self, reason: CascadeAbortReason, chain: tuple[CascadeLink, ...]) -> None:
+        super().__init__(f"Event cascade aborted ({reason.value}) after {len(chain)} links")
+        self.reason: CascadeAbortReason = reason
+        self.chain: tuple[CascadeLink, ...] = chain
+
+
+class CascadeGuard:
+    """Enforces a `CascadeBudget` over the resolution of one command."""
+
+    __slots__ = ("budget", "events", "_deadline", "_links", "_seen")
+
+    def __init__(self, budget: CascadeBudget) -> None:
+        self.budget: CascadeBudget = budget
+        self.events: int = 0
+        self._deadline: float | None = (
+            time.perf_counter() + budget.max_seconds if budget.max_seconds is not None else None
+        )
+        self._links: list[CascadeLink] = []
+        # The position in `_links` where each rule, event type, event and state was first seen.
+        # Events are keyed by fingerprint, so that they need not be hashable.
+        self._seen: dict[tuple[int, type, bytes, bytes], int] = {}
+
+    @property
+    def watching(self) -> bool:
+        return self.events > self.budget.watch_after
+
+    def resolved(self) -> None:
+        """Count one more resolved event."""
+        self.events += 1
+        if self.events > self.budget.max_events:
+            self._abort(CascadeAbortReason.EVENT_BUDGET, self._links[-CHAIN_TAIL_LENGTH:])
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            self._abort(CascadeAbortReason.TIME_BUDGET, self._links[-CHAIN_TAIL_LENGTH:])
+
+    def triggered(self, rule: EventRule, event: Event, state: GameState) -> None:
+        """Record that `rule` triggered events on `event` in `state`; only called when watching."""
+        # Imported here so that engines whose cascades stay short never load hashlib.
+        from src.engine.core.fingerprint import fingerprint
+
+        key: tuple[int, type, bytes, bytes] = (
+            id(rule),
+            type(event),
+            fingerprint(event),
+            fingerprint(state),
+        )
+        first: int | None = self._seen.get(key)
+        self._links.append(CascadeLink(rule=type(rule).__name__, event=event))
+        if first is not None:
+            self._abort(CascadeAbortReason.CYCLE, self._links[first:])
+        self._seen[key] = len(self._links) - 1
+
+    @staticmethod
+    def _abort(reason: CascadeAbortReason, chain: list[CascadeLink]) -> None:
+        raise CascadeAbortedError(reason=reason, chain=tuple(chain))
+
+
+DEFAULT_CASCADE_BUDGET = CascadeBudget()
@@ -0,0 +1,151 @@
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.engine.core.timeline import TimelineNode
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.engine.core.command import Command
+    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_state import GameState
+
+
+class StaleVersionError(RuntimeError):
+    def __init__(self, expected_version: int, current_version: int) -> None:
+        super().__init__(
+            f"Submission based on version {expected_version} is stale: "
+            f"the session is at version {current_version}"
+        )
+        self.expected_version: int = expected_version
+        self.current_version: int = current_version
+
+
+@dataclass(frozen=True, slots=True)
+class SessionSnapshot:
+    """A version of a session and the timeline node it was at."""
+
+    version: int
+    node: TimelineNode
+
+    @property
+    def state(self) -> GameState:
+        return self.node.state
+
+
+@dataclass
+class ConcurrencyStatistics:
+    commits: int = 0
+    # Submissions rejected because the session moved on after the version they were based on.
+    conflicts: int = 0
+
+
+class ConcurrentGameSession:
+    """A game session that many threads or tasks can submit commands to at once.
+
+    Every change to the session increments its version. Submissions name the version they
+    were computed against and are rejected with `StaleVersionError` if the session has moved
+    on since, either immediately or after the engine ran, so a client never overwrites a move
+    it has not seen. The engine runs outside any lock: only the final compare-and-swap of the
+    snapshot is serialised. Reads take no lock at all, since the current version and node are
+    replaced together as one immutable snapshot.
+
+    Illegal commands change nothing and keep the version, as in `GameSession`.
+
+    As several submissions may run the engine at once, the engine must be safe to share
+    between threads. A `CommandResultCache` is; probes keep per-command state between their
+    steps and are not, so an engine with a probe is rejected.
+    """
+
+    def __init__(self, initial_state: GameState, engine: GameEngine) -> None:
+        if engine.probe is not None:
+            raise ValueError("A concurrent session cannot share an engine that has a probe")
+        self.initial_state: GameState = initial_state
+        self.engine: GameEngine = engine
+        self.root: TimelineNode = TimelineNode(state=initial_state)
+        self.statistics = ConcurrencyStatistics()
+        self._snapshot: SessionSnapshot = SessionSnapshot(version=0, node=self.root)
+        self._commit_lock: threading.Lock = threading.Lock()
+
+    def snapshot(self) -> SessionSnapshot:
+        return self._snapshot
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    @property
+    def current_state(self) -> GameState:
+        return self._snapshot.node.state
+
+    @property
+    def history(self) -> list[CommandResult]:
+        return [node.result for node in self._snapshot.node.path()[1:]]  # type: ignore
+
+    def apply_command(self, command: Command, expected_version: int) -> SessionSnapshot:
+        base: SessionSnapshot = self._base(expected_version)
+        result: CommandResult = self.engine.apply_command(state=base.state, command=command)
+        return self._commit_child(base, result)
+
+    def apply_commands(self, commands: Sequence[Command], expected_version: int) -> SessionSnapshot:
+        """Apply `commands` atomically as one history entry and one version."""
+        base: SessionSnapshot = self._base(expected_version)
+        result: CommandResult = self.engine.apply_commands(state=base.state, commands=commands)
+        return self._commit_child(base, result)
+
+    async def apply_command_async(self, command: Command, expected_version: int) -> SessionSnapshot:
+        """`apply_command` run in a worker thread, so the event loop keeps serving reads."""
+        return await asyncio.to_thread(self.apply_command, command, expected_version)
+
+    def undo(self, expected_version: int) -> SessionSnapshot:
+        base: SessionSnapshot = self._base(expected_version)
+        parent: TimelineNode | None = base.node.parent
+        if parent is None:
+            return base
+        with self._commit_lock:
+            self._check(base)
+            parent.redo_child = base.node
+            return self._swap(parent)
+
+    def redo(self, expected_version: int) -> SessionSnapshot:
+        base: SessionSnapshot = self._base(expected_version)
+        child: TimelineNode | None = base.node.redo_child
+        if child is None:
+            return base
+        with self._commit_lock:
+            self._check(base)
+            return self._swap(child)
+
+    def _base(self, expected_version: int) -> SessionSnapshot:
+        snapshot: SessionSnapshot = self._snapshot
+        if snapshot.version != expected_version:
+            with self._commit_lock:
+                self.statistics.conflicts += 1
+            raise StaleVersionError(
+                expected_version=expected_version, current_version=snapshot.version
+            )
+        return snapshot
+
+    def _commit_child(self, base: SessionSnapshot, result: CommandResult) -> SessionSnapshot:
+        if not result.success:
+            return base
+        with self._commit_lock:
+            self._check(base)
+            return self._swap(base.node.add_child(result))
+
+    def _check(self, base: SessionSnapshot) -> None:
+        """Must hold the commit lock."""
+        if self._snapshot is not base:
+            self.statistics.conflicts += 1
+            raise StaleVersionError(
+                expected_version=base.version, current_version=self._snapshot.version
+            )
+
+    def _swap(self, node: TimelineNode) -> SessionSnapshot:
+        """Must hold the commit lock."""
+        snapshot = SessionSnapshot(version=self._snapshot.version + 1, node=node)
+        self._snapshot = snapshot
+        self.statistics.commits += 1
+        return snapshot
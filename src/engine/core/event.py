@@ -1,16 +1,102 @@
-from typing import TYPE_CHECKING, Protocol
+from dataclasses import fields
+from typing import TYPE_CHECKING, Any, Protocol
 
 if TYPE_CHECKING:
-    from collections.abc import Sequence
+    from collections.abc import Callable, Sequence
 
     from src.engine.core.game_state import GameState
+    from src.engine.core.projection import ViewChanges
+
+
+# The type code of events that are not registered: they are neither routed nor serialized.
+UNREGISTERED_TYPE_CODE = 0
 
 
 class Event(Protocol):
+    __slots__ = ()
+
     payload: str
+    type_code: int = UNREGISTERED_TYPE_CODE
 
     def apply(self, previous_state: GameState) -> GameState: ...
 
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        """Record in `changes` the players and systems this event changed.
+
+        Returns False when they are not known, so that player views are projected again.
+        """
+        return False
+
 
 class EventRule(Protocol):
     def on_event(self, state: GameState, event: Event) -> Sequence[Event]: ...
+
+
+EventRecord = tuple[Any, ...]
+
+_EVENT_CLASSES: dict[int, type[Event]] = {}
+
+
+def _qualified_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def register_event[E: type[Event]](type_code: int) -> Callable[[E], E]:
+    """Class decorator assigning `type_code` to an event record class.
+
+    Each rules module numbers its own events, usually with an `IntEnum` of its own, from the
+    codes its `RULE_REGISTRY` entry reserves for it. Codes are written into archived games, so
+    they must stay the same across processes and releases; registering a code already taken,
+    or one not reserved for the event's module, fails.
+
+    Registered events should be slotted frozen dataclasses, so that they can be written as
+    records and cost little to retain in command results and session history.
+    """
+
+    def register(cls: E) -> E:
+        if type_code <= UNREGISTERED_TYPE_CODE:
+            raise ValueError(f"Event type codes must be positive, got {type_code}")
+        registered: type[Event] | None = _EVENT_CLASSES.get(type_code)
+        if registered is not None and _qualified_name(registered) != _qualified_name(cls):
+            raise ValueError(
+                f"Event type code {type_code} is already registered to "
+                f"{_qualified_name(registered)}"
+            )
+        # Deferred: the registry imports this module.
+        from src.engine.core.rules_library import get_compiled_rule_set
+
+        owner = get_compiled_rule_set().manifest.by_event_code.get(type_code)
+        if owner is None or owner.module_path != cls.__module__:
+            raise ValueError(
+                f"Event type code {type_code} is not reserved for {cls.__module__} "
+                "in the rules registry"
+            )
+        cls.type_code = type_code
+        _EVENT_CLASSES[type_code] = cls
+        return cls
+
+    return register
+
+
+def event_class(type_code: int) -> type[Event]:
+    """The event class registered for `type_code` by a module imported so far."""
+    cls: type[Event] | None = _EVENT_CLASSES.get(type_code)
+    if cls is None:
+        raise LookupError(f"No event class registered for type code {type_code}")
+    return cls
+
+
+def event_to_record(event: Event) -> EventRecord:
+    """`event` as its type code followed by its field values."""
+    if event.type_code == UNREGISTERED_TYPE_CODE:
+        raise TypeError(f"Cannot serialize unregistered event {event!r}")
+    values: list[Any] = [getattr(event, field.name) for field in fields(event)]  # type: ignore
+    return (int(event.type_code), *values)
+
+
+def event_from_record(
+    record: EventRecord, classes: Callable[[int], type[Event]] = event_class
+) -> Event:
+    """The event written as `record`, whose class is found by `classes` from its type code."""
+    type_code, *values = record
+    return classes(type_code)(*values)
@@ -0,0 +1,82 @@
+import hashlib
+import weakref
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from functools import cache
+
+FINGERPRINT_BYTES = 16
+_ATOMIC_TYPES: tuple[type, ...] = (str, bytes, int, float, bool, type(None))
+
+
+class _Memo(weakref.ref):
+    """The fingerprint of a live value, forgotten when the value is garbage collected."""
+
+    __slots__ = ("key", "digest")
+
+    def __new__(cls, value: object, digest: bytes) -> _Memo:
+        return super().__new__(cls, value, _forget)
+
+    def __init__(self, value: object, digest: bytes) -> None:
+        self.key: int = id(value)
+        self.digest: bytes = digest
+
+
+# Fingerprints of values by `id`. Kept beside the values rather than on them, so that they are
+# never pickled with a value, copied by `replace` or carried from an older encoding.
+_MEMOS: dict[int, _Memo] = {}
+
+
+def _forget(memo: _Memo) -> None:
+    # Runs while the value is being collected, before its id can be reused. Two threads may
+    # have registered a memo for the same value; only the one still registered is removed.
+    if _MEMOS.get(memo.key) is memo:
+        del _MEMOS[memo.key]
+
+
+def _digest(tag: bytes, *parts: bytes) -> bytes:
+    return hashlib.blake2b(tag + b"\0" + b"".join(parts), digest_size=FINGERPRINT_BYTES).digest()
+
+
+@cache
+def _compared_fields(cls: type) -> tuple[str, ...]:
+    return tuple(field.name for field in fields(cls) if field.compare)
+
+
+def fingerprint(value: object) -> bytes:
+    """A digest of the contents of an immutable game value, the same in every process and run.
+
+    Values that compare equal have equal fingerprints, except that every field of a dataclass
+    counts even where its `__eq__` looks at fewer (a player is more than its name), while fields
+    excluded from comparison, such as the occupancy index of a state, are left out. Sets are
+    hashed in sorted order, so iteration order does not matter.
+
+    The fingerprint of a dataclass is built from those of its fields and remembered for as
+    long as the object lives. States share most of their players and systems with their
+    predecessor, so a new state only costs hashing what changed. Remembering relies on the
+    value never changing, so a state's sets must not be mutated once it is fingerprinted.
+    """
+    memo: _Memo | None = _MEMOS.get(id(value))
+    if memo is not None and memo() is value:
+        return memo.digest
+    if isinstance(value, Enum):
+        value = value.value
+    if isinstance(value, _ATOMIC_TYPES):
+        return _digest(b"a", repr(value).encode())
+    cls: type = type(value)
+    if is_dataclass(cls):
+        digest: bytes = _digest(
+            cls.__qualname__.encode(),
+            *(fingerprint(getattr(value, name)) for name in _compared_fields(cls)),
+        )
+        if hasattr(value, "__weakref__"):
+            _MEMOS[id(value)] = _Memo(value, digest)
+        return digest
+    if isinstance(value, (tuple, list)):
+        return _digest(b"t", *map(fingerprint, value))
+    if isinstance(value, (set, frozenset)):
+        return _digest(b"s", *sorted(map(fingerprint, value)))
+    if isinstance(value, dict):
+        return _digest(
+            b"d", *sorted(fingerprint(key) + fingerprint(item) for key, item in value.items())
+        )
+    raise TypeError(f"Cannot fingerprint a {type(value).__name__}")
@@ -0,0 +1,155 @@
+from collections import deque
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from src.engine.core.game_state import System
+
+UNREACHABLE = -1
+
+
+class Wormhole(StrEnum):
+    ALPHA = "alpha"
+    BETA = "beta"
+    GAMMA = "gamma"
+    DELTA = "delta"
+
+
+@dataclass(frozen=True, slots=True)
+class HexCoordinate:
+    """Axial coordinates of a hex on the game board."""
+
+    q: int
+    r: int
+
+    def neighbours(self) -> tuple[HexCoordinate, ...]:
+        return tuple(HexCoordinate(q=self.q + dq, r=self.r + dr) for dq, dr in _DIRECTIONS)
+
+    def distance_to(self, other: HexCoordinate) -> int:
+        dq: int = self.q - other.q
+        dr: int = self.r - other.r
+        return max(abs(dq), abs(dr), abs(dq + dr))
+
+
+_DIRECTIONS: tuple[tuple[int, int], ...] = ((1, 0), (1, -1), (0, -1), (-1, 0), (-1, 1), (0, 1))
+
+
+def hex_spiral(count: int) -> list[HexCoordinate]:
+    """The first `count` hexes of a spiral around the centre, ring by ring, as on a TI4 map."""
+    coordinates: list[HexCoordinate] = [HexCoordinate(q=0, r=0)]
+    radius: int = 1
+    while len(coordinates) < count:
+        q, r = -radius, radius
+        for dq, dr in _DIRECTIONS:
+            for _ in range(radius):
+                coordinates.append(HexCoordinate(q=q, r=r))
+                q, r = q + dq, r + dr
+        radius += 1
+    return coordinates[:count]
+
+
+@dataclass(frozen=True, eq=False)
+class GalaxyLayout:
+    """The geometry of one map, computed once and shared by every state of a game.
+
+    Two systems are adjacent if their hexes touch, if they share a wormhole type, or if a
+    hyperlane joins them. `distances` is a read-only matrix of shortest path lengths, or
+    `UNREACHABLE`, whose rows and columns follow `system_ids`. Only tokens change during a game,
+    so the layout stays valid for every state reached from the one it was built for.
+
+    A layout is `rebuildable` when `from_galaxy` gives it back from the systems alone, without
+    hyperlanes; states only need to carry the layouts that are not.
+    """
+
+    system_ids: tuple[int, ...]
+    positions: Mapping[int, int]
+    coordinates: Mapping[int, HexCoordinate]
+    adjacency: Mapping[int, frozenset[int]]
+    distances: np.ndarray
+    rebuildable: bool = False
+
+    @classmethod
+    def from_galaxy(
+        cls, galaxy: Iterable[System], hyperlanes: Iterable[tuple[int, int]] = ()
+    ) -> GalaxyLayout:
+        systems: list[System] = sorted(galaxy, key=lambda system: system.id)
+        coordinates: dict[int, HexCoordinate] = {
+            system.id: system.coordinate for system in systems if system.coordinate is not None
+        }
+        by_coordinate: dict[HexCoordinate, int] = {
+            coordinate: system_id for system_id, coordinate in coordinates.items()
+        }
+        neighbours: dict[int, set[int]] = {system.id: set() for system in systems}
+        for system_id, coordinate in coordinates.items():
+            for neighbour in coordinate.neighbours():
+                if neighbour in by_coordinate:
+                    neighbours[system_id].add(by_coordinate[neighbour])
+        by_wormhole: dict[Wormhole, list[int]] = {}
+        for system in systems:
+            for wormhole in system.wormholes:
+                by_wormhole.setdefault(wormhole, []).append(system.id)
+        for connected in by_wormhole.values():
+            for system_id in connected:
+                neighbours[system_id].update(other for other in connected if other != system_id)
+        lanes: tuple[tuple[int, int], ...] = tuple(hyperlanes)
+        for first, second in lanes:
+            neighbours[first].add(second)
+            neighbours[second].add(first)
+        adjacency: dict[int, frozenset[int]] = {
+            system_id: frozenset(adjacent) for system_id, adjacent in neighbours.items()
+        }
+        positions: dict[int, int] = {system.id: index for index, system in enumerate(systems)}
+        return cls(
+            system_ids=tuple(positions),
+            positions=positions,
+            coordinates=coordinates,
+            adjacency=adjacency,
+            distances=_all_pairs_distances(positions=positions, adjacency=adjacency),
+            rebuildable=not lanes,
+        )
+
+    def are_adjacent(self, first: int, second: int) -> bool:
+        return second in self.adjacency[first]
+
+    def distance(self, first: int, second: int) -> int | None:
+        distance: int = int(self.distances[self.positions[first], self.positions[second]])
+        return None if distance == UNREACHABLE else distance
+
+    def within(self, system_id: int, max_distance: int) -> frozenset[int]:
+        """The systems at most `max_distance` moves from `system_id`, including itself."""
+        import numpy as np
+
+        row: np.ndarray = self.distances[self.positions[system_id]]
+        return frozenset(
+            self.system_ids[index]
+            for index in np.flatnonzero((row != UNREACHABLE) & (row <= max_distance))
+        )
+
+
+def _all_pairs_distances(
+    positions: Mapping[int, int], adjacency: Mapping[int, frozenset[int]]
+) -> np.ndarray:
+    """Breadth-first search from every system; the graph is unweighted and small."""
+    # numpy is imported on first use: every state imports this module, and numpy alone takes
+    # longer to import than the rest of the engine.
+    import numpy as np
+
+    distances: np.ndarray = np.empty((len(positions), len(positions)), dtype=np.int16)
+    for source, source_position in positions.items():
+        row: list[int] = [UNREACHABLE] * len(positions)
+        row[source_position] = 0
+        queue: deque[int] = deque([source])
+        while queue:
+            current: int = queue.popleft()
+            next_distance: int = row[positions[current]] + 1
+            for neighbour in adjacency[current]:
+                if row[positions[neighbour]] == UNREACHABLE:
+                    row[positions[neighbour]] = next_distance
+                    queue.append(neighbour)
+        distances[source_position] = row
+    distances.flags.writeable = False
+    return distances
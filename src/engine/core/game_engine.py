@@ -1,12 +1,20 @@
 from dataclasses import FrozenInstanceError, dataclass
-from typing import TYPE_CHECKING, Protocol
+from enum import StrEnum
+from typing import TYPE_CHECKING, Protocol, cast
+
+from src.engine.core.cascade import DEFAULT_CASCADE_BUDGET, CascadeAbortedError, CascadeGuard
+from src.engine.core.instrumentation import EngineStep
+from src.engine.core.state_builder import GameStateBuilder
 
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    from src.engine.core.command import Command
-    from src.engine.core.event import Event
+    from src.engine.core.cascade import CascadeAbortReason, CascadeBudget, CascadeLink
+    from src.engine.core.command import Command, CommandRule
+    from src.engine.core.event import Event, EventRule
     from src.engine.core.game_state import GameState
+    from src.engine.core.instrumentation import EngineProbe
+    from src.engine.core.result_cache import CommandResultCache, ResultKey
     from src.engine.core.rules_engine import RulesEngine
 
 
@@ -32,57 +40,613 @@ class CommandResult:
     info: str = ""
 
 
+@dataclass(frozen=True)
+class BatchResult(CommandResult):
+    """The outcome of `GameEngine.apply_commands`, usable as a single history entry.
+
+    Only the final state is kept. `events` holds the events of every command in order. When the
+    batch is rejected, `failed_index` is the position of the first illegal command and
+    `new_state` is the state the batch started from.
+    """
+
+    command_count: int = 0
+    failed_index: int | None = None
+
+
+@dataclass(frozen=True)
+class CascadeAbortedResult(CommandResult):
+    """A command whose events were abandoned for exceeding the engine's `CascadeBudget`.
+
+    `new_state` is the state the command was applied to. `chain` holds the rules and events of
+    the cycle, or the last links of a cascade that ran out of budget.
+    """
+
+    reason: CascadeAbortReason | None = None
+    chain: tuple[CascadeLink, ...] = ()
+
+
+@dataclass(frozen=True)
+class CascadeAbortedBatchResult(BatchResult, CascadeAbortedResult):
+    """A batch rejected because the command at `failed_index` exceeded the `CascadeBudget`."""
+
+
+class InvariantPolicy(StrEnum):
+    EVERY_COMMAND = "every_command"
+    END_OF_BATCH = "end_of_batch"
+
+
+def _invalid_command(state: GameState, command: Command, rule: CommandRule) -> CommandResult:
+    return CommandResult(
+        new_state=state,
+        success=False,
+        events=[],
+        info=f"Command invalid: {command} because of rule {rule}",
+    )
+
+
+def _rejected_batch(
+    state: GameState, commands: Sequence[Command], index: int, rule: CommandRule
+) -> BatchResult:
+    return BatchResult(
+        new_state=state,
+        success=False,
+        events=[],
+        info=f"Command {index} invalid: {commands[index]} because of rule {rule}",
+        command_count=len(commands),
+        failed_index=index,
+    )
+
+
+def _aborted_cascade(
+    state: GameState, command: Command, error: CascadeAbortedError
+) -> CommandResult:
+    return CascadeAbortedResult(
+        new_state=state,
+        success=False,
+        events=[],
+        info=f"Command aborted: {command} because of {error}",
+        reason=error.reason,
+        chain=error.chain,
+    )
+
+
+def _aborted_batch(
+    state: GameState, commands: Sequence[Command], index: int, error: CascadeAbortedError
+) -> BatchResult:
+    return CascadeAbortedBatchResult(
+        new_state=state,
+        success=False,
+        events=[],
+        info=f"Command {index} aborted: {commands[index]} because of {error}",
+        command_count=len(commands),
+        failed_index=index,
+        reason=error.reason,
+        chain=error.chain,
+    )
+
+
+def _mutation_while_applying(event: Event, error: FrozenInstanceError) -> IllegalStateMutationError:
+    return IllegalStateMutationError(
+        f"Illegal mutation of game state detected when applying event {event}: {error}"
+    )
+
+
+def _mutation_while_processing(
+    event: Event, rule: EventRule, error: FrozenInstanceError
+) -> IllegalStateMutationError:
+    return IllegalStateMutationError(
+        f"Illegal mutation of game state detected when processing event {event} "
+        f"with rule {rule}: {error}"
+    )
+
+
+def _invariants_violated(invariants: Sequence[GameStateInvariant]) -> InvariantViolationError:
+    return InvariantViolationError(
+        "Game state invariants violated: " + ", ".join(inv.description for inv in invariants),
+    )
+
+
 class GameEngine:
+    """Applies commands to game states atomically.
+
+    With `transactional=True`, the events of a command are applied in place to one
+    `GameStateBuilder` and the resulting state is frozen once, instead of every event building
+    a new `GameState`. Event rules then read a read-only view of the builder rather than a
+    `GameState`. The resulting states and events are the same in both modes.
+
+    With a `result_cache`, a command applied to a state equal to one it was applied to before
+    returns the cached result without running any rule or reporting anything to the probe.
+    Batches from `apply_commands` bypass the cache.
+
+    Every command's cascade of events is bounded by `cascade_budget` (None lifts the bound); a
+    command exceeding it fails with a `CascadeAbortedResult` and changes nothing.
+
+    A command the probe samples takes the `_instrumented` variant of every step, which reports
+    to the probe; every other command takes the plain steps, which never look at the probe.
+    Both must resolve the same way.
+    """
+
     def __init__(
         self,
         rules_engine: RulesEngine,
         invariants: Sequence[GameStateInvariant] | None = None,
+        probe: EngineProbe | None = None,
+        transactional: bool = False,
+        result_cache: CommandResultCache | None = None,
+        cascade_budget: CascadeBudget | None = DEFAULT_CASCADE_BUDGET,
     ) -> None:
         self.rules_engine: RulesEngine = rules_engine
         self.invariants: Sequence[GameStateInvariant] = invariants if invariants is not None else []
+        self.probe: EngineProbe | None = probe
+        self.transactional: bool = transactional
+        self.result_cache: CommandResultCache | None = result_cache
+        self.cascade_budget: CascadeBudget | None = cascade_budget
 
     def apply_command(self, state: GameState, command: Command) -> CommandResult:
-        # Validate command legality
-        for rule in self.rules_engine.command_rules:
-            if not rule.validate_legality(state, command):
-                return CommandResult(
-                    new_state=state,
-                    success=False,
-                    events=[],
-                    info=f"Command invalid: {command} because of rule {rule}",
+        if self.result_cache is not None:
+            return self._apply_command_cached(state=state, command=command, cache=self.result_cache)
+        return self._apply_command(state=state, command=command)
+
+    def _apply_command_cached(
+        self, state: GameState, command: Command, cache: CommandResultCache
+    ) -> CommandResult:
+        key: ResultKey = cache.key(state=state, command=command)
+        result: CommandResult | None = cache.get(key)
+        if result is None:
+            result = self._apply_command(state=state, command=command)
+            # An aborted cascade may have run out of time rather than events, which can differ.
+            if not isinstance(result, CascadeAbortedResult):
+                cache.put(key, result)
+        return result
+
+    def _apply_command(self, state: GameState, command: Command) -> CommandResult:
+        probe: EngineProbe | None = self.probe
+        if probe is None or not probe.sample(command):
+            return self._apply_command_steps(state=state, command=command)
+        return self._apply_command_instrumented(state=state, command=command, probe=probe)
+
+    def _apply_command_steps(self, state: GameState, command: Command) -> CommandResult:
+        command_rules: Sequence[CommandRule] = self.rules_engine.command_rules_for(command)
+        rejecting_rule: CommandRule | None = self._rejecting_rule(
+            state=state, command=command, command_rules=command_rules
+        )
+        if rejecting_rule is not None:
+            return _invalid_command(state=state, command=command, rule=rejecting_rule)
+        events: list[Event] = self._derive_events(
+            state=state, command=command, command_rules=command_rules
+        )
+        target: GameState | GameStateBuilder = (
+            GameStateBuilder(state) if self.transactional else state
+        )
+        try:
+            new_state, resolved_events = self._resolve_events(target=target, events=events)
+        except CascadeAbortedError as e:
+            return _aborted_cascade(state=state, command=command, error=e)
+        if isinstance(target, GameStateBuilder):
+            new_state = target.freeze()
+        self._check_invariants(state=new_state)
+        return CommandResult(new_state=new_state, success=True, events=resolved_events)
+
+    def _apply_command_instrumented(
+        self, state: GameState, command: Command, probe: EngineProbe
+    ) -> CommandResult:
+        """`_apply_command_steps`, reporting every step to `probe`."""
+        command_name: str = command.command_type.value
+        probe.enter(EngineStep.COMMAND, command_name)
+        try:
+            command_rules: Sequence[CommandRule] = self.rules_engine.command_rules_for(command)
+            rejecting_rule: CommandRule | None = self._rejecting_rule_instrumented(
+                state=state, command=command, command_rules=command_rules, probe=probe
+            )
+            if rejecting_rule is not None:
+                return _invalid_command(state=state, command=command, rule=rejecting_rule)
+            spans = _CascadeSpans(probe)
+            events: list[Event] = self._derive_events_instrumented(
+                state=state, command=command, command_rules=command_rules, spans=spans
+            )
+            target: GameState | GameStateBuilder = (
+                GameStateBuilder(state) if self.transactional else state
+            )
+            try:
+                new_state, resolved_events = self._resolve_events_instrumented(
+                    target=target, events=events, spans=spans
                 )
-        # Derive events from command
-        new_state: GameState = state
+            except CascadeAbortedError as e:
+                return _aborted_cascade(state=state, command=command, error=e)
+            if isinstance(target, GameStateBuilder):
+                new_state = target.freeze()
+            self._check_invariants_instrumented(state=new_state, probe=probe)
+            return CommandResult(new_state=new_state, success=True, events=resolved_events)
+        finally:
+            probe.exit(EngineStep.COMMAND, command_name)
+
+    def apply_commands(
+        self,
+        state: GameState,
+        commands: Sequence[Command],
+        invariant_policy: InvariantPolicy = InvariantPolicy.END_OF_BATCH,
+    ) -> BatchResult:
+        """Apply `commands` in order, atomically: either all of them succeed or none do.
+
+        All commands are resolved against one `GameStateBuilder`, so containers copied by one
+        command are reused by the next and the final state is frozen once. Rules see a read-only
+        view of the builder. Invariants are checked once at the end unless `invariant_policy`
+        asks for a check after every command.
+
+        A probe sees each command it samples as its own command step, including the invariant
+        checks after it under `InvariantPolicy.EVERY_COMMAND`. The check at the end of a batch
+        belongs to no command and is not reported.
+        """
+        builder = GameStateBuilder(state)
         events: list[Event] = []
-        resolved_events: list[Event] = []
-        for rule in self.rules_engine.command_rules:
+        for index, command in enumerate(commands):
+            probe: EngineProbe | None = self.probe
+            if probe is None or not probe.sample(command):
+                failure: BatchResult | None = self._apply_batched_command(
+                    state=state,
+                    commands=commands,
+                    index=index,
+                    builder=builder,
+                    events=events,
+                    invariant_policy=invariant_policy,
+                )
+            else:
+                failure = self._apply_batched_command_instrumented(
+                    state=state,
+                    commands=commands,
+                    index=index,
+                    builder=builder,
+                    events=events,
+                    invariant_policy=invariant_policy,
+                    probe=probe,
+                )
+            if failure is not None:
+                return failure
+        new_state: GameState = builder.freeze()
+        if invariant_policy == InvariantPolicy.END_OF_BATCH:
+            self._check_invariants(state=new_state)
+        return BatchResult(
+            new_state=new_state, success=True, events=events, command_count=len(commands)
+        )
+
+    def _apply_batched_command(
+        self,
+        state: GameState,
+        commands: Sequence[Command],
+        index: int,
+        builder: GameStateBuilder,
+        events: list[Event],
+        invariant_policy: InvariantPolicy,
+    ) -> BatchResult | None:
+        """Apply `commands[index]` to `builder`, adding its events to `events`.
+
+        Returns the rejected batch if the command is illegal or its cascade is aborted.
+        """
+        command: Command = commands[index]
+        view: GameState = cast("GameState", builder.view())
+        command_rules: Sequence[CommandRule] = self.rules_engine.command_rules_for(command)
+        rejecting_rule: CommandRule | None = self._rejecting_rule(
+            state=view, command=command, command_rules=command_rules
+        )
+        if rejecting_rule is not None:
+            return _rejected_batch(state, commands, index, rejecting_rule)
+        command_events: list[Event] = self._derive_events(
+            state=view, command=command, command_rules=command_rules
+        )
+        try:
+            events += self._resolve_events(target=builder, events=command_events)[1]
+        except CascadeAbortedError as e:
+            return _aborted_batch(state=state, commands=commands, index=index, error=e)
+        if invariant_policy == InvariantPolicy.EVERY_COMMAND:
+            self._check_invariants(state=builder.freeze())
+        return None
+
+    def _apply_batched_command_instrumented(
+        self,
+        state: GameState,
+        commands: Sequence[Command],
+        index: int,
+        builder: GameStateBuilder,
+        events: list[Event],
+        invariant_policy: InvariantPolicy,
+        probe: EngineProbe,
+    ) -> BatchResult | None:
+        """`_apply_batched_command`, reporting every step to `probe`."""
+        command: Command = commands[index]
+        command_name: str = command.command_type.value
+        probe.enter(EngineStep.COMMAND, command_name)
+        try:
+            view: GameState = cast("GameState", builder.view())
+            command_rules: Sequence[CommandRule] = self.rules_engine.command_rules_for(command)
+            rejecting_rule: CommandRule | None = self._rejecting_rule_instrumented(
+                state=view, command=command, command_rules=command_rules, probe=probe
+            )
+            if rejecting_rule is not None:
+                return _rejected_batch(state, commands, index, rejecting_rule)
+            spans = _CascadeSpans(probe)
+            command_events: list[Event] = self._derive_events_instrumented(
+                state=view, command=command, command_rules=command_rules, spans=spans
+            )
+            try:
+                events += self._resolve_events_instrumented(
+                    target=builder, events=command_events, spans=spans
+                )[1]
+            except CascadeAbortedError as e:
+                return _aborted_batch(state=state, commands=commands, index=index, error=e)
+            if invariant_policy == InvariantPolicy.EVERY_COMMAND:
+                self._check_invariants_instrumented(state=builder.freeze(), probe=probe)
+            return None
+        finally:
+            probe.exit(EngineStep.COMMAND, command_name)
+
+    @staticmethod
+    def _rejecting_rule(
+        state: GameState, command: Command, command_rules: Sequence[CommandRule]
+    ) -> CommandRule | None:
+        """The first of `command_rules` that finds `command` illegal in `state`, if any."""
+        for rule in command_rules:
+            if not rule.validate_legality(state, command):
+                return rule
+        return None
+
+    @staticmethod
+    def _rejecting_rule_instrumented(
+        state: GameState,
+        command: Command,
+        command_rules: Sequence[CommandRule],
+        probe: EngineProbe,
+    ) -> CommandRule | None:
+        for rule in command_rules:
+            probe.enter(EngineStep.VALIDATE, type(rule).__name__)
+            try:
+                is_legal: bool = rule.validate_legality(state, command)
+            finally:
+                probe.exit(EngineStep.VALIDATE, type(rule).__name__)
+            if not is_legal:
+                return rule
+        return None
+
+    @staticmethod
+    def _derive_events(
+        state: GameState, command: Command, command_rules: Sequence[CommandRule]
+    ) -> list[Event]:
+        events: list[Event] = []
+        for rule in command_rules:
             events += rule.derive_events(state, command)
+        return events
 
+    @staticmethod
+    def _derive_events_instrumented(
+        state: GameState,
+        command: Command,
+        command_rules: Sequence[CommandRule],
+        spans: _CascadeSpans,
+    ) -> list[Event]:
+        events: list[Event] = []
+        for rule in command_rules:
+            spans.probe.enter(EngineStep.DERIVE, type(rule).__name__)
+            try:
+                derived: Sequence[Event] = rule.derive_events(state, command)
+            finally:
+                spans.probe.exit(EngineStep.DERIVE, type(rule).__name__)
+            spans.derived(rule=rule, count=len(derived))
+            events += derived
+        return events
+
+    def _resolve_events(
+        self, target: GameState | GameStateBuilder, events: list[Event]
+    ) -> tuple[GameState, list[Event]]:
+        """Resolve `events` and every event they trigger, depth first, from `target`.
+
+        A `GameState` target is left as it is and the state after the last event is returned. A
+        `GameStateBuilder` target has the events applied to it in place; a read-only view of it
+        is returned, and handed to event rules in the meantime. The cascade is bounded by the
+        engine's `CascadeBudget`.
+        """
+        builder: GameStateBuilder | None = target if isinstance(target, GameStateBuilder) else None
+        new_state: GameState = (
+            cast("GameState", builder.view()) if builder is not None else cast("GameState", target)
+        )
+        resolved_events: list[Event] = []
+        guard: CascadeGuard | None = self._cascade_guard()
         while events:
             event: Event = events.pop(0)
             try:
-                new_state: GameState = event.apply(previous_state=new_state)
+                if builder is not None:
+                    builder.apply(event)
+                else:
+                    new_state = event.apply(previous_state=new_state)
             except FrozenInstanceError as e:
-                raise IllegalStateMutationError(
-                    f"Illegal mutation of game state detected when applying event {event}: {e}"
-                ) from e
+                raise _mutation_while_applying(event=event, error=e) from e
             resolved_events.append(event)
-            for rule in self.rules_engine.event_rules:
+            if guard is not None:
+                guard.resolved()
+            events[0:0] = self._triggered_events(
+                event=event, state=new_state, builder=builder, guard=guard
+            )
+        return new_state, resolved_events
+
+    def _resolve_events_instrumented(
+        self,
+        target: GameState | GameStateBuilder,
+        events: list[Event],
+        spans: _CascadeSpans,
+    ) -> tuple[GameState, list[Event]]:
+        """`_resolve_events`, reporting every step to `spans`."""
+        builder: GameStateBuilder | None = target if isinstance(target, GameStateBuilder) else None
+        new_state: GameState = (
+            cast("GameState", builder.view()) if builder is not None else cast("GameState", target)
+        )
+        resolved_events: list[Event] = []
+        guard: CascadeGuard | None = self._cascade_guard()
+        try:
+            while events:
+                event: Event = events.pop(0)
+                spans.enter_event(event)
                 try:
-                    new_events: Sequence[Event] = rule.on_event(state=new_state, event=event)
+                    if builder is not None:
+                        builder.apply(event)
+                    else:
+                        new_state = event.apply(previous_state=new_state)
                 except FrozenInstanceError as e:
-                    raise IllegalStateMutationError(
-                        f"Illegal mutation of game state detected when processing event {event} "
-                        f"with rule {rule}: {e}"
-                    ) from e
-                events: list[Event] = list(new_events) + events
+                    raise _mutation_while_applying(event=event, error=e) from e
+                finally:
+                    spans.exit_apply()
+                resolved_events.append(event)
+                if guard is not None:
+                    guard.resolved()
+                events[0:0] = self._triggered_events_instrumented(
+                    event=event, state=new_state, builder=builder, guard=guard, spans=spans
+                )
+        finally:
+            spans.close()
+        return new_state, resolved_events
+
+    def _triggered_events(
+        self,
+        event: Event,
+        state: GameState,
+        builder: GameStateBuilder | None,
+        guard: CascadeGuard | None,
+    ) -> list[Event]:
+        """The events every event rule triggers on `event`, in the order they are resolved."""
+        triggered: list[Event] = []
+        for rule in self.rules_engine.event_rules_for(event):
+            try:
+                new_events: Sequence[Event] = rule.on_event(state=state, event=event)
+            except FrozenInstanceError as e:
+                raise _mutation_while_processing(event=event, rule=rule, error=e) from e
+            if not new_events:
+                continue
+            if guard is not None and guard.watching:
+                # Freezing leaves the builder at the frozen state, ready for more events.
+                guard.triggered(
+                    rule=rule, event=event, state=builder.freeze() if builder is not None else state
+                )
+            # A later rule's events are resolved before an earlier rule's.
+            triggered[0:0] = new_events
+        return triggered
 
+    def _triggered_events_instrumented(
+        self,
+        event: Event,
+        state: GameState,
+        builder: GameStateBuilder | None,
+        guard: CascadeGuard | None,
+        spans: _CascadeSpans,
+    ) -> list[Event]:
+        triggered: list[Event] = []
+        for rule in self.rules_engine.event_rules_for(event):
+            spans.enter_rule(rule)
+            try:
+                new_events: Sequence[Event] = rule.on_event(state=state, event=event)
+            except FrozenInstanceError as e:
+                raise _mutation_while_processing(event=event, rule=rule, error=e) from e
+            finally:
+                spans.exit_rule()
+            if not new_events:
+                continue
+            if guard is not None and guard.watching:
+                guard.triggered(
+                    rule=rule, event=event, state=builder.freeze() if builder is not None else state
+                )
+            spans.triggered(rule=rule, count=len(new_events))
+            triggered[0:0] = new_events
+        return triggered
+
+    def _cascade_guard(self) -> CascadeGuard | None:
+        return CascadeGuard(self.cascade_budget) if self.cascade_budget is not None else None
+
+    def _check_invariants(self, state: GameState) -> None:
         failed_invariants: list[GameStateInvariant] = [
-            inv for inv in self.invariants if not inv.check(state=new_state)
+            invariant for invariant in self.invariants if not invariant.check(state=state)
         ]
         if failed_invariants:
-            raise InvariantViolationError(
-                "Game state invariants violated: "
-                + ", ".join(inv.description for inv in failed_invariants),
-            )
-        return CommandResult(new_state=new_state, success=True, events=resolved_events)
+            raise _invariants_violated(failed_invariants)
+
+    def _check_invariants_instrumented(self, state: GameState, probe: EngineProbe) -> None:
+        failed_invariants: list[GameStateInvariant] = []
+        for invariant in self.invariants:
+            probe.enter(EngineStep.INVARIANT, type(invariant).__name__)
+            try:
+                if not invariant.check(state=state):
+                    failed_invariants.append(invariant)
+            finally:
+                probe.exit(EngineStep.INVARIANT, type(invariant).__name__)
+        if failed_invariants:
+            raise _invariants_violated(failed_invariants)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class _SpanNode:
+    step: EngineStep
+    name: str
+    parent: _SpanNode | None
+
+
+class _CascadeSpans:
+    """Reports the spans of one command's events to a probe, under the rules that caused them.
+
+    Rules derive or trigger all their events before any of those is resolved, so the events of
+    a rule are reported in a cascade span named after the rule, opened when its first event is
+    resolved. The span of an event encloses its apply, the event rules run on it and the
+    cascade spans of the events they triggered, so it stays open until every event it led to,
+    directly or indirectly, has been resolved.
+    """
+
+    __slots__ = ("probe", "_causes", "_open", "_event", "_rule_name")
+
+    def __init__(self, probe: EngineProbe) -> None:
+        self.probe: EngineProbe = probe
+        # The cascade span of every pending event, in the order the events are pending.
+        self._causes: list[_SpanNode] = []
+        # Open event and cascade spans, outermost first.
+        self._open: list[_SpanNode] = []
+        self._event: _SpanNode | None = None
+        self._rule_name: str = ""
+
+    def derived(self, rule: CommandRule, count: int) -> None:
+        """`rule` derived `count` events from the command, which are now the last pending."""
+        self._causes += [_SpanNode(EngineStep.CASCADE, type(rule).__name__, parent=None)] * count
+
+    def triggered(self, rule: EventRule, count: int) -> None:
+        """`rule` triggered `count` events on the current event, which are now the first pending."""
+        cause = _SpanNode(EngineStep.CASCADE, type(rule).__name__, parent=self._event)
+        self._causes[0:0] = [cause] * count
+
+    def enter_event(self, event: Event) -> None:
+        """Close the spans `event` was not caused from, open those it was, then its own."""
+        cause: _SpanNode | None = self._causes.pop(0)
+        # The cascade span of the event and all its enclosing spans, innermost first.
+        lineage: list[_SpanNode] = []
+        while cause is not None:
+            lineage.append(cause)
+            cause = cause.parent
+        while self._open and not any(node is self._open[-1] for node in lineage):
+            self._exit(self._open.pop())
+        # What is still open is the outermost part of the lineage.
+        for node in reversed(lineage[: len(lineage) - len(self._open)]):
+            self.probe.enter(node.step, node.name)
+            self._open.append(node)
+        self._event = _SpanNode(EngineStep.EVENT, type(event).__name__, parent=lineage[0])
+        self.probe.enter(EngineStep.EVENT, self._event.name)
+        self._open.append(self._event)
+        self.probe.enter(EngineStep.APPLY, self._event.name)
+
+    def exit_apply(self) -> None:
+        if self._event is not None:
+            self.probe.exit(EngineStep.APPLY, self._event.name)
+
+    def enter_rule(self, rule: EventRule) -> None:
+        self._rule_name = type(rule).__name__
+        self.probe.enter(EngineStep.ON_EVENT, self._rule_name)
+
+    def exit_rule(self) -> None:
+        self.probe.exit(EngineStep.ON_EVENT, self._rule_name)
+
+    def close(self) -> None:
+        while self._open:
+            self._exit(self._open.pop())
+
+    def _exit(self, node: _SpanNode) -> None:
+        self.probe.exit(node.step, node.name)
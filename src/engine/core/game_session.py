@@ -1,20 +1,88 @@
-from typing import TYPE_CHECKING
+from collections.abc import Iterable, Sequence
+from typing import TYPE_CHECKING, overload
+
+from src.engine.core.timeline import TimelineNode
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator
+
     from src.engine.core.command import Command
-    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_engine import BatchResult, CommandResult, GameEngine
     from src.engine.core.game_state import GameState
 
 
+class SessionHistory(Sequence["CommandResult"]):
+    """The command results on the path from a session's root to its current node.
+
+    `len` and access near the end are O(1); appending advances the session and `pop` undoes.
+    """
+
+    __slots__ = ("_session",)
+
+    def __init__(self, session: GameSession) -> None:
+        self._session: GameSession = session
+
+    def __len__(self) -> int:
+        return self._session.current_node.depth
+
+    @overload
+    def __getitem__(self, index: int) -> CommandResult: ...
+    @overload
+    def __getitem__(self, index: slice) -> list[CommandResult]: ...
+    def __getitem__(self, index: int | slice) -> CommandResult | list[CommandResult]:
+        if isinstance(index, slice):
+            return list(self)[index]
+        length: int = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("history index out of range")
+        return self._session.current_node.ancestor(depth=index + 1).result  # type: ignore
+
+    def __iter__(self) -> Iterator[CommandResult]:
+        for node in self._session.current_node.path()[1:]:
+            yield node.result  # type: ignore
+
+    def __repr__(self) -> str:
+        return f"SessionHistory({list(self)!r})"
+
+    def append(self, result: CommandResult) -> None:
+        self._session.current_node = self._session.current_node.add_child(result)
+
+    def extend(self, results: Iterable[CommandResult]) -> None:
+        for result in results:
+            self.append(result)
+
+    def pop(self) -> CommandResult:
+        node: TimelineNode = self._session.current_node
+        if node.result is None:
+            raise IndexError("pop from empty history")
+        self._session.undo()
+        return node.result
+
+
 class GameSession:
+    """A game in progress, kept as a tree of timelines rather than a single history.
+
+    Undo moves to the parent node and redo back to the child last visited, both in O(1), and
+    neither discards anything. Applying a command at a node that already has children starts a
+    new branch beside them. `checkout` switches to any node, and `fork` returns a second session
+    on the same tree, so that branches share every node of their common prefix.
+    """
+
     def __init__(self, initial_state: GameState, engine: GameEngine) -> None:
         self.initial_state: GameState = initial_state
         self.engine: GameEngine = engine
-        self.history: list[CommandResult] = []
+        self.root: TimelineNode = TimelineNode(state=initial_state)
+        self.current_node: TimelineNode = self.root
+
+    @property
+    def history(self) -> SessionHistory:
+        return SessionHistory(self)
 
     @property
     def current_state(self) -> GameState:
-        return self.history[-1].new_state if self.history else self.initial_state
+        return self.current_node.state
 
     def apply_command(self, command: Command) -> GameState:
         command_result: CommandResult = self.engine.apply_command(
@@ -22,13 +90,42 @@ class GameSession:
             command=command,
         )
         if command_result.success:
-            new_state: GameState = command_result.new_state
-            self.history.append(command_result)
-            return new_state
+            self.current_node = self.current_node.add_child(command_result)
         return self.current_state
 
+    def apply_commands(self, commands: Sequence[Command]) -> BatchResult:
+        """Apply `commands` atomically as one history entry, which a single `undo` reverts."""
+        batch_result: BatchResult = self.engine.apply_commands(
+            state=self.current_state,
+            commands=commands,
+        )
+        if batch_result.success:
+            self.current_node = self.current_node.add_child(batch_result)
+        return batch_result
+
     def undo(self) -> GameState:
-        if not self.history:
-            return self.current_state
-        _: CommandResult = self.history.pop()
+        parent: TimelineNode | None = self.current_node.parent
+        if parent is not None:
+            parent.redo_child = self.current_node
+            self.current_node = parent
         return self.current_state
+
+    def redo(self) -> GameState:
+        if self.current_node.redo_child is not None:
+            self.current_node = self.current_node.redo_child
+        return self.current_state
+
+    def checkout(self, node: TimelineNode) -> GameState:
+        """Make `node`, which must belong to this session's tree, the current node."""
+        self.current_node = node
+        return self.current_state
+
+    def branch_tips(self) -> list[TimelineNode]:
+        return self.root.leaves()
+
+    def fork(self, at: TimelineNode | None = None) -> GameSession:
+        """A session sharing this session's tree, positioned at `at` or the current node."""
+        forked = GameSession(initial_state=self.initial_state, engine=self.engine)
+        forked.root = self.root
+        forked.checkout(at if at is not None else self.current_node)
+        return forked
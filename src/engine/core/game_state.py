@@ -1,8 +1,11 @@
 from dataclasses import dataclass, field
 from enum import StrEnum
 
+from src.engine.core.galaxy_layout import GalaxyLayout, HexCoordinate, Wormhole
+from src.engine.core.occupancy import CommandTokenIndex
 from src.engine.core.player import Player
 from src.engine.tokens import CommandToken
+from src.engine.util.rng import RandomStream
 
 
 @dataclass(frozen=True)
@@ -21,6 +24,8 @@ class Phase(StrEnum):
 class System:
     id: int
     command_tokens: tuple[CommandToken, ...]
+    coordinate: HexCoordinate | None = None
+    wormholes: frozenset[Wormhole] = frozenset()
 
 
 Galaxy = set[System]
@@ -33,6 +38,36 @@ class GameState:
     phase: Phase
     galaxy: Galaxy
     turn_context: TurnContext = field(default_factory=lambda: TurnContext(has_taken_action=False))
+    # The only source of randomness in the game: every roll draws from and advances it.
+    rng: RandomStream = field(default_factory=lambda: RandomStream(seed=0))
+    # Derived from `galaxy`: rebuilt on first use whenever it does not describe this galaxy.
+    occupancy_index: CommandTokenIndex | None = field(default=None, compare=False, repr=False)
+    # Built from `galaxy` on first use unless given, then shared with every successor state.
+    galaxy_layout: GalaxyLayout | None = field(default=None, compare=False, repr=False)
+
+    def __getstate__(self) -> dict[str, object]:
+        # Derived caches are rebuilt on first use rather than stored with every pickle. A layout
+        # with hyperlanes cannot be rebuilt from the galaxy, so it is kept.
+        state: dict[str, object] = {**self.__dict__, "occupancy_index": None}
+        if self.galaxy_layout is not None and self.galaxy_layout.rebuildable:
+            state["galaxy_layout"] = None
+        return state
+
+    @property
+    def layout(self) -> GalaxyLayout:
+        layout: GalaxyLayout | None = self.galaxy_layout
+        if layout is None:
+            layout = GalaxyLayout.from_galaxy(self.galaxy)
+            object.__setattr__(self, "galaxy_layout", layout)
+        return layout
+
+    @property
+    def occupancy(self) -> CommandTokenIndex:
+        index: CommandTokenIndex | None = self.occupancy_index
+        if index is None or index.galaxy is not self.galaxy:
+            index = CommandTokenIndex.from_galaxy(self.galaxy)
+            object.__setattr__(self, "occupancy_index", index)
+        return index
 
     @property
     def initiative_order(self) -> tuple[Player, ...]:
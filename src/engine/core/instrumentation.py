@@ -0,0 +1,133 @@
+import time
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.engine.core.command import Command
+
+
+class EngineStep(StrEnum):
+    COMMAND = "command"
+    VALIDATE = "validate"
+    DERIVE = "derive"
+    # An event together with the cascade of events triggered by it.
+    EVENT = "event"
+    APPLY = "apply"
+    ON_EVENT = "on_event"
+    # The events one command or event rule derived or triggered, with their cascades; named
+    # after the rule.
+    CASCADE = "cascade"
+    INVARIANT = "invariant"
+
+
+class EngineProbe(Protocol):
+    """Observes the steps of `GameEngine.apply_command`.
+
+    Every `enter` is matched by an `exit` for the same step and name, and steps nest: the
+    command step encloses all others. Probes only observe; they never influence the result.
+    """
+
+    def sample(self, command: Command) -> bool:
+        """Whether to observe this command. Unsampled commands take the unprobed path."""
+        ...
+
+    def enter(self, step: EngineStep, name: str) -> None: ...
+
+    def exit(self, step: EngineStep, name: str) -> None: ...
+
+
+@dataclass
+class StepTiming:
+    calls: int = 0
+    total_ns: int = 0
+
+    @property
+    def total_seconds(self) -> float:
+        return self.total_ns / 1e9
+
+
+class ProbeGroup(EngineProbe):
+    """Fans engine steps out to several probes, each seeing only the commands it sampled."""
+
+    def __init__(self, probes: Sequence[EngineProbe]) -> None:
+        self.probes: Sequence[EngineProbe] = probes
+        self._sampled: list[EngineProbe] = []
+
+    def sample(self, command: Command) -> bool:
+        self._sampled = [probe for probe in self.probes if probe.sample(command)]
+        return bool(self._sampled)
+
+    def enter(self, step: EngineStep, name: str) -> None:
+        for probe in self._sampled:
+            probe.enter(step, name)
+
+    def exit(self, step: EngineStep, name: str) -> None:
+        for probe in self._sampled:
+            probe.exit(step, name)
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class EngineInstrumentation(EngineProbe):
+    """Call counts and cumulative wall time per engine step and per rule, event or invariant.
+
+    Commands are keyed by command type, everything else by class name.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[tuple[EngineStep, str], StepTiming] = {}
+        self._started_ns: list[int] = []
+
+    def sample(self, command: Command) -> bool:
+        return True
+
+    def enter(self, step: EngineStep, name: str) -> None:
+        self._started_ns.append(time.perf_counter_ns())
+
+    def exit(self, step: EngineStep, name: str) -> None:
+        elapsed_ns: int = time.perf_counter_ns() - self._started_ns.pop()
+        timing: StepTiming | None = self.timings.get((step, name))
+        if timing is None:
+            timing = self.timings[(step, name)] = StepTiming()
+        timing.calls += 1
+        timing.total_ns += elapsed_ns
+
+    def reset(self) -> None:
+        self.timings.clear()
+        self._started_ns.clear()
+
+    def snapshot(self) -> dict[str, dict[str, dict[str, float]]]:
+        snapshot: dict[str, dict[str, dict[str, float]]] = {step.value: {} for step in EngineStep}
+        for (step, name), timing in sorted(self.timings.items()):
+            snapshot[step.value][name] = {
+                "calls": timing.calls,
+                "total_seconds": timing.total_seconds,
+            }
+        return snapshot
+
+    def to_prometheus(self, prefix: str = "ti4_engine") -> str:
+        lines: list[str] = [
+            f"# HELP {prefix}_step_calls_total Number of times an engine step ran.",
+            f"# TYPE {prefix}_step_calls_total counter",
+        ]
+        ordered: list[tuple[tuple[EngineStep, str], StepTiming]] = sorted(self.timings.items())
+        for (step, name), timing in ordered:
+            lines.append(
+                f'{prefix}_step_calls_total{{step="{step.value}",name="{_escape_label(name)}"}} '
+                f"{timing.calls}"
+            )
+        lines += [
+            f"# HELP {prefix}_step_seconds_total Cumulative wall time spent in an engine step.",
+            f"# TYPE {prefix}_step_seconds_total counter",
+        ]
+        for (step, name), timing in ordered:
+            lines.append(
+                f'{prefix}_step_seconds_total{{step="{step.value}",name="{_escape_label(name)}"}} '
+                f"{timing.total_seconds:.9f}"
+            )
+        return "\n".join(lines) + "\n"
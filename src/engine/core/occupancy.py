@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.engine.core.game_state import Galaxy, System
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class CommandTokenIndex:
+    """Which players have a command token in which systems of one particular galaxy.
+
+    `system_masks` maps the id of every system holding a token to a bitmask of the players with
+    a token there, using the bits in `player_bits`. `activated` maps each player to the ids of
+    the systems holding one of their tokens. The index is only valid for the galaxy object in
+    `galaxy`; it is updated by `replacing_system` rather than rebuilt when a system changes.
+    """
+
+    galaxy: Galaxy
+    system_ids: frozenset[int]
+    player_bits: dict[str, int]
+    system_masks: dict[int, int]
+    activated: dict[str, frozenset[int]]
+
+    @classmethod
+    def from_galaxy(cls, galaxy: Galaxy) -> CommandTokenIndex:
+        index = cls(
+            galaxy=galaxy,
+            system_ids=frozenset(system.id for system in galaxy),
+            player_bits={},
+            system_masks={},
+            activated={},
+        )
+        for system in galaxy:
+            for token in system.command_tokens:
+                index._add(system_id=system.id, player_name=token.player_name)
+        return index
+
+    def has_token(self, system_id: int, player_name: str) -> bool:
+        bit: int | None = self.player_bits.get(player_name)
+        return bit is not None and bool(self.system_masks.get(system_id, 0) & bit)
+
+    def activated_systems(self, player_name: str) -> frozenset[int]:
+        return self.activated.get(player_name, frozenset())
+
+    def players_in(self, system_id: int) -> frozenset[str]:
+        mask: int = self.system_masks.get(system_id, 0)
+        return frozenset(name for name, bit in self.player_bits.items() if mask & bit)
+
+    def replacing_system(self, old: System, new: System, galaxy: Galaxy) -> CommandTokenIndex:
+        """The index of `galaxy`, which is this index's galaxy with `old` replaced by `new`."""
+        old_names: set[str] = {token.player_name for token in old.command_tokens}
+        new_names: set[str] = {token.player_name for token in new.command_tokens}
+        index = CommandTokenIndex(
+            galaxy=galaxy,
+            system_ids=self.system_ids,
+            player_bits=self.player_bits,
+            system_masks=dict(self.system_masks),
+            activated=dict(self.activated),
+        )
+        if new_names - self.player_bits.keys():
+            object.__setattr__(index, "player_bits", dict(self.player_bits))
+        for name in old_names - new_names:
+            index._remove(system_id=old.id, player_name=name)
+        for name in new_names - old_names:
+            index._add(system_id=new.id, player_name=name)
+        return index
+
+    def _add(self, system_id: int, player_name: str) -> None:
+        bit: int = self.player_bits.setdefault(player_name, 1 << len(self.player_bits))
+        self.system_masks[system_id] = self.system_masks.get(system_id, 0) | bit
+        self.activated[player_name] = self.activated_systems(player_name) | {system_id}
+
+    def _remove(self, system_id: int, player_name: str) -> None:
+        mask: int = self.system_masks.get(system_id, 0) & ~self.player_bits[player_name]
+        if mask:
+            self.system_masks[system_id] = mask
+        else:
+            self.system_masks.pop(system_id, None)
+        self.activated[player_name] = self.activated_systems(player_name) - {system_id}
@@ -1,23 +1,34 @@
 from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from src.engine.strategy_cards import StrategyCard
 from src.engine.tokens import CommandToken, TokenType
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 
 @dataclass(frozen=True)
 class CommandSheet:
-    tactic: list[CommandToken] = field(default_factory=list)
-    fleet: list[CommandToken] = field(default_factory=list)
-    strategy: list[CommandToken] = field(default_factory=list)
+    # Token pools are stored as tuples, so that a sheet never changes once built.
+    tactic: tuple[CommandToken, ...] = ()
+    fleet: tuple[CommandToken, ...] = ()
+    strategy: tuple[CommandToken, ...] = ()
+
+    def __post_init__(self) -> None:
+        for name in ("tactic", "fleet", "strategy"):
+            tokens: Sequence[CommandToken] = getattr(self, name)
+            if type(tokens) is not tuple:
+                object.__setattr__(self, name, tuple(tokens))
 
     @classmethod
     def make_from_int(
         cls, player_name: str, tactic: int, fleet: int, strategy: int
     ) -> CommandSheet:
         return cls(
-            tactic=[CommandToken(player_name=player_name)] * tactic,
-            fleet=[CommandToken(player_name=player_name)] * fleet,
-            strategy=[CommandToken(player_name=player_name)] * strategy,
+            tactic=(CommandToken(player_name=player_name),) * tactic,
+            fleet=(CommandToken(player_name=player_name),) * fleet,
+            strategy=(CommandToken(player_name=player_name),) * strategy,
         )
 
 
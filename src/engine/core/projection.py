@@ -0,0 +1,224 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING
+
+from src.engine.core.fingerprint import fingerprint
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
+    from src.engine.core.event import Event
+    from src.engine.core.game_engine import CommandResult
+    from src.engine.core.game_state import GameState, Phase
+    from src.engine.core.player import CommandSheet, Player
+    from src.engine.strategy_cards import StrategyCard
+    from src.engine.tokens import TokenType
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerSummary:
+    """What every player can see of one player."""
+
+    name: str
+    strategy_cards: tuple[StrategyCard, ...]
+    play_area: frozenset[TokenType]
+    tactic_tokens: int
+    fleet_tokens: int
+    strategy_tokens: int
+    has_passed: bool
+
+    @classmethod
+    def of(cls, player: Player) -> PlayerSummary:
+        return cls(
+            name=player.name,
+            strategy_cards=player.strategy_cards,
+            play_area=player.play_area,
+            tactic_tokens=len(player.command_sheet.tactic),
+            fleet_tokens=len(player.command_sheet.fleet),
+            strategy_tokens=len(player.command_sheet.strategy),
+            has_passed=player.has_passed,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class PlayerView:
+    """The game as one player, the `viewer`, is allowed to see it.
+
+    Only the viewer's own command sheet is given in full; everyone else is summarised. The
+    random stream is never part of a view, so no player can predict rolls. `command_tokens`
+    maps each system holding a command token to the names of the players with a token there.
+    """
+
+    viewer: str
+    phase: Phase
+    active_player: str
+    has_taken_action: bool
+    players: tuple[PlayerSummary, ...]
+    own_command_sheet: CommandSheet
+    command_tokens: Mapping[int, frozenset[str]]
+
+    @classmethod
+    def from_state(cls, state: GameState, viewer: str) -> PlayerView:
+        return cls(
+            viewer=viewer,
+            phase=state.phase,
+            active_player=state.active_player.name,
+            has_taken_action=state.turn_context.has_taken_action,
+            players=tuple(PlayerSummary.of(player) for player in state.players),
+            own_command_sheet=state.get_player(name=viewer).command_sheet,
+            command_tokens={
+                system_id: state.occupancy.players_in(system_id)
+                for system_id in state.occupancy.system_masks
+            },
+        )
+
+    def summary(self, name: str) -> PlayerSummary:
+        try:
+            return next(player for player in self.players if player.name == name)
+        except StopIteration:
+            raise ValueError(f"Player with name {name} not found in view") from None
+
+    def advanced(self, events: Sequence[Event], new_state: GameState) -> PlayerView:
+        """This view updated to `new_state`, reached from this view's state through `events`.
+
+        Only the players and systems the events touched are read from `new_state`; any event
+        that does not record its changes makes it rebuild the view from scratch.
+        """
+        changes: ViewChanges | None = ViewChanges.collect(events, active_player=self.active_player)
+        if changes is None:
+            return PlayerView.from_state(new_state, viewer=self.viewer)
+        players: tuple[PlayerSummary, ...] = self.players
+        own_command_sheet: CommandSheet = self.own_command_sheet
+        if changes.all_players or changes.players:
+            previous: dict[str, PlayerSummary] = {player.name: player for player in self.players}
+            players = tuple(
+                PlayerSummary.of(player)
+                if changes.all_players or player.name in changes.players
+                else previous[player.name]
+                for player in new_state.players
+            )
+            if changes.all_players or self.viewer in changes.players:
+                own_command_sheet = new_state.get_player(name=self.viewer).command_sheet
+        command_tokens: Mapping[int, frozenset[str]] = self.command_tokens
+        if changes.all_systems:
+            command_tokens = PlayerView.from_state(new_state, viewer=self.viewer).command_tokens
+        elif changes.systems:
+            updated: dict[int, frozenset[str]] = dict(self.command_tokens)
+            for system_id in changes.systems:
+                names: frozenset[str] = new_state.occupancy.players_in(system_id)
+                if names:
+                    updated[system_id] = names
+                else:
+                    updated.pop(system_id, None)
+            command_tokens = updated
+        return replace(
+            self,
+            phase=new_state.phase,
+            active_player=new_state.active_player.name,
+            has_taken_action=new_state.turn_context.has_taken_action,
+            players=players,
+            own_command_sheet=own_command_sheet,
+            command_tokens=command_tokens,
+        )
+
+
+@dataclass
+class ViewChanges:
+    """The players and systems a sequence of events touched, as each event records it.
+
+    The phase, active player and turn context are cheap enough to re-read after any event.
+    `active_player` is the player active before the events, until an event hands the turn on.
+    """
+
+    active_player: str | None
+    players: set[str] = field(default_factory=set)
+    systems: set[int] = field(default_factory=set)
+    all_players: bool = False
+    all_systems: bool = False
+
+    @classmethod
+    def collect(cls, events: Sequence[Event], active_player: str) -> ViewChanges | None:
+        """None if some event does not record what it changed."""
+        changes = cls(active_player=active_player)
+        for event in events:
+            if not event.record_view_changes(changes):
+                return None
+        return changes
+
+    def add_active_player(self) -> None:
+        """Mark the active player as changed, or every player once it is no longer known."""
+        if self.active_player is not None:
+            self.players.add(self.active_player)
+        else:
+            self.all_players = True
+
+
+@dataclass
+class ProjectionStatistics:
+    hits: int = 0
+    misses: int = 0
+    incremental_updates: int = 0
+    evictions: int = 0
+
+
+class ProjectionCache:
+    """Per-player views of recent states, kept for every adapter that asks for them.
+
+    Views are cached per (state fingerprint, player) in least-recently-used order, up to
+    `max_entries`. `advance` derives the views of a command's resulting state from the cached
+    views of the state it was applied to, using the command's resolved events, instead of
+    projecting the new state again for every player.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries: int = max_entries
+        self.statistics = ProjectionStatistics()
+        self._views: OrderedDict[tuple[bytes, str], PlayerView] = OrderedDict()
+        # The players with a cached view of each state, so that `advance` can update them all.
+        self._viewers: dict[bytes, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._views)
+
+    def view(self, state: GameState, player: str) -> PlayerView:
+        key: tuple[bytes, str] = (fingerprint(state), player)
+        view: PlayerView | None = self._views.get(key)
+        if view is not None:
+            self.statistics.hits += 1
+            self._views.move_to_end(key)
+            return view
+        self.statistics.misses += 1
+        view = PlayerView.from_state(state, viewer=player)
+        self._store(key, view)
+        return view
+
+    def advance(self, state: GameState, result: CommandResult) -> dict[str, PlayerView]:
+        """The views of `result.new_state` for every player with a cached view of `state`."""
+        old_fingerprint: bytes = fingerprint(state)
+        new_fingerprint: bytes = fingerprint(result.new_state)
+        views: dict[str, PlayerView] = {}
+        for player in sorted(self._viewers.get(old_fingerprint, ())):
+            key: tuple[bytes, str] = (new_fingerprint, player)
+            view: PlayerView | None = self._views.get(key)
+            if view is None:
+                # Storing an earlier player's view may have evicted this one's old view.
+                old_view: PlayerView | None = self._views.get((old_fingerprint, player))
+                if old_view is None:
+                    view = PlayerView.from_state(result.new_state, viewer=player)
+                else:
+                    view = old_view.advanced(events=result.events, new_state=result.new_state)
+                    self.statistics.incremental_updates += 1
+                self._store(key, view)
+            views[player] = view
+        return views
+
+    def _store(self, key: tuple[bytes, str], view: PlayerView) -> None:
+        self._views[key] = view
+        self._viewers.setdefault(key[0], set()).add(key[1])
+        while len(self._views) > self.max_entries:
+            (state_fingerprint, player), _ = self._views.popitem(last=False)
+            viewers: set[str] = self._viewers[state_fingerprint]
+            viewers.discard(player)
+            if not viewers:
+                del self._viewers[state_fingerprint]
+            self.statistics.evictions += 1
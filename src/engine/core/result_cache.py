@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.engine.core.fingerprint import fingerprint
+from src.engine.util.sizing import deep_getsizeof
+
+if TYPE_CHECKING:
+    from src.engine.core.command import Command
+    from src.engine.core.game_engine import CommandResult
+    from src.engine.core.game_state import GameState
+
+ResultKey = tuple[bytes, bytes]
+
+
+@dataclass
+class ResultCacheStatistics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CommandResultCache:
+    """A bounded least-recently-used cache of command results, keyed by state and command.
+
+    Applying a command is a pure function of the state and the command, so the result of a
+    transition seen before, legal or not, can be returned again without running any rule.
+    The cache is bounded by a number of entries, by an estimate of the bytes the cached results
+    retain, or both. The byte estimate of an entry counts the whole resulting state, including
+    structure it shares with other states, so it errs on the side of evicting early.
+
+    The cache is safe to share between threads: lookups, insertions and evictions each hold a
+    lock, while keys and byte estimates are computed outside it.
+    """
+
+    def __init__(self, max_entries: int | None = 4096, max_bytes: int | None = None) -> None:
+        if max_entries is None and max_bytes is None:
+            raise ValueError("A result cache needs a bound on its entries, its bytes or both")
+        self.max_entries: int | None = max_entries
+        self.max_bytes: int | None = max_bytes
+        self.statistics = ResultCacheStatistics()
+        self.current_bytes: int = 0
+        self._entries: OrderedDict[ResultKey, tuple[CommandResult, int]] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict[str, object]:
+        state: dict[str, object] = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, object]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(state: GameState, command: Command) -> ResultKey:
+        return fingerprint(state), fingerprint(command)
+
+    def get(self, key: ResultKey) -> CommandResult | None:
+        # Every cached command pays for this lookup, and an explicit acquire and release is
+        # several times cheaper than entering the lock as a context manager.
+        self._lock.acquire()
+        try:
+            entry: tuple[CommandResult, int] | None = self._entries.get(key)
+            if entry is None:
+                self.statistics.misses += 1
+                return None
+            self.statistics.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        finally:
+            self._lock.release()
+
+    def put(self, key: ResultKey, result: CommandResult) -> None:
+        size: int = deep_getsizeof(result) if self.max_bytes is not None else 0
+        with self._lock:
+            previous: tuple[CommandResult, int] | None = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous[1]
+            self._entries[key] = (result, size)
+            self.current_bytes += size
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def _evict(self) -> None:
+        # Called with the lock held.
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.current_bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.current_bytes -= size
+            self.statistics.evictions += 1
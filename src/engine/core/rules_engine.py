@@ -3,8 +3,8 @@ from typing import TYPE_CHECKING, Protocol
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    from src.engine.core.command import CommandRule
-    from src.engine.core.event import EventRule
+    from src.engine.core.command import Command, CommandRule
+    from src.engine.core.event import Event, EventRule
 
 
 class RulesEngine(Protocol):
@@ -15,3 +15,11 @@ class RulesEngine(Protocol):
 
     command_rules: Sequence[CommandRule]
     event_rules: Sequence[EventRule]
+
+    def command_rules_for(self, command: Command) -> Sequence[CommandRule]:
+        """The command rules that may apply to `command`; by default all of them."""
+        return self.command_rules
+
+    def event_rules_for(self, event: Event) -> Sequence[EventRule]:
+        """The event rules that may react to `event`; by default all of them."""
+        return self.event_rules
@@ -1,10 +1,15 @@
+import importlib
 from collections.abc import Sequence
-from typing import Protocol, cast
+from dataclasses import dataclass
+from functools import cache
+from typing import TYPE_CHECKING, Protocol, cast
 
-from src.engine.actions import tactical_action
-from src.engine.core.command import CommandRule
-from src.engine.core.event import EventRule
-from src.engine.turns import end_turn, pass_action
+from src.engine.core.command import CommandType
+from src.engine.core.event import UNREGISTERED_TYPE_CODE, event_class
+
+if TYPE_CHECKING:
+    from src.engine.core.command import CommandRule
+    from src.engine.core.event import Event, EventRule
 
 
 class RulesModule(Protocol):
@@ -13,25 +18,177 @@ class RulesModule(Protocol):
     def get_event_rules(self) -> list[EventRule]: ...
 
 
-MODULES_WITH_RULES: Sequence[RulesModule] = [
-    cast(RulesModule, module)
-    for module in [
-        end_turn,
-        tactical_action,
-        pass_action,
-    ]
-]
+@dataclass(frozen=True)
+class RuleModuleEntry:
+    """Where a rules module lives and what it reacts to, known without importing it.
+
+    A module's command rules are only consulted for `command_types`, and its event rules only
+    for events of the classes named in `event_classes`, by module path and qualified name.
+    Rules outside those must be inapplicable.
+
+    `event_codes` are the type codes reserved for the module's own events. No two entries may
+    reserve the same code, so codes cannot collide whichever modules end up imported. Codes are
+    archived, so a reservation is only ever extended.
+    """
+
+    module_path: str
+    command_types: frozenset[CommandType] = frozenset()
+    event_classes: frozenset[str] = frozenset()
+    event_codes: frozenset[int] = frozenset()
+
+
+RULE_REGISTRY: Sequence[RuleModuleEntry] = (
+    RuleModuleEntry(
+        module_path="src.engine.turns.end_turn",
+        command_types=frozenset({CommandType.END_TURN}),
+        event_codes=frozenset({3}),
+    ),
+    RuleModuleEntry(
+        module_path="src.engine.actions.tactical_action",
+        command_types=frozenset({CommandType.INITIATE_TACTICAL_ACTION}),
+        event_codes=frozenset({1, 2}),
+    ),
+    RuleModuleEntry(
+        module_path="src.engine.turns.pass_action",
+        command_types=frozenset({CommandType.PASS_ACTION}),
+        event_classes=frozenset({"src.engine.turns.pass_action.PassEvent"}),
+        event_codes=frozenset({4, 5}),
+    ),
+    RuleModuleEntry(
+        module_path="src.engine.turns.status_phase",
+        event_codes=frozenset({6, 7, 8}),
+    ),
+)
+
+
+@dataclass(frozen=True)
+class RuleManifest:
+    """Registry entries indexed by the command type or event class they handle.
+
+    `by_event_code` maps every reserved event type code to the one entry reserving it.
+    """
+
+    entries: tuple[RuleModuleEntry, ...]
+    by_command_type: dict[CommandType, tuple[RuleModuleEntry, ...]]
+    by_event_class: dict[str, tuple[RuleModuleEntry, ...]]
+    by_event_code: dict[int, RuleModuleEntry]
+
+    @classmethod
+    def from_registry(cls, registry: Sequence[RuleModuleEntry]) -> RuleManifest:
+        by_command_type: dict[CommandType, list[RuleModuleEntry]] = {}
+        by_event_class: dict[str, list[RuleModuleEntry]] = {}
+        by_event_code: dict[int, RuleModuleEntry] = {}
+        for entry in registry:
+            for command_type in entry.command_types:
+                by_command_type.setdefault(command_type, []).append(entry)
+            for event_class_name in entry.event_classes:
+                by_event_class.setdefault(event_class_name, []).append(entry)
+            for type_code in sorted(entry.event_codes):
+                if type_code <= UNREGISTERED_TYPE_CODE:
+                    raise ValueError(f"Event type codes must be positive, got {type_code}")
+                owner: RuleModuleEntry | None = by_event_code.get(type_code)
+                if owner is not None:
+                    raise ValueError(
+                        f"Event type code {type_code} is reserved by both {owner.module_path} "
+                        f"and {entry.module_path}"
+                    )
+                by_event_code[type_code] = entry
+        return cls(
+            entries=tuple(registry),
+            by_command_type={key: tuple(value) for key, value in by_command_type.items()},
+            by_event_class={key: tuple(value) for key, value in by_event_class.items()},
+            by_event_code=by_event_code,
+        )
+
+
+class CompiledRuleSet:
+    """Rule instances built from a manifest, importing each rules module on first use.
+
+    Rules are stateless, so one compiled set is shared by every engine built from it. Lookups
+    return tuples that are cached after the first call for a given command type or event type
+    code. Unregistered events have no code to cache under and are never routed.
+    """
+
+    def __init__(self, manifest: RuleManifest) -> None:
+        self.manifest: RuleManifest = manifest
+        self._modules: dict[str, tuple[tuple[CommandRule, ...], tuple[EventRule, ...]]] = {}
+        self._command_rules: dict[CommandType, tuple[CommandRule, ...]] = {}
+        self._event_rules: dict[int, tuple[EventRule, ...]] = {}
+
+    @property
+    def loaded_module_paths(self) -> frozenset[str]:
+        return frozenset(self._modules)
+
+    def command_rules_for(self, command_type: CommandType) -> tuple[CommandRule, ...]:
+        rules: tuple[CommandRule, ...] | None = self._command_rules.get(command_type)
+        if rules is None:
+            rules = self._command_rules[command_type] = tuple(
+                rule
+                for entry in self.manifest.by_command_type.get(command_type, ())
+                for rule in self._load(entry)[0]
+            )
+        return rules
+
+    def event_rules_for(self, event: Event) -> tuple[EventRule, ...]:
+        rules: tuple[EventRule, ...] | None = self._event_rules.get(event.type_code)
+        if rules is None:
+            if event.type_code == UNREGISTERED_TYPE_CODE:
+                return ()
+            cls: type = type(event)
+            rules = self._event_rules[event.type_code] = tuple(
+                rule
+                for entry in self.manifest.by_event_class.get(
+                    f"{cls.__module__}.{cls.__qualname__}", ()
+                )
+                for rule in self._load(entry)[1]
+            )
+        return rules
+
+    def event_class(self, type_code: int) -> type[Event]:
+        """The event class registered for `type_code`, importing the module reserving it if needed.
+
+        Event classes are registered when their module is imported, and modules are only
+        imported on first use, so a code read back from storage may not be registered yet.
+        """
+        try:
+            return event_class(type_code)
+        except LookupError:
+            entry: RuleModuleEntry | None = self.manifest.by_event_code.get(type_code)
+            if entry is None:
+                raise
+            self._load(entry)
+        return event_class(type_code)
+
+    def all_command_rules(self) -> tuple[CommandRule, ...]:
+        """Every command rule in registry order. Imports every registered module."""
+        return tuple(rule for entry in self.manifest.entries for rule in self._load(entry)[0])
+
+    def all_event_rules(self) -> tuple[EventRule, ...]:
+        """Every event rule in registry order. Imports every registered module."""
+        return tuple(rule for entry in self.manifest.entries for rule in self._load(entry)[1])
+
+    def _load(
+        self, entry: RuleModuleEntry
+    ) -> tuple[tuple[CommandRule, ...], tuple[EventRule, ...]]:
+        rules = self._modules.get(entry.module_path)
+        if rules is None:
+            module: RulesModule = cast(RulesModule, importlib.import_module(entry.module_path))
+            rules = self._modules[entry.module_path] = (
+                tuple(module.get_command_rules()),
+                tuple(module.get_event_rules()),
+            )
+        return rules
+
+
+@cache
+def get_compiled_rule_set() -> CompiledRuleSet:
+    """The rule set for `RULE_REGISTRY`, shared by every engine in the process."""
+    return CompiledRuleSet(manifest=RuleManifest.from_registry(RULE_REGISTRY))
 
 
 def get_command_rules() -> list[CommandRule]:
-    rules: list[CommandRule] = []
-    for module in MODULES_WITH_RULES:
-        rules.extend(module.get_command_rules())
-    return rules
+    return list(get_compiled_rule_set().all_command_rules())
 
 
 def get_event_rules() -> list[EventRule]:
-    rules: list[EventRule] = []
-    for module in MODULES_WITH_RULES:
-        rules.extend(module.get_event_rules())
-    return rules
+    return list(get_compiled_rule_set().all_event_rules())
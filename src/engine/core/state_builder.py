@@ -0,0 +1,215 @@
+from abc import abstractmethod
+from dataclasses import FrozenInstanceError, fields, replace
+from types import FunctionType
+from typing import TYPE_CHECKING, Any
+
+from src.engine.core.event import Event
+from src.engine.core.game_state import GameState
+from src.engine.core.occupancy import CommandTokenIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from src.engine.core.galaxy_layout import GalaxyLayout
+    from src.engine.core.game_state import System
+    from src.engine.core.player import Player
+
+GAME_STATE_FIELDS: frozenset[str] = frozenset(field.name for field in fields(GameState))
+
+
+def _borrow_game_state_queries[T](cls: type[T]) -> type[T]:
+    """Give `cls` the read-only properties and query methods of `GameState` it does not define.
+
+    They only read state through attribute access, so they work unchanged on any object that
+    exposes the `GameState` fields as attributes.
+    """
+    for name, member in vars(GameState).items():
+        if name in vars(cls):
+            continue
+        if not name.startswith("_") and isinstance(member, (property, FunctionType)):
+            setattr(cls, name, member)
+    return cls
+
+
+@_borrow_game_state_queries
+class GameStateBuilder:
+    """A mutable working copy of a `GameState`, scoped to the resolution of one command.
+
+    Containers are copied the first time they are written, never mutated in place, so the state
+    the builder started from is left untouched. `freeze` produces the resulting `GameState`.
+    Fields can only be changed through `set`, `replace_player` and `replace_system`.
+    """
+
+    def __init__(self, state: GameState) -> None:
+        self.reset(state)
+
+    def reset(self, state: GameState) -> None:
+        object.__setattr__(self, "_base", state)
+        object.__setattr__(self, "_changes", {})
+        object.__setattr__(self, "_owned_players", None)
+        object.__setattr__(self, "_owned_galaxy", None)
+        object.__setattr__(self, "_occupancy", None)
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in GAME_STATE_FIELDS:
+            raise AttributeError(name)
+        if name in self._changes:
+            return self._changes[name]
+        return getattr(self._base, name)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}; use GameStateBuilder.set")
+
+    def set(self, **changes: Any) -> None:
+        unknown: set[str] = set(changes) - GAME_STATE_FIELDS
+        if unknown:
+            raise TypeError(f"GameState has no fields {sorted(unknown)}")
+        self._changes.update(changes)
+        if "players" in changes:
+            object.__setattr__(self, "_owned_players", None)
+        if "galaxy" in changes:
+            object.__setattr__(self, "_owned_galaxy", None)
+            object.__setattr__(self, "_occupancy", None)
+
+    @property
+    def occupancy(self) -> CommandTokenIndex:
+        """The command token index of the working galaxy, updated by `replace_system`."""
+        if self._occupancy is None:
+            if "galaxy" not in self._changes:
+                return self._base.occupancy
+            object.__setattr__(
+                self, "_occupancy", CommandTokenIndex.from_galaxy(self._changes["galaxy"])
+            )
+        return self._occupancy
+
+    @property
+    def layout(self) -> GalaxyLayout:
+        return self._base.layout
+
+    def replace_player(self, player: Player) -> None:
+        """Swap in `player` for the player with the same name."""
+        players: list[Player] | None = self._owned_players
+        if players is None:
+            players = list(self.players)
+            object.__setattr__(self, "_owned_players", players)
+            self._changes["players"] = players
+        for index, existing in enumerate(players):
+            if existing.name == player.name:
+                players[index] = player
+                return
+        raise ValueError(f"Player with name {player.name} not found in game state")
+
+    def replace_system(self, system: System) -> None:
+        """Swap in `system` for the system with the same id."""
+        index: CommandTokenIndex = self.occupancy
+        galaxy: set[System] | None = self._owned_galaxy
+        if galaxy is None:
+            galaxy = set(self.galaxy)
+            object.__setattr__(self, "_owned_galaxy", galaxy)
+            object.__setattr__(self, "_occupancy", index)
+            self._changes["galaxy"] = galaxy
+        old_system: System = self.get_system(id=system.id)
+        galaxy.discard(old_system)
+        galaxy.add(system)
+        object.__setattr__(
+            self, "_occupancy", index.replacing_system(old=old_system, new=system, galaxy=galaxy)
+        )
+
+    def replace_players(self, players: Iterable[Player]) -> None:
+        """Swap in every player in `players` for the player with the same name, in one pass."""
+        by_name: dict[str, Player] = {player.name: player for player in players}
+        unknown: set[str] = by_name.keys() - {player.name for player in self.players}
+        if unknown:
+            raise ValueError(f"Players with names {sorted(unknown)} not found in game state")
+        replaced: list[Player] = [by_name.get(player.name, player) for player in self.players]
+        self.set(players=replaced)
+        object.__setattr__(self, "_owned_players", replaced)
+
+    def replace_systems(self, systems: Iterable[System]) -> None:
+        """Swap in every system in `systems` for the system with the same id, in one pass.
+
+        The command token index is rebuilt once for the new galaxy rather than updated per
+        system.
+        """
+        by_id: dict[int, System] = {system.id: system for system in systems}
+        replaced: set[System] = {by_id.pop(system.id, system) for system in self.galaxy}
+        if by_id:
+            raise ValueError(f"Systems with ids {sorted(by_id)} not found in galaxy")
+        self.set(galaxy=replaced)
+        object.__setattr__(self, "_owned_galaxy", replaced)
+
+    def roll_dice(self, count: int, sides: int = 10) -> tuple[int, ...]:
+        """Roll dice from the state's random stream, advancing it past the rolls."""
+        rolls, rng = self.rng.roll_dice(count=count, sides=sides)
+        self.set(rng=rng)
+        return rolls
+
+    def apply(self, event: Event) -> None:
+        """Apply `event` in place, or through its immutable `apply` if it is not a BuilderEvent."""
+        if isinstance(event, BuilderEvent):
+            event.apply_to(self)
+        else:
+            self.reset(event.apply(previous_state=self.freeze()))
+
+    def freeze(self) -> GameState:
+        if not self._changes:
+            return self._base
+        changes: dict[str, Any] = dict(self._changes)
+        if isinstance(changes.get("players"), list):
+            changes["players"] = tuple(changes["players"])
+        if self._occupancy is not None:
+            changes["occupancy_index"] = self._occupancy
+        frozen: GameState = replace(self._base, **changes)
+        self.reset(frozen)
+        return frozen
+
+    def view(self) -> GameStateView:
+        return GameStateView(self)
+
+
+@_borrow_game_state_queries
+class GameStateView:
+    """Read-only access to a builder's current state, handed to event rules.
+
+    Assigning to it raises `FrozenInstanceError`, exactly as assigning to a `GameState` does.
+    """
+
+    __slots__ = ("_builder",)
+
+    def __init__(self, builder: GameStateBuilder) -> None:
+        object.__setattr__(self, "_builder", builder)
+
+    def __getattr__(self, name: str) -> Any:
+        if name not in GAME_STATE_FIELDS:
+            raise AttributeError(name)
+        value: Any = getattr(self._builder, name)
+        return tuple(value) if isinstance(value, list) else value
+
+    def __setattr__(self, name: str, value: object) -> None:
+        raise FrozenInstanceError(f"cannot assign to field {name!r}")
+
+    @property
+    def occupancy(self) -> CommandTokenIndex:
+        return self._builder.occupancy
+
+    @property
+    def layout(self) -> GalaxyLayout:
+        return self._builder.layout
+
+
+class BuilderEvent(Event):
+    """An event written as an in-place change to a `GameStateBuilder`.
+
+    `apply` is derived from `apply_to`, so the event behaves identically whether the engine
+    resolves it immutably or transactionally.
+    """
+
+    __slots__ = ()
+
+    @abstractmethod
+    def apply_to(self, builder: GameStateBuilder) -> None: ...
+
+    def apply(self, previous_state: GameState) -> GameState:
+        builder = GameStateBuilder(previous_state)
+        self.apply_to(builder)
+        return builder.freeze()
@@ -1,12 +1,56 @@
-from collections.abc import Sequence
+from typing import TYPE_CHECKING
 
 from src.engine.core import rules_library
-from src.engine.core.command import CommandRule
-from src.engine.core.event import EventRule
 from src.engine.core.rules_engine import RulesEngine
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.engine.core.command import Command, CommandRule
+    from src.engine.core.event import Event, EventRule
+    from src.engine.core.rules_library import CompiledRuleSet
+
 
 class TI4RulesEngine(RulesEngine):
-    def __init__(self) -> None:
-        self.command_rules: Sequence[CommandRule] = rules_library.get_command_rules()
-        self.event_rules: Sequence[EventRule] = rules_library.get_event_rules()
+    """Dispatches commands and events through the shared, lazily loaded TI4 rule set.
+
+    Assigning `command_rules` or `event_rules` replaces the dispatch for that kind of rule with
+    the assigned sequence, which is then consulted in full for every command or event.
+    """
+
+    def __init__(self, rule_set: CompiledRuleSet | None = None) -> None:
+        self.rule_set: CompiledRuleSet = (
+            rule_set if rule_set is not None else rules_library.get_compiled_rule_set()
+        )
+        self._command_rules: Sequence[CommandRule] | None = None
+        self._event_rules: Sequence[EventRule] | None = None
+
+    @property
+    def command_rules(self) -> Sequence[CommandRule]:
+        if self._command_rules is not None:
+            return self._command_rules
+        return self.rule_set.all_command_rules()
+
+    @command_rules.setter
+    def command_rules(self, rules: Sequence[CommandRule]) -> None:
+        self._command_rules = rules
+
+    @property
+    def event_rules(self) -> Sequence[EventRule]:
+        if self._event_rules is not None:
+            return self._event_rules
+        return self.rule_set.all_event_rules()
+
+    @event_rules.setter
+    def event_rules(self, rules: Sequence[EventRule]) -> None:
+        self._event_rules = rules
+
+    def command_rules_for(self, command: Command) -> Sequence[CommandRule]:
+        if self._command_rules is not None:
+            return self._command_rules
+        return self.rule_set.command_rules_for(command.command_type)
+
+    def event_rules_for(self, event: Event) -> Sequence[EventRule]:
+        if self._event_rules is not None:
+            return self._event_rules
+        return self.rule_set.event_rules_for(event)
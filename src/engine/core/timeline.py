@@ -0,0 +1,62 @@
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.engine.core.game_engine import CommandResult
+    from src.engine.core.game_state import GameState
+
+
+@dataclass(eq=False, slots=True)
+class TimelineNode:
+    """A position in a game's timeline: the state reached and the result that led to it.
+
+    Nodes only point back to their parent, so every branch shares the nodes of its common
+    prefix with the branches it forked from.
+    """
+
+    state: GameState
+    result: CommandResult | None = None
+    parent: TimelineNode | None = None
+    depth: int = 0
+    children: list[TimelineNode] = field(default_factory=list)
+    # The child that redo moves to: the one most recently created or undone from.
+    redo_child: TimelineNode | None = None
+
+    def add_child(self, result: CommandResult) -> TimelineNode:
+        child = TimelineNode(
+            state=result.new_state, result=result, parent=self, depth=self.depth + 1
+        )
+        self.children.append(child)
+        self.redo_child = child
+        return child
+
+    def ancestor(self, depth: int) -> TimelineNode:
+        """The node at `depth` on the path from the root to this node."""
+        if not 0 <= depth <= self.depth:
+            raise IndexError(f"No ancestor at depth {depth} of a node at depth {self.depth}")
+        node: TimelineNode = self
+        while node.depth > depth:
+            node = node.parent  # type: ignore
+        return node
+
+    def path(self) -> list[TimelineNode]:
+        """The nodes from the root down to and including this node."""
+        nodes: list[TimelineNode] = []
+        node: TimelineNode | None = self
+        while node is not None:
+            nodes.append(node)
+            node = node.parent
+        nodes.reverse()
+        return nodes
+
+    def leaves(self) -> list[TimelineNode]:
+        """The tips of every branch that passes through this node."""
+        leaves: list[TimelineNode] = []
+        stack: list[TimelineNode] = [self]
+        while stack:
+            node: TimelineNode = stack.pop()
+            if node.children:
+                stack.extend(reversed(node.children))
+            else:
+                leaves.append(node)
+        return leaves
@@ -0,0 +1,93 @@
+import json
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.engine.core.instrumentation import EngineProbe, EngineStep
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+    from src.engine.core.command import Command
+
+
+@dataclass
+class Span:
+    step: EngineStep
+    name: str
+    start_ns: int
+    end_ns: int = 0
+    children: list[Span] = field(default_factory=list)
+
+    @property
+    def duration_ns(self) -> int:
+        return self.end_ns - self.start_ns
+
+    def walk(self, depth: int = 0) -> Iterator[tuple[int, Span]]:
+        yield depth, self
+        for child in self.children:
+            yield from child.walk(depth=depth + 1)
+
+
+class CascadeTracer(EngineProbe):
+    """Records a span tree per sampled command: command -> rules -> events -> triggered events.
+
+    The events a rule derived or triggered are enclosed in a `cascade` span named after the
+    rule. An event span encloses the `apply` of the event, the `on_event` of every event rule
+    and the cascade spans of the rules that triggered more events. Rules produce all their
+    events before any is resolved, so a rule's `derive` or `on_event` span and its cascade span
+    are siblings. Only the latest `max_traces` commands are kept.
+    Sampling is seeded so that which commands get traced is reproducible.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, max_traces: int = 1000, seed: int = 0) -> None:
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError(f"Sample rate must be between 0 and 1, got {sample_rate}")
+        self.sample_rate: float = sample_rate
+        self.traces: deque[Span] = deque(maxlen=max_traces)
+        self._random: random.Random = random.Random(seed)
+        self._open_spans: list[Span] = []
+
+    def sample(self, command: Command) -> bool:
+        return self.sample_rate >= 1.0 or self._random.random() < self.sample_rate
+
+    def enter(self, step: EngineStep, name: str) -> None:
+        span = Span(step=step, name=name, start_ns=time.perf_counter_ns())
+        if self._open_spans:
+            self._open_spans[-1].children.append(span)
+        self._open_spans.append(span)
+
+    def exit(self, step: EngineStep, name: str) -> None:
+        span: Span = self._open_spans.pop()
+        span.end_ns = time.perf_counter_ns()
+        if not self._open_spans:
+            self.traces.append(span)
+
+    def clear(self) -> None:
+        self.traces.clear()
+
+    def to_chrome_trace(self) -> dict[str, object]:
+        """The recorded spans as Chrome trace-event JSON, for Perfetto or about:tracing."""
+        trace_events: list[dict[str, object]] = []
+        for trace in self.traces:
+            for depth, span in trace.walk():
+                trace_events.append(
+                    {
+                        "name": span.name,
+                        "cat": span.step.value,
+                        "ph": "X",
+                        "ts": span.start_ns / 1e3,
+                        "dur": span.duration_ns / 1e3,
+                        "pid": 0,
+                        "tid": 0,
+                        "args": {"depth": depth},
+                    }
+                )
+        return {"traceEvents": trace_events, "displayTimeUnit": "ns"}
+
+    def dump_chrome_trace(self, path: Path) -> None:
+        with path.open("w") as trace_file:
+            json.dump(self.to_chrome_trace(), trace_file)
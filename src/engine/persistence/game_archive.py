@@ -0,0 +1,314 @@
+import lzma
+import pickle
+import struct
+import zlib
+from dataclasses import dataclass
+from enum import StrEnum
+from functools import cached_property
+from typing import TYPE_CHECKING, BinaryIO
+
+from src.engine.core.event import event_from_record, event_to_record
+from src.engine.core.rules_library import get_compiled_rule_set
+from src.engine.core.state_builder import GameStateBuilder
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from pathlib import Path
+    from types import TracebackType
+
+    from src.engine.core.command import Command
+    from src.engine.core.event import Event, EventRecord
+    from src.engine.core.game_engine import CommandResult
+    from src.engine.core.game_state import GameState
+
+ARCHIVE_MAGIC = b"TI4ARCH1"
+# The index offset, the codec name padded to eight bytes, and the magic again.
+_TRAILER: struct.Struct = struct.Struct("<Q8s8s")
+# Prefixes the checkpoint in a block, so that the moves after it can be read on their own.
+_CHECKPOINT_LENGTH: struct.Struct = struct.Struct("<Q")
+
+
+class ArchiveFormatError(ValueError):
+    pass
+
+
+class GameNotFoundError(KeyError):
+    pass
+
+
+class ArchiveCodec(StrEnum):
+    ZLIB = "zlib"
+    LZMA = "lzma"
+
+    def compress(self, data: bytes) -> bytes:
+        if self == ArchiveCodec.LZMA:
+            return lzma.compress(data)
+        return zlib.compress(data, level=6)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self == ArchiveCodec.LZMA:
+            return lzma.decompress(data)
+        return zlib.decompress(data)
+
+
+@dataclass(frozen=True)
+class ArchivedMove:
+    """A successful command and the events it resolved to, in order."""
+
+    command: Command
+    events: tuple[Event, ...]
+
+
+@dataclass(frozen=True)
+class ArchivedGame:
+    """Where a game's blocks are in the archive.
+
+    Block `b` holds the state before move `b * checkpoint_interval` and the next
+    `checkpoint_interval` moves, so any move is found without reading the blocks before it.
+    """
+
+    game_id: str
+    move_count: int
+    checkpoint_interval: int
+    # (offset, length) of each compressed block in the archive file.
+    blocks: tuple[tuple[int, int], ...]
+
+
+@dataclass
+class ArchiveStatistics:
+    blocks_read: int = 0
+    compressed_bytes_read: int = 0
+
+
+class ArchiveWriter:
+    """Writes games to a new archive file, one at a time, then the index on `close`.
+
+    Moves are buffered one block at a time, so games of any length can be streamed in.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        codec: ArchiveCodec = ArchiveCodec.ZLIB,
+        checkpoint_interval: int = 16,
+    ) -> None:
+        if checkpoint_interval < 1:
+            raise ValueError(
+                f"Checkpoints must be at least one move apart, got {checkpoint_interval}"
+            )
+        self.path: Path = path
+        self.codec: ArchiveCodec = codec
+        self.checkpoint_interval: int = checkpoint_interval
+        self._games: dict[str, ArchivedGame] = {}
+        self._file: BinaryIO = path.open("wb")
+        self._file.write(ARCHIVE_MAGIC)
+
+    def __enter__(self) -> ArchiveWriter:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def add_game(
+        self,
+        game_id: str,
+        initial_state: GameState,
+        moves: Iterable[tuple[Command, CommandResult]],
+    ) -> ArchivedGame:
+        if game_id in self._games:
+            raise ValueError(f"Game {game_id} is already in the archive")
+        blocks: list[tuple[int, int]] = []
+        checkpoint: GameState = initial_state
+        pending: list[tuple[Command, tuple[EventRecord, ...]]] = []
+        move_count: int = 0
+        for command, result in moves:
+            if not result.success:
+                raise ValueError(f"Move {move_count} of game {game_id} failed: {result.info}")
+            pending.append((command, tuple(event_to_record(event) for event in result.events)))
+            move_count += 1
+            if len(pending) == self.checkpoint_interval:
+                blocks.append(self._write_block(checkpoint, pending))
+                checkpoint = result.new_state
+                pending = []
+        if pending or not blocks:
+            blocks.append(self._write_block(checkpoint, pending))
+        game = ArchivedGame(
+            game_id=game_id,
+            move_count=move_count,
+            checkpoint_interval=self.checkpoint_interval,
+            blocks=tuple(blocks),
+        )
+        self._games[game_id] = game
+        return game
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        index_offset: int = self._file.tell()
+        self._file.write(self.codec.compress(pickle.dumps(self._games)))
+        self._file.write(
+            _TRAILER.pack(index_offset, self.codec.value.encode().ljust(8, b"\0"), ARCHIVE_MAGIC)
+        )
+        self._file.close()
+
+    def _write_block(
+        self, checkpoint: GameState, moves: list[tuple[Command, tuple[EventRecord, ...]]]
+    ) -> tuple[int, int]:
+        pickled_checkpoint: bytes = pickle.dumps(checkpoint)
+        data: bytes = self.codec.compress(
+            _CHECKPOINT_LENGTH.pack(len(pickled_checkpoint))
+            + pickled_checkpoint
+            + pickle.dumps(tuple(moves))
+        )
+        offset: int = self._file.tell()
+        self._file.write(data)
+        return offset, len(data)
+
+
+class GameArchive:
+    """Random access to the games of an archive written by `ArchiveWriter`.
+
+    Opening an archive reads only its index. Finding the state at any move of any game reads
+    and decompresses a single block: the checkpoint before that move is replayed forward by
+    applying the archived events, without consulting the rules again. Reading only moves never
+    unpickles a checkpoint. The last block read is kept, so walking through the moves of a game
+    decompresses each block once.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path: Path = path
+        self.statistics = ArchiveStatistics()
+        self._file: BinaryIO = path.open("rb")
+        self._cached_block: tuple[tuple[str, int], _Block] | None = None
+        try:
+            self.codec, self._games = self._read_index()
+        except BaseException:
+            self._file.close()
+            raise
+
+    def __enter__(self) -> GameArchive:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+    def __contains__(self, game_id: object) -> bool:
+        return game_id in self._games
+
+    @property
+    def game_ids(self) -> tuple[str, ...]:
+        """Games in the order they were written."""
+        return tuple(self._games)
+
+    def game(self, game_id: str) -> ArchivedGame:
+        try:
+            return self._games[game_id]
+        except KeyError:
+            raise GameNotFoundError(game_id) from None
+
+    def initial_state(self, game_id: str) -> GameState:
+        return self._read_block(game_id, block=0).checkpoint
+
+    def moves(self, game_id: str, start: int = 0) -> Iterator[ArchivedMove]:
+        """The moves of a game from move `start` on, decompressing one block at a time."""
+        game: ArchivedGame = self.game(game_id)
+        if not 0 <= start <= game.move_count:
+            raise IndexError(f"Game {game_id} has no move {start}")
+        first_block: int = start // game.checkpoint_interval
+        for block in range(first_block, len(game.blocks)):
+            block_moves: tuple[ArchivedMove, ...] = self._read_block(game_id, block).moves
+            skip: int = start - block * game.checkpoint_interval if block == first_block else 0
+            yield from block_moves[skip:]
+
+    def state_at(self, game_id: str, move: int) -> GameState:
+        """The state after the first `move` moves of a game; move 0 is its initial state."""
+        game: ArchivedGame = self.game(game_id)
+        if not 0 <= move <= game.move_count:
+            raise IndexError(f"Game {game_id} has {game.move_count} moves, not {move}")
+        # The state after the last move of a full final block is only reachable by replay.
+        block: int = min(move // game.checkpoint_interval, len(game.blocks) - 1)
+        read: _Block = self._read_block(game_id, block)
+        replayed: tuple[ArchivedMove, ...] = read.moves[: move - block * game.checkpoint_interval]
+        if not replayed:
+            return read.checkpoint
+        builder = GameStateBuilder(read.checkpoint)
+        for archived_move in replayed:
+            for event in archived_move.events:
+                builder.apply(event)
+        return builder.freeze()
+
+    def close(self) -> None:
+        self._file.close()
+
+    def _read_index(self) -> tuple[ArchiveCodec, dict[str, ArchivedGame]]:
+        self._file.seek(0)
+        if self._file.read(len(ARCHIVE_MAGIC)) != ARCHIVE_MAGIC:
+            raise ArchiveFormatError(f"{self.path} is not a game archive")
+        self._file.seek(-_TRAILER.size, 2)
+        trailer: bytes = self._file.read(_TRAILER.size)
+        if len(trailer) != _TRAILER.size:
+            raise ArchiveFormatError(f"{self.path} has no index; was it closed after writing?")
+        index_offset, codec_name, magic = _TRAILER.unpack(trailer)
+        if magic != ARCHIVE_MAGIC:
+            raise ArchiveFormatError(f"{self.path} has no index; was it closed after writing?")
+        codec = ArchiveCodec(codec_name.rstrip(b"\0").decode())
+        index_length: int = self._file.tell() - _TRAILER.size - index_offset
+        self._file.seek(index_offset)
+        games: dict[str, ArchivedGame] = pickle.loads(
+            codec.decompress(self._file.read(index_length))
+        )
+        return codec, games
+
+    def _read_block(self, game_id: str, block: int) -> _Block:
+        key: tuple[str, int] = (game_id, block)
+        if self._cached_block is not None and self._cached_block[0] == key:
+            return self._cached_block[1]
+        offset, length = self.game(game_id).blocks[block]
+        self._file.seek(offset)
+        data: bytes = self._file.read(length)
+        self.statistics.blocks_read += 1
+        self.statistics.compressed_bytes_read += length
+        read = _Block(self.codec.decompress(data))
+        self._cached_block = (key, read)
+        return read
+
+
+class _Block:
+    """A decompressed block, unpickling its checkpoint and its moves only when first needed."""
+
+    def __init__(self, payload: bytes) -> None:
+        self._payload: bytes = payload
+        (checkpoint_length,) = _CHECKPOINT_LENGTH.unpack_from(payload)
+        self._moves_offset: int = _CHECKPOINT_LENGTH.size + checkpoint_length
+
+    @cached_property
+    def checkpoint(self) -> GameState:
+        return pickle.loads(memoryview(self._payload)[_CHECKPOINT_LENGTH.size : self._moves_offset])
+
+    @cached_property
+    def moves(self) -> tuple[ArchivedMove, ...]:
+        records: tuple[tuple[Command, tuple[EventRecord, ...]], ...] = pickle.loads(
+            memoryview(self._payload)[self._moves_offset :]
+        )
+        # Reading a game back may be the first use of the rules modules defining its events.
+        event_class: Callable[[int], type[Event]] = get_compiled_rule_set().event_class
+        return tuple(
+            ArchivedMove(
+                command=command,
+                events=tuple(event_from_record(r, classes=event_class) for r in events),
+            )
+            for command, events in records
+        )
@@ -0,0 +1,238 @@
+import pickle
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from enum import StrEnum
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.engine.core.game_session import GameSession
+from src.engine.util.sizing import deep_getsizeof
+
+if TYPE_CHECKING:
+    from src.engine.core.command import Command
+    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_state import GameState
+
+_SESSION_ID_PATTERN: re.Pattern[str] = re.compile(r"[A-Za-z0-9_\-][A-Za-z0-9_.\-]*")
+CHECKPOINT_FILE_NAME = "checkpoint.pickle"
+LOG_FILE_NAME = "log.pickle"
+
+
+def _estimate_session_bytes(session: GameSession) -> int:
+    return deep_getsizeof((session.initial_state, session.root))
+
+
+class SessionNotFoundError(KeyError):
+    pass
+
+
+class LogEntryKind(StrEnum):
+    COMMAND = "command"
+    UNDO = "undo"
+    REDO = "redo"
+
+
+@dataclass(frozen=True)
+class Checkpoint:
+    """The state of a session at the moment it was evicted, and where its replay log ended."""
+
+    state: GameState
+    log_offset: int
+
+
+@dataclass
+class SessionStoreMetrics:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    rehydrate_seconds_total: float = 0.0
+    rehydrate_seconds_max: float = 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def mean_rehydrate_seconds(self) -> float:
+        return self.rehydrate_seconds_total / self.misses if self.misses else 0.0
+
+
+class SessionStore:
+    """Keeps recently used sessions in memory and the rest on disk.
+
+    Every successful command, undo and redo is appended to a per-session replay log as it
+    happens. Evicting a session writes a checkpoint of its current state together with the byte
+    offset the log had reached, then drops it from memory. The next access loads the checkpoint
+    and replays whatever the log holds past that offset.
+
+    A rehydrated session's history starts at its checkpoint, so undo cannot reach back past the
+    point where the session was last evicted. Only what the store's methods do is persisted,
+    which is why the sessions themselves are never handed out: checking out or forking a branch
+    would name nodes that do not survive a checkpoint.
+    """
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        directory: Path,
+        max_sessions: int = 64,
+        max_bytes: int | None = None,
+    ) -> None:
+        if max_sessions < 1:
+            raise ValueError("A session store must be able to hold at least one session.")
+        self.engine: GameEngine = engine
+        self.directory: Path = directory
+        self.max_sessions: int = max_sessions
+        self.max_bytes: int | None = max_bytes
+        self.metrics: SessionStoreMetrics = SessionStoreMetrics()
+        self._resident: OrderedDict[str, GameSession] = OrderedDict()
+        self._resident_bytes: dict[str, int] = {}
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def resident_session_ids(self) -> tuple[str, ...]:
+        """Resident sessions, least recently used first."""
+        return tuple(self._resident)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._resident_bytes.values())
+
+    def __contains__(self, session_id: object) -> bool:
+        if not isinstance(session_id, str) or not _SESSION_ID_PATTERN.fullmatch(session_id):
+            return False
+        return session_id in self._resident or self._checkpoint_path(session_id).exists()
+
+    def create_session(self, session_id: str, initial_state: GameState) -> None:
+        if session_id in self:
+            raise ValueError(f"Session {session_id} already exists in the store")
+        self._session_directory(session_id).mkdir()
+        self._log_path(session_id).touch()
+        self._write_checkpoint(session_id, Checkpoint(state=initial_state, log_offset=0))
+        session = GameSession(initial_state=initial_state, engine=self.engine)
+        self._admit(session_id, session)
+
+    def current_state(self, session_id: str) -> GameState:
+        return self._get_session(session_id).current_state
+
+    def history(self, session_id: str) -> tuple[CommandResult, ...]:
+        """The results on the path to the session's current state, since its last checkpoint."""
+        return tuple(self._get_session(session_id).history)
+
+    def _get_session(self, session_id: str) -> GameSession:
+        session: GameSession | None = self._resident.get(session_id)
+        if session is not None:
+            self.metrics.hits += 1
+            self._resident.move_to_end(session_id)
+            return session
+        self.metrics.misses += 1
+        started: float = time.perf_counter()
+        session = self._rehydrate(session_id)
+        elapsed: float = time.perf_counter() - started
+        self.metrics.rehydrate_seconds_total += elapsed
+        self.metrics.rehydrate_seconds_max = max(self.metrics.rehydrate_seconds_max, elapsed)
+        self._admit(session_id, session)
+        return session
+
+    def apply_command(self, session_id: str, command: Command) -> GameState:
+        session: GameSession = self._get_session(session_id)
+        history_length: int = len(session.history)
+        new_state: GameState = session.apply_command(command=command)
+        if len(session.history) > history_length:
+            self._append_log(session_id, LogEntryKind.COMMAND, command)
+            self._resident_bytes[session_id] += deep_getsizeof(session.history[-1])
+            self._enforce_budget(protected=session_id)
+        return new_state
+
+    def undo(self, session_id: str) -> GameState:
+        session: GameSession = self._get_session(session_id)
+        if not session.history:
+            return session.current_state
+        self._append_log(session_id, LogEntryKind.UNDO, None)
+        # Undo keeps the undone node for redo, so the session holds exactly what it held before.
+        return session.undo()
+
+    def redo(self, session_id: str) -> GameState:
+        session: GameSession = self._get_session(session_id)
+        if session.current_node.redo_child is None:
+            return session.current_state
+        self._append_log(session_id, LogEntryKind.REDO, None)
+        return session.redo()
+
+    def evict(self, session_id: str) -> None:
+        session: GameSession | None = self._resident.pop(session_id, None)
+        if session is None:
+            return
+        del self._resident_bytes[session_id]
+        log_offset: int = self._log_path(session_id).stat().st_size
+        self._write_checkpoint(
+            session_id, Checkpoint(state=session.current_state, log_offset=log_offset)
+        )
+        self.metrics.evictions += 1
+
+    def evict_all(self) -> None:
+        for session_id in list(self._resident):
+            self.evict(session_id)
+
+    def _admit(self, session_id: str, session: GameSession) -> None:
+        self._resident[session_id] = session
+        self._resident_bytes[session_id] = _estimate_session_bytes(session)
+        self._enforce_budget(protected=session_id)
+
+    def _enforce_budget(self, protected: str) -> None:
+        while len(self._resident) > 1 and (
+            len(self._resident) > self.max_sessions
+            or (self.max_bytes is not None and self.resident_bytes > self.max_bytes)
+        ):
+            coldest: str = next(iter(self._resident))
+            if coldest == protected:
+                self._resident.move_to_end(protected)
+                coldest = next(iter(self._resident))
+            self.evict(coldest)
+
+    def _rehydrate(self, session_id: str) -> GameSession:
+        checkpoint_path: Path = self._checkpoint_path(session_id)
+        if not checkpoint_path.exists():
+            raise SessionNotFoundError(session_id)
+        with checkpoint_path.open("rb") as checkpoint_file:
+            checkpoint: Checkpoint = pickle.load(checkpoint_file)
+        session = GameSession(initial_state=checkpoint.state, engine=self.engine)
+        with self._log_path(session_id).open("rb") as log_file:
+            log_file.seek(checkpoint.log_offset)
+            while True:
+                try:
+                    kind, command = pickle.load(log_file)
+                except EOFError:
+                    break
+                match kind:
+                    case LogEntryKind.COMMAND:
+                        session.apply_command(command=command)
+                    case LogEntryKind.UNDO:
+                        session.undo()
+                    case LogEntryKind.REDO:
+                        session.redo()
+        return session
+
+    def _append_log(self, session_id: str, kind: LogEntryKind, command: Command | None) -> None:
+        with self._log_path(session_id).open("ab") as log_file:
+            pickle.dump((kind, command), log_file)
+
+    def _write_checkpoint(self, session_id: str, checkpoint: Checkpoint) -> None:
+        temporary_path: Path = self._checkpoint_path(session_id).with_suffix(".tmp")
+        with temporary_path.open("wb") as checkpoint_file:
+            pickle.dump(checkpoint, checkpoint_file)
+        temporary_path.replace(self._checkpoint_path(session_id))
+
+    def _session_directory(self, session_id: str) -> Path:
+        if not _SESSION_ID_PATTERN.fullmatch(session_id):
+            raise ValueError(f"Session id {session_id!r} is not a valid file name")
+        return self.directory / session_id
+
+    def _checkpoint_path(self, session_id: str) -> Path:
+        return self._session_directory(session_id) / CHECKPOINT_FILE_NAME
+
+    def _log_path(self, session_id: str) -> Path:
+        return self._session_directory(session_id) / LOG_FILE_NAME
@@ -0,0 +1,146 @@
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from src.engine.actions.tactical_action import TacticalActionEventType
+from src.engine.persistence.game_archive import GameArchive
+from src.engine.turns.end_turn import EndTurnEventType
+from src.engine.turns.pass_action import PassActionEventType
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+    from pathlib import Path
+
+    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_state import GameState
+    from src.engine.persistence.game_archive import ArchivedMove
+
+
+@dataclass
+class GameStatistics:
+    """Totals over a set of games, computed from their events alone.
+
+    A round is counted for each action phase in which a game has at least one move, and ends
+    with the advance to the status phase. A turn is the events up to and including an end of
+    turn; events after the last one of a game belong to no turn. Partial totals over disjoint
+    sets of games are combined with `merge`.
+    """
+
+    games: int = 0
+    moves: int = 0
+    events: int = 0
+    rounds: int = 0
+    passes: int = 0
+    turns: int = 0
+    turn_events: int = 0
+    tactical_actions: Counter[str] = field(default_factory=Counter)
+
+    @property
+    def rounds_per_game(self) -> float:
+        return self.rounds / self.games if self.games else 0.0
+
+    @property
+    def passes_per_round(self) -> float:
+        return self.passes / self.rounds if self.rounds else 0.0
+
+    @property
+    def mean_turn_events(self) -> float:
+        return self.turn_events / self.turns if self.turns else 0.0
+
+    def add_game(self, moves: Iterable[ArchivedMove]) -> None:
+        """Count one game, consuming its moves one at a time."""
+        self.games += 1
+        in_round: bool = False
+        current_turn_events: int = 0
+        for move in moves:
+            self.moves += 1
+            if not in_round:
+                self.rounds += 1
+                in_round = True
+            for event in move.events:
+                self.events += 1
+                current_turn_events += 1
+                match event.type_code:
+                    case TacticalActionEventType.ACTIVATE_SYSTEM:
+                        self.tactical_actions[event.player_id] += 1  # type: ignore
+                    case PassActionEventType.PASS_ACTION:
+                        self.passes += 1
+                    case PassActionEventType.ADVANCE_ACTION_TO_STATUS_PHASE:
+                        in_round = False
+                    case EndTurnEventType.END_TURN:
+                        self.turns += 1
+                        self.turn_events += current_turn_events
+                        current_turn_events = 0
+
+    def merge(self, other: GameStatistics) -> None:
+        self.games += other.games
+        self.moves += other.moves
+        self.events += other.events
+        self.rounds += other.rounds
+        self.passes += other.passes
+        self.turns += other.turns
+        self.turn_events += other.turn_events
+        self.tactical_actions.update(other.tactical_actions)
+
+
+def replay_states(archive: GameArchive, game_id: str, engine: GameEngine) -> Iterator[GameState]:
+    """The state after each move of a game, replaying its commands through `engine`.
+
+    For analyses that need states rather than events; a rejected command raises ValueError.
+    """
+    state: GameState = archive.initial_state(game_id)
+    for index, move in enumerate(archive.moves(game_id)):
+        result: CommandResult = engine.apply_command(state=state, command=move.command)
+        if not result.success:
+            raise ValueError(f"Move {index} of game {game_id} was rejected: {result.info}")
+        state = result.new_state
+        yield state
+
+
+# The archive each worker process opens once, with its game ids, so tasks only carry a range.
+_WORKER_ARCHIVE: GameArchive | None = None
+_WORKER_GAME_IDS: tuple[str, ...] = ()
+
+
+def _open_worker_archive(path: Path) -> None:
+    global _WORKER_ARCHIVE, _WORKER_GAME_IDS
+    _WORKER_ARCHIVE = GameArchive(path)
+    _WORKER_GAME_IDS = _WORKER_ARCHIVE.game_ids
+
+
+def _collect_chunk(start: int, stop: int) -> GameStatistics:
+    archive: GameArchive = _WORKER_ARCHIVE  # type: ignore
+    statistics = GameStatistics()
+    for game_id in _WORKER_GAME_IDS[start:stop]:
+        statistics.add_game(archive.moves(game_id))
+    return statistics
+
+
+def collect_statistics(path: Path, processes: int = 1, chunk_size: int = 256) -> GameStatistics:
+    """`GameStatistics` over every game of the archive at `path`.
+
+    Games are streamed block by block and never replayed, so memory stays bounded by one block
+    per process however long the games are. With more than one process, each worker opens the
+    archive itself and counts chunks of `chunk_size` consecutive games; only the chunk bounds
+    and the partial totals cross process boundaries.
+    """
+    if chunk_size < 1:
+        raise ValueError(f"Chunks must hold at least one game, got {chunk_size}")
+    with GameArchive(path) as archive:
+        game_count: int = len(archive)
+        if processes <= 1:
+            statistics = GameStatistics()
+            for game_id in archive.game_ids:
+                statistics.add_game(archive.moves(game_id))
+            return statistics
+    starts: range = range(0, game_count, chunk_size)
+    statistics = GameStatistics()
+    with ProcessPoolExecutor(
+        max_workers=processes, initializer=_open_worker_archive, initargs=(path,)
+    ) as executor:
+        for partial in executor.map(
+            _collect_chunk, starts, [start + chunk_size for start in starts]
+        ):
+            statistics.merge(partial)
+    return statistics
@@ -0,0 +1,185 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Protocol
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.engine.core.game_state import GameState
+    from src.engine.core.occupancy import CommandTokenIndex
+    from src.engine.core.player import Player
+
+PLAYER_FEATURES = 6
+
+
+@dataclass(frozen=True)
+class FeatureEncoder:
+    """Encodes states of one game as rows of a `float32` matrix, for batched evaluation.
+
+    Each player, in `player_names` order, contributes their tactic, fleet and strategy token
+    counts, whether they passed, how many strategy cards they have ready and whether they are
+    active. Then each system, in `system_ids` order, contributes one column per player set to 1
+    where that player has a command token.
+    """
+
+    player_names: tuple[str, ...]
+    system_ids: tuple[int, ...]
+    _system_positions: dict[int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        positions: dict[int, int] = {system_id: i for i, system_id in enumerate(self.system_ids)}
+        object.__setattr__(self, "_system_positions", positions)
+
+    @classmethod
+    def for_state(cls, state: GameState) -> FeatureEncoder:
+        return cls(
+            player_names=tuple(player.name for player in state.players),
+            system_ids=state.layout.system_ids,
+        )
+
+    @property
+    def feature_count(self) -> int:
+        return len(self.player_names) * (PLAYER_FEATURES + len(self.system_ids))
+
+    def encode(self, states: Sequence[GameState]) -> np.ndarray:
+        """Gathers the features of every state in Python, then fills the matrix in two steps."""
+        player_count: int = len(self.player_names)
+        player_offset: int = player_count * PLAYER_FEATURES
+        player_rows: list[tuple[int, ...]] = []
+        token_rows: list[int] = []
+        token_columns: list[int] = []
+        for row, state in enumerate(states):
+            players: dict[str, Player] = {player.name: player for player in state.players}
+            occupancy: CommandTokenIndex = state.occupancy
+            for index, name in enumerate(self.player_names):
+                player: Player = players[name]
+                player_rows.append(
+                    (
+                        len(player.command_sheet.tactic),
+                        len(player.command_sheet.fleet),
+                        len(player.command_sheet.strategy),
+                        player.has_passed,
+                        sum(card.is_ready for card in player.strategy_cards),
+                        name == state.active_player.name,
+                    )
+                )
+                for system_id in occupancy.activated_systems(name):
+                    token_rows.append(row)
+                    token_columns.append(
+                        player_offset + self._system_positions[system_id] * player_count + index
+                    )
+        features: np.ndarray = np.zeros((len(states), self.feature_count), dtype=np.float32)
+        if states:
+            features[:, :player_offset] = np.array(player_rows, dtype=np.float32).reshape(
+                len(states), player_offset
+            )
+        features[token_rows, token_columns] = 1.0
+        return features
+
+
+class BatchEvaluator(Protocol):
+    def __call__(self, features: np.ndarray) -> np.ndarray:
+        """One value (or row of values) per row of `features`."""
+        ...
+
+
+class LinearEvaluator(BatchEvaluator):
+    """A heuristic scoring states with a fixed linear model: `features @ weights`."""
+
+    def __init__(self, weights: np.ndarray) -> None:
+        self.weights: np.ndarray = np.asarray(weights, dtype=np.float32)
+
+    def __call__(self, features: np.ndarray) -> np.ndarray:
+        return features @ self.weights
+
+
+@dataclass
+class BrokerStatistics:
+    batches: int = 0
+    evaluations: int = 0
+    # Time requests spent queued before their batch was evaluated, by the event loop clock.
+    wait_seconds_total: float = 0.0
+    wait_seconds_max: float = 0.0
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.evaluations / self.batches if self.batches else 0.0
+
+    @property
+    def mean_wait_seconds(self) -> float:
+        return self.wait_seconds_total / self.evaluations if self.evaluations else 0.0
+
+
+@dataclass(frozen=True)
+class _Request:
+    state: GameState
+    future: asyncio.Future[np.ndarray]
+    submitted: float
+
+
+class EvaluationBroker:
+    """Collects evaluation requests from concurrent searches and evaluates them in batches.
+
+    A batch is evaluated as soon as `max_batch_size` requests are waiting, or `max_delay`
+    seconds after the first of them arrived, whichever comes first: a larger batch uses the
+    evaluator's vectorisation better, a shorter delay answers a lone search sooner. Each batch
+    is encoded and evaluated in one call on the event loop's thread, and every caller gets its
+    own row of the result. If the evaluation raises, every request of the batch raises it.
+    """
+
+    def __init__(
+        self,
+        evaluator: BatchEvaluator,
+        encoder: FeatureEncoder,
+        max_batch_size: int = 64,
+        max_delay: float = 0.001,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError(f"Batches must hold at least one request, got {max_batch_size}")
+        self.evaluator: BatchEvaluator = evaluator
+        self.encoder: FeatureEncoder = encoder
+        self.max_batch_size: int = max_batch_size
+        self.max_delay: float = max_delay
+        self.statistics = BrokerStatistics()
+        self._pending: list[_Request] = []
+        self._deadline: asyncio.TimerHandle | None = None
+
+    async def evaluate(self, state: GameState) -> np.ndarray:
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        request = _Request(state=state, future=loop.create_future(), submitted=loop.time())
+        self._pending.append(request)
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._deadline is None:
+            self._deadline = loop.call_later(self.max_delay, self.flush)
+        return await request.future
+
+    def flush(self) -> None:
+        """Evaluate every waiting request now."""
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+        batch: list[_Request] = self._pending
+        self._pending = []
+        if not batch:
+            return
+        now: float = batch[0].future.get_loop().time()
+        try:
+            values: np.ndarray = self.evaluator(
+                self.encoder.encode([request.state for request in batch])
+            )
+        except Exception as e:
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+            return
+        for request, value in zip(batch, values, strict=True):
+            if not request.future.done():
+                request.future.set_result(value)
+        waits: list[float] = [now - request.submitted for request in batch]
+        self.statistics.batches += 1
+        self.statistics.evaluations += len(batch)
+        self.statistics.wait_seconds_total += sum(waits)
+        self.statistics.wait_seconds_max = max(self.statistics.wait_seconds_max, *waits)
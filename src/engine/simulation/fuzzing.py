@@ -0,0 +1,286 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import TYPE_CHECKING
+
+from src.engine.core.game_engine import InvariantViolationError
+from src.engine.core.game_session import GameSession
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_state,
+    legal_commands,
+    random_candidate_command,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from src.engine.core.command import Command
+    from src.engine.core.event import Event
+    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_state import GameState
+
+
+class FuzzCheck(StrEnum):
+    CRASH = "crash"
+    INVARIANT = "invariant"
+    DETERMINISM = "determinism"
+    UNDO = "undo"
+    DIFFERENTIAL = "differential"
+
+
+@dataclass(frozen=True)
+class FuzzFailure:
+    """A command sequence that fails `check`, minimised unless the fuzzer was told not to.
+
+    The sequence starts from `initial_state`, which is `generate_state(config, seed)`.
+    """
+
+    check: FuzzCheck
+    seed: int
+    detail: str
+    initial_state: GameState
+    commands: tuple[Command, ...]
+    original_length: int
+
+
+@dataclass(frozen=True)
+class FuzzReport:
+    sequences: int
+    # Commands applied by the primary engine while generating sequences, legal or not.
+    commands: int
+    seconds: float
+    failures: tuple[FuzzFailure, ...]
+
+    @property
+    def sequences_per_second(self) -> float:
+        return self.sequences / self.seconds if self.seconds else 0.0
+
+    @property
+    def commands_per_second(self) -> float:
+        return self.commands / self.seconds if self.seconds else 0.0
+
+
+def _outcomes(results: Sequence[CommandResult]) -> list[tuple[bool, GameState, tuple[Event, ...]]]:
+    # Compared with ==, which is quick on states that share most of their parts, unlike hashing.
+    return [(result.success, result.new_state, tuple(result.events)) for result in results]
+
+
+def minimise[T](items: Sequence[T], fails: Callable[[Sequence[T]], bool]) -> tuple[T, ...]:
+    """A subsequence of `items` that still `fails`, from which no single item can be removed.
+
+    Delta debugging: drop ever smaller chunks of the sequence while it keeps failing.
+    """
+    current: list[T] = list(items)
+    chunks: int = 2
+    while len(current) >= 2:
+        size: int = -(-len(current) // chunks)
+        for start in range(0, len(current), size):
+            candidate: list[T] = current[:start] + current[start + size :]
+            if fails(candidate):
+                current = candidate
+                chunks = max(chunks - 1, 2)
+                break
+        else:
+            if size == 1:
+                break
+            chunks = min(chunks * 2, len(current))
+    return tuple(current)
+
+
+class Fuzzer:
+    """Plays random command sequences on synthetic states and checks the engine against itself.
+
+    Each sequence starts from `generate_state(config, seed)` and draws `sequence_length`
+    commands for the state reached so far: a legal one with probability `legal_probability`,
+    otherwise any candidate, so that rejections are exercised too. A sequence fails
+    if the engine raises (an invariant violation or anything else), if replaying it through a
+    `GameSession` gives other results, if undoing it step by step does not retrace its states,
+    or, with a `reference` engine, if the two engines disagree on any result. Failing sequences
+    are minimised to a shortest sequence failing the same check.
+
+    The fuzzer is pickled to reach worker processes, so both engines must be picklable.
+    """
+
+    def __init__(
+        self,
+        engine: GameEngine,
+        config: SyntheticGameConfig | None = None,
+        sequence_length: int = 32,
+        reference: GameEngine | None = None,
+        minimise_failures: bool = True,
+        legal_probability: float = 0.5,
+    ) -> None:
+        self.engine: GameEngine = engine
+        self.config: SyntheticGameConfig = config if config is not None else SyntheticGameConfig()
+        self.sequence_length: int = sequence_length
+        self.reference: GameEngine | None = reference
+        self.minimise_failures: bool = minimise_failures
+        self.legal_probability: float = legal_probability
+
+    def run(self, sequences: int, first_seed: int = 0, processes: int = 1) -> FuzzReport:
+        started: float = time.perf_counter()
+        seeds: range = range(first_seed, first_seed + sequences)
+        if processes > 1:
+            # A few chunks per process, so that a slow chunk does not leave the others idle.
+            chunk_size: int = max(1, -(-sequences // (processes * 4)))
+            chunks: list[range] = [
+                seeds[start : start + chunk_size] for start in range(0, sequences, chunk_size)
+            ]
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                outcomes: list[tuple[int, list[FuzzFailure]]] = list(
+                    executor.map(self._run_seeds, chunks)
+                )
+        else:
+            outcomes = [self._run_seeds(seeds)]
+        return FuzzReport(
+            sequences=sequences,
+            commands=sum(commands for commands, _ in outcomes),
+            seconds=time.perf_counter() - started,
+            failures=tuple(failure for _, failures in outcomes for failure in failures),
+        )
+
+    def run_seed(self, seed: int) -> tuple[int, FuzzFailure | None]:
+        """The commands applied for the sequence of `seed`, and its failure if it failed."""
+        initial_state: GameState = generate_state(config=self.config, seed=seed)
+        commands, results, error = self._generate(initial_state, random.Random(seed))
+        failure: tuple[FuzzCheck, str] | None
+        if error is not None:
+            failure = self._classify(error)
+        else:
+            failure = self._check(initial_state, commands, results)
+        if failure is None:
+            return len(commands), None
+        check, detail = failure
+        failing: tuple[Command, ...] = tuple(commands)
+        if self.minimise_failures:
+            failing = minimise(
+                failing, lambda candidate: self._failing_check(initial_state, candidate) == check
+            )
+            minimised_failure: tuple[FuzzCheck, str] | None = self._check_all(
+                initial_state, failing
+            )
+            if minimised_failure is not None:
+                detail = minimised_failure[1]
+        return len(commands), FuzzFailure(
+            check=check,
+            seed=seed,
+            detail=detail,
+            initial_state=initial_state,
+            commands=failing,
+            original_length=len(commands),
+        )
+
+    def _run_seeds(self, seeds: range) -> tuple[int, list[FuzzFailure]]:
+        commands: int = 0
+        failures: list[FuzzFailure] = []
+        for seed in seeds:
+            applied, failure = self.run_seed(seed)
+            commands += applied
+            if failure is not None:
+                failures.append(failure)
+        return commands, failures
+
+    def _generate(
+        self, state: GameState, rng: random.Random
+    ) -> tuple[list[Command], list[CommandResult], Exception | None]:
+        commands: list[Command] = []
+        results: list[CommandResult] = []
+        for _ in range(self.sequence_length):
+            command: Command | None = None
+            if rng.random() < self.legal_probability:
+                legal: list[Command] = legal_commands(engine=self.engine, state=state)
+                command = rng.choice(legal) if legal else None
+            if command is None:
+                command = random_candidate_command(state, rng)
+            if command is None:
+                break
+            commands.append(command)
+            try:
+                result: CommandResult = self.engine.apply_command(state=state, command=commands[-1])
+            except Exception as e:
+                return commands, results, e
+            results.append(result)
+            state = result.new_state
+        return commands, results, None
+
+    @staticmethod
+    def _classify(error: Exception) -> tuple[FuzzCheck, str]:
+        if isinstance(error, InvariantViolationError):
+            return FuzzCheck.INVARIANT, str(error)
+        return FuzzCheck.CRASH, f"{type(error).__name__}: {error}"
+
+    def _failing_check(
+        self, initial_state: GameState, commands: Sequence[Command]
+    ) -> FuzzCheck | None:
+        failure: tuple[FuzzCheck, str] | None = self._check_all(initial_state, commands)
+        return failure[0] if failure is not None else None
+
+    def _check_all(
+        self, initial_state: GameState, commands: Sequence[Command]
+    ) -> tuple[FuzzCheck, str] | None:
+        """`_check` for a sequence that has not been run yet."""
+        results: list[CommandResult] = []
+        state: GameState = initial_state
+        for command in commands:
+            try:
+                result: CommandResult = self.engine.apply_command(state=state, command=command)
+            except Exception as e:
+                return self._classify(e)
+            results.append(result)
+            state = result.new_state
+        return self._check(initial_state, commands, results)
+
+    def _check(
+        self, initial_state: GameState, commands: Sequence[Command], results: list[CommandResult]
+    ) -> tuple[FuzzCheck, str] | None:
+        """The first check that a sequence the engine ran without raising fails, if any."""
+        failure: tuple[FuzzCheck, str] | None = self._check_session(
+            initial_state, commands, [result for result in results if result.success]
+        )
+        if failure is None and self.reference is not None:
+            failure = self._check_reference(self.reference, initial_state, commands, results)
+        return failure
+
+    def _check_session(
+        self, initial_state: GameState, commands: Sequence[Command], successful: list[CommandResult]
+    ) -> tuple[FuzzCheck, str] | None:
+        """Replay through a `GameSession`, then undo every command and redo them all."""
+        session = GameSession(initial_state=initial_state, engine=self.engine)
+        for index, command in enumerate(commands):
+            try:
+                session.apply_command(command=command)
+            except Exception as e:
+                return FuzzCheck.DETERMINISM, f"Replay of command {index} raised {e!r}"
+        if _outcomes(list(session.history)) != _outcomes(successful):
+            return FuzzCheck.DETERMINISM, "Replaying the sequence gave different results"
+        # The states before each successful command, which undo should return to in reverse.
+        states: list[GameState] = [initial_state] + [result.new_state for result in successful]
+        for depth in range(len(successful) - 1, -1, -1):
+            if session.undo() != states[depth]:
+                return FuzzCheck.UNDO, f"Undo to depth {depth} did not restore its state"
+        for _ in successful:
+            session.redo()
+        if session.current_state != states[-1]:
+            return FuzzCheck.UNDO, "Redoing every undone command did not restore the final state"
+        return None
+
+    @staticmethod
+    def _check_reference(
+        reference: GameEngine,
+        initial_state: GameState,
+        commands: Sequence[Command],
+        results: list[CommandResult],
+    ) -> tuple[FuzzCheck, str] | None:
+        state: GameState = initial_state
+        for index, (command, expected) in enumerate(zip(commands, results, strict=True)):
+            try:
+                result: CommandResult = reference.apply_command(state=state, command=command)
+            except Exception as e:
+                return FuzzCheck.DIFFERENTIAL, f"Reference engine raised {e!r} on command {index}"
+            if _outcomes([result]) != _outcomes([expected]):
+                return FuzzCheck.DIFFERENTIAL, f"Engines disagree on command {index}"
+            state = result.new_state
+        return None
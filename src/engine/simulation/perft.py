@@ -0,0 +1,143 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+from src.engine.actions.tactical_action import ActivateCommand
+from src.engine.core.fingerprint import fingerprint
+from src.engine.simulation.synthetic import candidate_commands
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from src.engine.core.command import Command
+    from src.engine.core.game_engine import CommandResult, GameEngine
+    from src.engine.core.game_state import GameState
+
+
+@dataclass(frozen=True)
+class PerftResult:
+    """The outcome of `perft`.
+
+    `leaves` counts the legal command sequences of exactly `depth` commands, or with
+    deduplication the distinct states they reach; sequences that run out of legal commands
+    earlier are not counted. `nodes` counts every command the engine applied successfully on
+    the way. `divide` gives the leaves below each legal first command, in candidate order.
+    """
+
+    depth: int
+    leaves: int
+    nodes: int
+    seconds: float
+    divide: tuple[tuple[Command, int], ...]
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.seconds if self.seconds else 0.0
+
+    def report(self) -> str:
+        lines: list[str] = [f"{_describe(command)}: {leaves}" for command, leaves in self.divide]
+        lines.append(
+            f"depth {self.depth}: {self.leaves} leaves, {self.nodes} nodes in "
+            f"{self.seconds:.3f} s ({self.nodes_per_second:,.0f} nodes/s)"
+        )
+        return "\n".join(lines)
+
+
+def _describe(command: Command) -> str:
+    if isinstance(command, ActivateCommand):
+        return f"{command.command_type.value} {command.system_id}"
+    return command.command_type.value
+
+
+def legal_successors(engine: GameEngine, state: GameState) -> Iterator[tuple[Command, GameState]]:
+    """Every legal command from `state` with its resulting state, applying each candidate."""
+    for command in candidate_commands(state):
+        result: CommandResult = engine.apply_command(state=state, command=command)
+        if result.success:
+            yield command, result.new_state
+
+
+def _count_sequences(engine: GameEngine, state: GameState, depth: int) -> tuple[int, int]:
+    if depth == 0:
+        return 1, 0
+    leaves: int = 0
+    nodes: int = 0
+    for _, new_state in legal_successors(engine=engine, state=state):
+        subtree_leaves, subtree_nodes = _count_sequences(engine, new_state, depth - 1)
+        leaves += subtree_leaves
+        nodes += subtree_nodes + 1
+    return leaves, nodes
+
+
+def _distinct_leaves(
+    engine: GameEngine, state: GameState, depth: int
+) -> tuple[frozenset[bytes], int]:
+    """The fingerprints of the distinct states `depth` commands away.
+
+    The search goes level by level, so a position reached by several sequences is expanded once.
+    """
+    frontier: dict[bytes, GameState] = {fingerprint(state): state}
+    nodes: int = 0
+    for _ in range(depth):
+        next_frontier: dict[bytes, GameState] = {}
+        for position in frontier.values():
+            for _, new_state in legal_successors(engine=engine, state=position):
+                nodes += 1
+                next_frontier.setdefault(fingerprint(new_state), new_state)
+        frontier = next_frontier
+    return frozenset(frontier), nodes
+
+
+def _explore_subtree(
+    engine: GameEngine, state: GameState, depth: int, dedupe: bool
+) -> tuple[int | frozenset[bytes], int]:
+    if dedupe:
+        return _distinct_leaves(engine, state, depth)
+    return _count_sequences(engine, state, depth)
+
+
+def perft(
+    engine: GameEngine, state: GameState, depth: int, dedupe: bool = False, processes: int = 1
+) -> PerftResult:
+    """Enumerate every legal command sequence of `depth` commands from `state`.
+
+    With `dedupe`, sequences reaching the same state (by fingerprint) are counted once. With
+    more than one process, the subtree below each first command is explored in a worker
+    process. The engine and states are pickled to reach the workers, and since fingerprints are
+    the same in every process, leaves reached from different first commands are merged.
+    """
+    if depth < 1:
+        raise ValueError(f"Perft depth must be at least 1, got {depth}")
+    started: float = time.perf_counter()
+    roots: list[tuple[Command, GameState]] = list(legal_successors(engine=engine, state=state))
+    if processes > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            subtrees: list[tuple[int | frozenset[bytes], int]] = list(
+                executor.map(
+                    _explore_subtree,
+                    [engine] * len(roots),
+                    [new_state for _, new_state in roots],
+                    [depth - 1] * len(roots),
+                    [dedupe] * len(roots),
+                )
+            )
+    else:
+        subtrees = [
+            _explore_subtree(engine, new_state, depth - 1, dedupe) for _, new_state in roots
+        ]
+    divide: list[tuple[Command, int]] = []
+    leaf_fingerprints: set[bytes] = set()
+    for (command, _), (subtree_leaves, _) in zip(roots, subtrees, strict=True):
+        if isinstance(subtree_leaves, frozenset):
+            leaf_fingerprints |= subtree_leaves
+            divide.append((command, len(subtree_leaves)))
+        else:
+            divide.append((command, subtree_leaves))
+    return PerftResult(
+        depth=depth,
+        leaves=len(leaf_fingerprints) if dedupe else sum(leaves for _, leaves in divide),
+        nodes=len(roots) + sum(nodes for _, nodes in subtrees),
+        seconds=time.perf_counter() - started,
+        divide=tuple(divide),
+    )
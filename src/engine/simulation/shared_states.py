@@ -0,0 +1,391 @@
+import pickle
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.engine.core.galaxy_layout import GalaxyLayout, HexCoordinate
+from src.engine.core.game_state import GameState, Phase, System, TurnContext
+from src.engine.core.player import CommandSheet, Player
+from src.engine.strategy_cards import StrategyCard
+from src.engine.tokens import CommandToken, TokenType
+from src.engine.util.rng import MASK64, RandomStream
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Mapping, Sequence
+
+_PHASES: tuple[Phase, ...] = tuple(Phase)
+_TOKEN_TYPES: tuple[TokenType, ...] = tuple(TokenType)
+_WORD = np.dtype(np.int64)
+_HEADER_BYTES = _WORD.itemsize
+
+
+@dataclass(frozen=True)
+class _GameTables:
+    """What every state of one game shares, so that encoded states can refer to it by index."""
+
+    player_names: tuple[str, ...]
+    cards: tuple[tuple[str, int], ...]
+    # Every system of the galaxy without its command tokens, in layout order.
+    systems: tuple[System, ...]
+    coordinates: Mapping[int, HexCoordinate]
+    adjacency: Mapping[int, frozenset[int]]
+
+
+class _Decoder:
+    """Rebuilds states of one game, sharing every immutable object it can between them."""
+
+    def __init__(self, tables: _GameTables, layout: GalaxyLayout) -> None:
+        self.tables: _GameTables = tables
+        self.layout: GalaxyLayout = layout
+        self.tokens: tuple[CommandToken, ...] = tuple(
+            CommandToken(player_name=name) for name in tables.player_names
+        )
+        self.cards: dict[tuple[int, bool], StrategyCard] = {
+            (index, is_ready): StrategyCard(name=name, initiative=initiative, is_ready=is_ready)
+            for index, (name, initiative) in enumerate(tables.cards)
+            for is_ready in (True, False)
+        }
+
+    def decode(self, words: list[int]) -> GameState:
+        stream: Iterator[int] = iter(words)
+        phase: Phase = _PHASES[next(stream)]
+        has_taken_action: bool = bool(next(stream))
+        rng = RandomStream(seed=next(stream) & MASK64, counter=next(stream) & MASK64)
+        players: tuple[Player, ...] = tuple(
+            self._player(name, stream) for name in self.tables.player_names
+        )
+        active_player: Player = self._player(self.tables.player_names[next(stream)], stream)
+        galaxy: set[System] = set()
+        for prototype in self.tables.systems:
+            token_count: int = next(stream)
+            if not token_count:
+                galaxy.add(prototype)
+                continue
+            galaxy.add(
+                System(
+                    id=prototype.id,
+                    command_tokens=tuple(self.tokens[next(stream)] for _ in range(token_count)),
+                    coordinate=prototype.coordinate,
+                    wormholes=prototype.wormholes,
+                )
+            )
+        return GameState(
+            players=players,
+            active_player=active_player,
+            phase=phase,
+            galaxy=galaxy,
+            turn_context=TurnContext(has_taken_action=has_taken_action),
+            rng=rng,
+            galaxy_layout=self.layout,
+        )
+
+    def _player(self, name: str, stream: Iterator[int]) -> Player:
+        has_passed: bool = bool(next(stream))
+        play_area_bits: int = next(stream)
+        cards: tuple[StrategyCard, ...] = tuple(
+            self.cards[(next(stream), bool(next(stream)))] for _ in range(next(stream))
+        )
+        tactic, fleet, strategy = (
+            tuple(self.tokens[next(stream)] for _ in range(next(stream))) for _ in range(3)
+        )
+        return Player(
+            name=name,
+            strategy_cards=cards,
+            play_area=frozenset(
+                token_type
+                for bit, token_type in enumerate(_TOKEN_TYPES)
+                if play_area_bits & (1 << bit)
+            ),
+            command_sheet=CommandSheet(tactic=tactic, fleet=fleet, strategy=strategy),
+            has_passed=has_passed,
+        )
+
+
+class _Encoder:
+    def __init__(self, tables: _GameTables) -> None:
+        self.tables: _GameTables = tables
+        self.players: dict[str, int] = {name: i for i, name in enumerate(tables.player_names)}
+        self.cards: dict[tuple[str, int], int] = {card: i for i, card in enumerate(tables.cards)}
+
+    def encode(self, state: GameState) -> list[int]:
+        words: list[int] = [
+            _PHASES.index(state.phase),
+            state.turn_context.has_taken_action,
+            _signed(state.rng.seed),
+            _signed(state.rng.counter),
+        ]
+        players: dict[str, Player] = {player.name: player for player in state.players}
+        if players.keys() != self.players.keys():
+            raise ValueError("The state's players are not those of the published game")
+        for name in self.tables.player_names:
+            self._player(players[name], words)
+        words.append(self.players[state.active_player.name])
+        self._player(state.active_player, words)
+        systems: dict[int, System] = {system.id: system for system in state.galaxy}
+        if len(systems) != len(self.tables.systems):
+            raise ValueError("The state's galaxy is not that of the published game")
+        for prototype in self.tables.systems:
+            tokens: tuple[CommandToken, ...] = systems[prototype.id].command_tokens
+            words.append(len(tokens))
+            words.extend(self.players[token.player_name] for token in tokens)
+        return words
+
+    def _player(self, player: Player, words: list[int]) -> None:
+        words.append(player.has_passed)
+        words.append(sum(1 << _TOKEN_TYPES.index(token) for token in player.play_area))
+        words.append(len(player.strategy_cards))
+        for card in player.strategy_cards:
+            index: int | None = self.cards.get((card.name, card.initiative))
+            if index is None:
+                raise ValueError(f"Strategy card {card.name} is not part of the published game")
+            words.append(index)
+            words.append(card.is_ready)
+        sheet: CommandSheet = player.command_sheet
+        for tokens in (sheet.tactic, sheet.fleet, sheet.strategy):
+            words.append(len(tokens))
+            words.extend(self.players[token.player_name] for token in tokens)
+
+
+def _distances_offset(tables_length: int) -> int:
+    """Where the distance matrix starts: after the pickled tables, aligned to 8 bytes."""
+    return -(-(_HEADER_BYTES + tables_length) // 8) * 8
+
+
+def _close(block: SharedMemory) -> None:
+    try:
+        block.close()
+    except BufferError:
+        # Arrays still read from it, such as a decoded layout's distances; the mapping goes
+        # away with them.
+        pass
+
+
+def _signed(value: int) -> int:
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _game_tables(state: GameState) -> _GameTables:
+    layout: GalaxyLayout = state.layout
+    systems: dict[int, System] = {system.id: system for system in state.galaxy}
+    return _GameTables(
+        player_names=tuple(player.name for player in state.players),
+        cards=tuple(
+            sorted(
+                {
+                    (card.name, card.initiative)
+                    for player in state.players
+                    for card in player.strategy_cards
+                },
+                key=lambda card: card[1],
+            )
+        ),
+        systems=tuple(
+            System(
+                id=system_id,
+                command_tokens=(),
+                coordinate=systems[system_id].coordinate,
+                wormholes=systems[system_id].wormholes,
+            )
+            for system_id in layout.system_ids
+        ),
+        coordinates=dict(layout.coordinates),
+        adjacency=dict(layout.adjacency),
+    )
+
+
+# Blocks attached in this process, and the decoders of attached games, by block name.
+_ATTACHED: dict[str, SharedMemory] = {}
+_DECODERS: dict[str, _Decoder] = {}
+
+
+def _attach(block_name: str) -> SharedMemory:
+    block: SharedMemory | None = _ATTACHED.get(block_name)
+    if block is None:
+        # The publishing pool owns the block and unlinks it; attaching must not track it too.
+        block = _ATTACHED[block_name] = SharedMemory(name=block_name, track=False)
+    return block
+
+
+def detach_all() -> None:
+    """Close every block this process attached to; long-lived workers call it between jobs."""
+    _DECODERS.clear()
+    for block in _ATTACHED.values():
+        _close(block)
+    _ATTACHED.clear()
+
+
+@dataclass(frozen=True)
+class SharedGame:
+    """A handle on the data shared by every state of one published game, cheap to pickle."""
+
+    block_name: str
+
+    @property
+    def layout(self) -> GalaxyLayout:
+        """The galaxy layout, whose distance matrix is read in place from shared memory."""
+        return self._decoder().layout
+
+    def _decoder(self) -> _Decoder:
+        decoder: _Decoder | None = _DECODERS.get(self.block_name)
+        if decoder is None:
+            buffer: memoryview = _attach(self.block_name).buf  # type: ignore
+            length: int = int.from_bytes(buffer[:_HEADER_BYTES], "little")
+            tables: _GameTables = pickle.loads(buffer[_HEADER_BYTES : _HEADER_BYTES + length])
+            count: int = len(tables.systems)
+            distances: np.ndarray = np.ndarray(
+                (count, count), dtype=np.int16, buffer=buffer, offset=_distances_offset(length)
+            )
+            distances.flags.writeable = False
+            system_ids: tuple[int, ...] = tuple(system.id for system in tables.systems)
+            layout = GalaxyLayout(
+                system_ids=system_ids,
+                positions={system_id: index for index, system_id in enumerate(system_ids)},
+                coordinates=tables.coordinates,
+                adjacency=tables.adjacency,
+                distances=distances,
+            )
+            decoder = _DECODERS[self.block_name] = _Decoder(tables=tables, layout=layout)
+        return decoder
+
+
+class SharedState:
+    """A handle on one encoded state in shared memory, cheap to pickle and decoded on demand.
+
+    `encoded` reads the words in place; `state` decodes them into a `GameState` the first time
+    it is used, sharing the layout and every unchanged system with other states of the game.
+    """
+
+    def __init__(self, game: SharedGame, block_name: str, offset: int, length: int) -> None:
+        self.game: SharedGame = game
+        self.block_name: str = block_name
+        self.offset: int = offset
+        self.length: int = length
+        self._state: GameState | None = None
+
+    def __getstate__(self) -> tuple[SharedGame, str, int, int]:
+        return self.game, self.block_name, self.offset, self.length
+
+    def __setstate__(self, fields: tuple[SharedGame, str, int, int]) -> None:
+        self.game, self.block_name, self.offset, self.length = fields
+        self._state = None
+
+    def __repr__(self) -> str:
+        return f"SharedState(block_name={self.block_name!r}, offset={self.offset})"
+
+    @property
+    def encoded(self) -> np.ndarray:
+        return np.ndarray(
+            (self.length,),
+            dtype=_WORD,
+            buffer=_attach(self.block_name).buf,
+            offset=self.offset * _WORD.itemsize,
+        )
+
+    @property
+    def state(self) -> GameState:
+        if self._state is None:
+            self._state = self.game._decoder().decode(self.encoded.tolist())
+        return self._state
+
+
+class SharedStatePool:
+    """Publishes states of a game into shared memory for worker processes, and cleans up.
+
+    `publish_game` writes the data all states of a game share: names, the systems without
+    their tokens and the galaxy layout. `publish` then writes a batch of states into one block.
+    Workers receive the small handles instead of pickled states. Every handle holds a reference
+    on its block, and a block of states holds one on its game: `release` drops a reference and
+    unlinks a block once nothing refers to it. Closing the pool unlinks whatever is left.
+    """
+
+    def __init__(self) -> None:
+        self._blocks: dict[str, SharedMemory] = {}
+        self._references: dict[str, int] = {}
+        self._block_games: dict[str, SharedGame] = {}
+        self._encoders: dict[str, _Encoder] = {}
+
+    def __enter__(self) -> SharedStatePool:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def publish_game(self, state: GameState) -> SharedGame:
+        tables: _GameTables = _game_tables(state)
+        distances: np.ndarray = state.layout.distances
+        pickled: bytes = pickle.dumps(tables)
+        offset: int = _distances_offset(len(pickled))
+        block: SharedMemory = self._create(max(offset + distances.nbytes, 1))
+        buffer: memoryview = block.buf  # type: ignore
+        buffer[:_HEADER_BYTES] = len(pickled).to_bytes(_HEADER_BYTES, "little")
+        buffer[_HEADER_BYTES : _HEADER_BYTES + len(pickled)] = pickled
+        buffer[offset : offset + distances.nbytes] = distances.tobytes()
+        self._encoders[block.name] = _Encoder(tables)
+        return SharedGame(block_name=block.name)
+
+    def publish(self, game: SharedGame, states: Sequence[GameState]) -> list[SharedState]:
+        encoder: _Encoder = self._encoders[game.block_name]
+        if not states:
+            # No handle would hold a reference on a block, so none is created.
+            return []
+        encoded: list[list[int]] = [encoder.encode(state) for state in states]
+        words: np.ndarray = np.fromiter(
+            (word for state_words in encoded for word in state_words),
+            dtype=_WORD,
+            count=sum(len(state_words) for state_words in encoded),
+        )
+        block: SharedMemory = self._create(max(words.nbytes, 1))
+        np.ndarray(words.shape, dtype=_WORD, buffer=block.buf)[:] = words
+        self._references[block.name] = len(states)
+        self._block_games[block.name] = game
+        self._references[game.block_name] += 1
+        handles: list[SharedState] = []
+        offset: int = 0
+        for state_words in encoded:
+            handles.append(
+                SharedState(
+                    game=game, block_name=block.name, offset=offset, length=len(state_words)
+                )
+            )
+            offset += len(state_words)
+        return handles
+
+    def release(self, handle: SharedState | SharedGame) -> None:
+        self._release_block(handle.block_name)
+
+    def close(self) -> None:
+        for block_name in list(self._blocks):
+            self._unlink(block_name)
+
+    def _create(self, size: int) -> SharedMemory:
+        block = SharedMemory(create=True, size=size)
+        self._blocks[block.name] = block
+        self._references[block.name] = 1
+        return block
+
+    def _release_block(self, block_name: str) -> None:
+        if block_name not in self._blocks:
+            raise KeyError(f"Shared block {block_name} is not published by this pool")
+        self._references[block_name] -= 1
+        if self._references[block_name] == 0:
+            game: SharedGame | None = self._block_games.get(block_name)
+            self._unlink(block_name)
+            if game is not None and game.block_name in self._blocks:
+                self._release_block(game.block_name)
+
+    def _unlink(self, block_name: str) -> None:
+        _DECODERS.pop(block_name, None)
+        attached: SharedMemory | None = _ATTACHED.pop(block_name, None)
+        if attached is not None:
+            _close(attached)
+        block: SharedMemory = self._blocks.pop(block_name)
+        del self._references[block_name]
+        self._block_games.pop(block_name, None)
+        self._encoders.pop(block_name, None)
+        block.close()
+        block.unlink()
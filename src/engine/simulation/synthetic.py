@@ -0,0 +1,196 @@
+import random
+from dataclasses import dataclass, replace
+from typing import TYPE_CHECKING
+
+from src.engine.actions.tactical_action import ActivateCommand
+from src.engine.core.command import Command, CommandType
+from src.engine.core.galaxy_layout import HexCoordinate, hex_spiral
+from src.engine.core.game_state import GameState, Phase, System, TurnContext
+from src.engine.core.player import CommandSheet, Player
+from src.engine.strategy_cards import StrategyCard
+from src.engine.tokens import CommandToken, TokenType
+from src.engine.util.rng import MASK64, RandomStream
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from src.engine.core.game_engine import CommandResult, GameEngine
+
+STRATEGY_CARD_NAMES: tuple[str, ...] = (
+    "Leadership",
+    "Diplomacy",
+    "Politics",
+    "Construction",
+    "Trade",
+    "Warfare",
+    "Technology",
+    "Imperial",
+)
+MAX_PLAYERS = len(STRATEGY_CARD_NAMES)
+
+
+@dataclass(frozen=True)
+class SyntheticGameConfig:
+    """Shape of a generated game. Token counts are inclusive (min, max) ranges per player."""
+
+    player_count: int = 6
+    system_count: int = 37
+    strategy_cards_per_player: int = 1
+    tactic_tokens: tuple[int, int] = (0, 4)
+    fleet_tokens: tuple[int, int] = (0, 4)
+    strategy_tokens: tuple[int, int] = (0, 3)
+    ready_card_probability: float = 0.5
+    passed_probability: float = 0.2
+    board_token_probability: float = 0.05
+    taken_action_probability: float = 0.0
+    naalu_zero_probability: float = 0.0
+    phase: Phase = Phase.ACTION
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.player_count <= MAX_PLAYERS:
+            raise ValueError(f"Player count must be between 1 and {MAX_PLAYERS}")
+        if self.player_count * self.strategy_cards_per_player > MAX_PLAYERS:
+            raise ValueError(
+                f"{self.player_count} players cannot each hold "
+                f"{self.strategy_cards_per_player} of the {MAX_PLAYERS} strategy cards"
+            )
+
+
+def generate_state(config: SyntheticGameConfig, seed: int) -> GameState:
+    """A random game state of the configured size that satisfies every game invariant.
+
+    Passed players have exhausted all their strategy cards, and the active player is always an
+    unpassed player. Systems fill the hexes of the map ring by ring from the centre. The same
+    config and seed always produce the same state.
+    """
+    rng = random.Random(seed)
+    initiatives: list[int] = rng.sample(
+        range(1, MAX_PLAYERS + 1), config.player_count * config.strategy_cards_per_player
+    )
+    naalu_holder: int | None = (
+        rng.randrange(config.player_count) if rng.random() < config.naalu_zero_probability else None
+    )
+    players: list[Player] = []
+    for index in range(config.player_count):
+        name: str = f"Player{index + 1}"
+        has_passed: bool = rng.random() < config.passed_probability
+        dealt: list[int] = initiatives[
+            index * config.strategy_cards_per_player : (index + 1)
+            * config.strategy_cards_per_player
+        ]
+        players.append(
+            Player(
+                name=name,
+                strategy_cards=tuple(
+                    StrategyCard(
+                        name=STRATEGY_CARD_NAMES[initiative - 1],
+                        initiative=initiative,
+                        is_ready=not has_passed and rng.random() < config.ready_card_probability,
+                    )
+                    for initiative in sorted(dealt)
+                ),
+                play_area=frozenset({TokenType.NAALU_ZERO})
+                if index == naalu_holder
+                else frozenset(),
+                command_sheet=CommandSheet.make_from_int(
+                    name,
+                    tactic=rng.randint(*config.tactic_tokens),
+                    fleet=rng.randint(*config.fleet_tokens),
+                    strategy=rng.randint(*config.strategy_tokens),
+                ),
+                has_passed=has_passed,
+            )
+        )
+    unpassed: list[Player] = [player for player in players if not player.has_passed]
+    if unpassed:
+        active_player: Player = rng.choice(unpassed)
+    else:
+        active_player = min(players, key=lambda player: player.initiative)
+        active_player = replace(active_player, has_passed=False)
+        players[players.index(active_player)] = active_player
+    coordinates: list[HexCoordinate] = hex_spiral(config.system_count)
+    galaxy: set[System] = {
+        System(
+            id=system_id,
+            coordinate=coordinates[system_id],
+            command_tokens=tuple(
+                CommandToken(player_name=player.name)
+                for player in players
+                if rng.random() < config.board_token_probability
+            ),
+        )
+        for system_id in range(config.system_count)
+    }
+    return GameState(
+        players=tuple(players),
+        active_player=active_player,
+        phase=config.phase,
+        galaxy=galaxy,
+        turn_context=TurnContext(has_taken_action=rng.random() < config.taken_action_probability),
+        rng=RandomStream(seed=seed & MASK64),
+    )
+
+
+def candidate_commands(state: GameState) -> list[Command]:
+    """Every command the active player could attempt, legal or not, in a stable order.
+
+    Only action-phase commands exist so far, so other phases have no candidates.
+    """
+    if state.phase != Phase.ACTION:
+        return []
+    actor: Player = state.get_player(name=state.active_player.name)
+    commands: list[Command] = [
+        Command(actor=actor, command_type=CommandType.END_TURN),
+        Command(actor=actor, command_type=CommandType.PASS_ACTION),
+    ]
+    commands.extend(
+        ActivateCommand(
+            actor=actor, command_type=CommandType.INITIATE_TACTICAL_ACTION, system_id=system.id
+        )
+        for system in sorted(state.galaxy, key=lambda system: system.id)
+    )
+    return commands
+
+
+def random_candidate_command(state: GameState, rng: random.Random) -> Command | None:
+    """One of `candidate_commands(state)` drawn uniformly, without building the others."""
+    if state.phase != Phase.ACTION:
+        return None
+    actor: Player = state.get_player(name=state.active_player.name)
+    index: int = rng.randrange(len(state.galaxy) + 2)
+    if index == 0:
+        return Command(actor=actor, command_type=CommandType.END_TURN)
+    if index == 1:
+        return Command(actor=actor, command_type=CommandType.PASS_ACTION)
+    system_ids: list[int] = sorted(system.id for system in state.galaxy)
+    return ActivateCommand(
+        actor=actor,
+        command_type=CommandType.INITIATE_TACTICAL_ACTION,
+        system_id=system_ids[index - 2],
+    )
+
+
+def legal_commands(engine: GameEngine, state: GameState) -> list[Command]:
+    return [
+        command
+        for command in candidate_commands(state)
+        if all(
+            rule.validate_legality(state, command)
+            for rule in engine.rules_engine.command_rules_for(command)
+        )
+    ]
+
+
+def generate_command_stream(
+    engine: GameEngine, state: GameState, seed: int, max_commands: int
+) -> Iterator[tuple[Command, CommandResult]]:
+    """Apply random legal commands, yielding each with its result, until none remain."""
+    rng = random.Random(seed)
+    for _ in range(max_commands):
+        commands: list[Command] = legal_commands(engine=engine, state=state)
+        if not commands:
+            return
+        command: Command = rng.choice(commands)
+        result: CommandResult = engine.apply_command(state=state, command=command)
+        yield command, result
+        state = result.new_state
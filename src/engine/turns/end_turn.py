@@ -1,25 +1,37 @@
 import dataclasses
 from collections.abc import Sequence
+from enum import IntEnum
+from typing import TYPE_CHECKING, ClassVar
 
 from src.engine.core.command import Command, CommandRule, CommandRuleWhenApplicable, CommandType
-from src.engine.core.event import Event, EventRule
+from src.engine.core.event import Event, EventRule, register_event
 from src.engine.core.game_state import GameState
 from src.engine.core.player import Player
+from src.engine.core.state_builder import BuilderEvent, GameStateBuilder
 
+if TYPE_CHECKING:
+    from src.engine.core.projection import ViewChanges
 
-class EndTurnEvent(Event):
-    payload: str = "EndTurnEvent"
 
-    def apply(self, previous_state: GameState) -> GameState:
-        current_initiative = previous_state.active_player.initiative
+class EndTurnEventType(IntEnum):
+    END_TURN = 3
+
+
+@register_event(EndTurnEventType.END_TURN)
+@dataclasses.dataclass(frozen=True, slots=True)
+class EndTurnEvent(BuilderEvent):
+    payload: ClassVar[str] = "EndTurnEvent"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        current_initiative = builder.active_player.initiative
         higher_initiatives = [
             player
-            for player in previous_state.initiative_order_unpassed
+            for player in builder.initiative_order_unpassed
             if player.initiative > current_initiative
         ]
         lower_initiatives = [
             player
-            for player in previous_state.initiative_order_unpassed
+            for player in builder.initiative_order_unpassed
             if player.initiative <= current_initiative
         ]
         next_player: Player
@@ -28,13 +40,16 @@ class EndTurnEvent(Event):
         elif lower_initiatives:
             next_player = min(lower_initiatives, key=lambda x: x.initiative)
         else:
-            next_player = min(previous_state.initiative_order, key=lambda x: x.initiative)
-        return dataclasses.replace(
-            previous_state,
+            next_player = min(builder.initiative_order, key=lambda x: x.initiative)
+        builder.set(
             active_player=next_player,
-            turn_context=dataclasses.replace(previous_state.turn_context, has_taken_action=False),
+            turn_context=dataclasses.replace(builder.turn_context, has_taken_action=False),
         )
 
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.active_player = None
+        return True
+
 
 class EndTurn(CommandRuleWhenApplicable):
     def __repr__(self) -> str:
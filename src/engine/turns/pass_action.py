@@ -1,29 +1,37 @@
 import dataclasses
 from collections.abc import Sequence
-from dataclasses import replace
+from enum import IntEnum
+from typing import TYPE_CHECKING, ClassVar
 
 from src.engine.core.command import Command, CommandRule, CommandRuleWhenApplicable, CommandType
-from src.engine.core.event import Event, EventRule
+from src.engine.core.event import Event, EventRule, register_event
 from src.engine.core.game_state import GameState, Phase, TurnContext
 from src.engine.core.player import Player
+from src.engine.core.state_builder import BuilderEvent, GameStateBuilder
 from src.engine.turns.end_turn import EndTurnEvent
 
+if TYPE_CHECKING:
+    from src.engine.core.projection import ViewChanges
 
-class PassEvent(Event):
-    payload = "PassAction"
 
-    def apply(self, previous_state: GameState) -> GameState:
-        passed_player: Player = dataclasses.replace(previous_state.active_player, has_passed=True)
-        new_players: tuple[Player, ...] = tuple(
-            player if player != previous_state.active_player else passed_player
-            for player in previous_state.players
-        )
-        return replace(
-            previous_state,
-            players=new_players,
-            active_player=passed_player,
-            turn_context=TurnContext(has_taken_action=False),
-        )
+class PassActionEventType(IntEnum):
+    PASS_ACTION = 4
+    ADVANCE_ACTION_TO_STATUS_PHASE = 5
+
+
+@register_event(PassActionEventType.PASS_ACTION)
+@dataclasses.dataclass(frozen=True, slots=True)
+class PassEvent(BuilderEvent):
+    payload: ClassVar[str] = "PassAction"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        passed_player: Player = dataclasses.replace(builder.active_player, has_passed=True)
+        builder.replace_player(passed_player)
+        builder.set(active_player=passed_player, turn_context=TurnContext(has_taken_action=False))
+
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.add_active_player()
+        return True
 
 
 class PassCommandRule(CommandRuleWhenApplicable):
@@ -43,16 +51,23 @@ class PassCommandRule(CommandRuleWhenApplicable):
         return [PassEvent(), EndTurnEvent()]
 
 
-class AdvanceActionToStatusPhase(Event):
-    payload = "AdvanceActionToStatusPhase"
+@register_event(PassActionEventType.ADVANCE_ACTION_TO_STATUS_PHASE)
+@dataclasses.dataclass(frozen=True, slots=True)
+class AdvanceActionToStatusPhase(BuilderEvent):
+    payload: ClassVar[str] = "AdvanceActionToStatusPhase"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        builder.set(phase=Phase.STATUS)
 
-    def apply(self, previous_state: GameState) -> GameState:
-        return dataclasses.replace(previous_state, phase=Phase.STATUS)
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        return True
 
 
 class AdvanceToStatusRule(EventRule):
     def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
-        if (event.payload == "PassAction") and (len(state.initiative_order_unpassed) == 0):
+        if (event.type_code == PassActionEventType.PASS_ACTION) and (
+            len(state.initiative_order_unpassed) == 0
+        ):
             return [AdvanceActionToStatusPhase()]
         return []
 
@@ -0,0 +1,103 @@
+import dataclasses
+from enum import IntEnum
+from typing import TYPE_CHECKING, ClassVar
+
+from src.engine.core.command import CommandRule
+from src.engine.core.event import Event, EventRule, register_event
+from src.engine.core.player import Player
+from src.engine.core.state_builder import BuilderEvent, GameStateBuilder
+
+if TYPE_CHECKING:
+    from src.engine.core.projection import ViewChanges
+
+# Status phase cleanup touches every system and every player. Each step is a single bulk event,
+# so it rebuilds `galaxy` or `players` once, notifies event rules once and takes one entry in
+# the resolved event log.
+
+
+class StatusPhaseEventType(IntEnum):
+    RETURN_COMMAND_TOKENS = 6
+    READY_STRATEGY_CARDS = 7
+    RESET_PASSED_PLAYERS = 8
+
+
+@register_event(StatusPhaseEventType.RETURN_COMMAND_TOKENS)
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReturnCommandTokensEvent(BuilderEvent):
+    """Remove every command token from the board.
+
+    Players have no reinforcements in this engine yet, so the tokens are simply discarded.
+    """
+
+    payload: ClassVar[str] = "ReturnCommandTokens"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        occupied: list[int] = list(builder.occupancy.system_masks)
+        builder.replace_systems(
+            dataclasses.replace(builder.get_system(id=system_id), command_tokens=())
+            for system_id in occupied
+        )
+
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.all_systems = True
+        return True
+
+
+@register_event(StatusPhaseEventType.READY_STRATEGY_CARDS)
+@dataclasses.dataclass(frozen=True, slots=True)
+class ReadyStrategyCardsEvent(BuilderEvent):
+    payload: ClassVar[str] = "ReadyStrategyCards"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        builder.replace_players(
+            dataclasses.replace(
+                player,
+                strategy_cards=tuple(
+                    dataclasses.replace(card, is_ready=True) for card in player.strategy_cards
+                ),
+            )
+            for player in builder.players
+            if any(card.is_exhausted for card in player.strategy_cards)
+        )
+        active_player: Player = builder.get_player(name=builder.active_player.name)
+        builder.set(active_player=active_player)
+
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.all_players = True
+        return True
+
+
+@register_event(StatusPhaseEventType.RESET_PASSED_PLAYERS)
+@dataclasses.dataclass(frozen=True, slots=True)
+class ResetPassedPlayersEvent(BuilderEvent):
+    payload: ClassVar[str] = "ResetPassedPlayers"
+
+    def apply_to(self, builder: GameStateBuilder) -> None:
+        builder.replace_players(
+            dataclasses.replace(player, has_passed=False)
+            for player in builder.players
+            if player.has_passed
+        )
+        active_player: Player = builder.get_player(name=builder.active_player.name)
+        builder.set(active_player=active_player)
+
+    def record_view_changes(self, changes: ViewChanges) -> bool:
+        changes.all_players = True
+        return True
+
+
+def status_phase_cleanup_events() -> list[Event]:
+    """The events that clear the board and ready every player for the next round.
+
+    They must be resolved within one command: readying the cards of a passed player only
+    satisfies the game invariants once that player is no longer passed.
+    """
+    return [ReturnCommandTokensEvent(), ResetPassedPlayersEvent(), ReadyStrategyCardsEvent()]
+
+
+def get_command_rules() -> list[CommandRule]:
+    return []
+
+
+def get_event_rules() -> list[EventRule]:
+    return []
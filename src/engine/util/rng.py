@@ -0,0 +1,94 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import numpy as np
+
+MASK64: int = (1 << 64) - 1
+GOLDEN_GAMMA: int = 0x9E3779B97F4A7C15
+_MIX_MULTIPLIERS: tuple[int, int] = (0xBF58476D1CE4E5B9, 0x94D049BB133111EB)
+# Dice use the top 53 bits of a draw, so that `bits * sides` never overflows 64 bits.
+_DIE_BITS: int = 53
+MAX_SIDES: int = 1 << (64 - _DIE_BITS)
+
+
+def mix64(value: int) -> int:
+    """The SplitMix64 finalizer: a bijection on 64-bit integers with good avalanche."""
+    value = ((value ^ (value >> 30)) * _MIX_MULTIPLIERS[0]) & MASK64
+    value = ((value ^ (value >> 27)) * _MIX_MULTIPLIERS[1]) & MASK64
+    return value ^ (value >> 31)
+
+
+def _mix64_array(values: np.ndarray) -> np.ndarray:
+    import numpy as np
+
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(_MIX_MULTIPLIERS[0])
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(_MIX_MULTIPLIERS[1])
+    return values ^ (values >> np.uint64(31))
+
+
+@dataclass(frozen=True, slots=True)
+class RandomStream:
+    """A counter-based random stream: draw `n` is a pure function of `seed` and `counter + n`.
+
+    It is the SplitMix64 sequence for `seed`, addressed by position, so the whole stream is
+    two integers, jumping ahead is O(1), any batch of draws can be computed at once and the
+    values are the same in every process and on every platform. Streams are immutable; drawing
+    returns the values together with the advanced stream.
+    """
+
+    seed: int
+    counter: int = 0
+
+    def __post_init__(self) -> None:
+        if not 0 <= self.seed <= MASK64 or not 0 <= self.counter <= MASK64:
+            raise ValueError("seed and counter must be unsigned 64-bit integers")
+
+    def peek(self, offset: int = 0) -> int:
+        """The 64-bit value `offset` draws ahead, without advancing."""
+        return mix64((self.seed + (self.counter + offset + 1) * GOLDEN_GAMMA) & MASK64)
+
+    def jump(self, steps: int) -> RandomStream:
+        return RandomStream(seed=self.seed, counter=(self.counter + steps) & MASK64)
+
+    def split(self, key: int) -> RandomStream:
+        """An independent stream derived from this one and `key`, e.g. a worker or game id.
+
+        The child depends on the current position, so splitting again after drawing gives a
+        different child.
+        """
+        return RandomStream(seed=mix64(self.peek() ^ mix64(key & MASK64)))
+
+    def next_u64(self) -> tuple[int, RandomStream]:
+        return self.peek(), self.jump(1)
+
+    def draw_u64(self, count: int) -> tuple[np.ndarray, RandomStream]:
+        """The next `count` values as a `uint64` array, computed in one vectorised pass."""
+        # Every state holds a stream, so numpy is only imported once a batch is drawn.
+        import numpy as np
+
+        positions: np.ndarray = np.arange(1, count + 1, dtype=np.uint64) + np.uint64(self.counter)
+        values: np.ndarray = _mix64_array(
+            positions * np.uint64(GOLDEN_GAMMA) + np.uint64(self.seed)
+        )
+        return values, self.jump(count)
+
+    def roll(self, sides: int = 10) -> tuple[int, RandomStream]:
+        """One roll of a die numbered 1 to `sides`."""
+        _check_sides(sides)
+        return ((self.peek() >> (64 - _DIE_BITS)) * sides >> _DIE_BITS) + 1, self.jump(1)
+
+    def roll_dice(self, count: int, sides: int = 10) -> tuple[tuple[int, ...], RandomStream]:
+        """`count` rolls at once, equal to `count` successive calls to `roll`."""
+        _check_sides(sides)
+        import numpy as np
+
+        values, advanced = self.draw_u64(count)
+        top_bits: np.ndarray = values >> np.uint64(64 - _DIE_BITS)
+        rolls: np.ndarray = (top_bits * np.uint64(sides) >> np.uint64(_DIE_BITS)) + np.uint64(1)
+        return tuple(rolls.tolist()), advanced
+
+
+def _check_sides(sides: int) -> None:
+    if not 1 <= sides <= MAX_SIDES:
+        raise ValueError(f"A die must have between 1 and {MAX_SIDES} sides, not {sides}")
@@ -0,0 +1,36 @@
+import sys
+from types import FunctionType, ModuleType
+
+_ATOMIC_TYPES: tuple[type, ...] = (str, bytes, int, float, bool, type(None))
+_SKIPPED_TYPES: tuple[type, ...] = (type, ModuleType, FunctionType)
+
+
+def deep_getsizeof(obj: object, seen: set[int] | None = None) -> int:
+    """Approximate the number of bytes retained by `obj` and everything it references.
+
+    Objects reachable more than once are only counted once, so structure shared between
+    successive game states is not double counted when a common `seen` set is passed in.
+    """
+    if seen is None:
+        seen = set()
+    total: int = 0
+    stack: list[object] = [obj]
+    while stack:
+        current: object = stack.pop()
+        if id(current) in seen or isinstance(current, _SKIPPED_TYPES):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current)
+        if isinstance(current, _ATOMIC_TYPES):
+            continue
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (tuple, list, set, frozenset)):
+            stack.extend(current)
+        if hasattr(current, "__dict__"):
+            stack.append(vars(current))
+        for slot in getattr(type(current), "__slots__", ()):
+            if hasattr(current, slot):
+                stack.append(getattr(current, slot))
+    return total
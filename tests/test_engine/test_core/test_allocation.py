@@ -0,0 +1,74 @@
+import tracemalloc
+
+from src.engine.core.allocation import AllocationProfiler
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.instrumentation import EngineStep
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+STATE: GameState = generate_state(
+    config=SyntheticGameConfig(player_count=8, system_count=200, tactic_tokens=(2, 4)), seed=1
+)
+
+
+def _play(profiler: AllocationProfiler | None) -> list[CommandResult]:
+    engine = GameEngine(
+        rules_engine=TI4RulesEngine(), invariants=make_all_invariants(), probe=profiler
+    )
+    return [
+        result
+        for _, result in generate_command_stream(
+            engine=engine, state=STATE, seed=1, max_commands=40
+        )
+    ]
+
+
+def test_profiled_engine_produces_identical_results() -> None:
+    plain: list[CommandResult] = _play(None)
+    profiled: list[CommandResult] = _play(AllocationProfiler())
+    assert [result.new_state for result in plain] == [result.new_state for result in profiled]
+
+
+def test_allocations_are_attributed_inclusively_to_commands_and_events() -> None:
+    profiler = AllocationProfiler()
+    _play(profiler)
+
+    command = profiler.allocations[(EngineStep.COMMAND, "initiate_tactical_action")]
+    event = profiler.allocations[(EngineStep.EVENT, "ActivateSystemEvent")]
+    apply = profiler.allocations[(EngineStep.APPLY, "ActivateSystemEvent")]
+    assert command.calls == event.calls == apply.calls > 0
+    assert command.peak_bytes >= event.peak_bytes >= apply.peak_bytes > 0
+    assert command.net_blocks > 0
+
+    top_events = profiler.top(count=1, step=EngineStep.APPLY)
+    assert top_events[0][1] == "ActivateSystemEvent"
+    assert "ActivateSystemEvent" in profiler.report(count=5)
+    assert not tracemalloc.is_tracing()
+
+
+def test_unsampled_commands_are_not_traced() -> None:
+    profiler = AllocationProfiler(sample_rate=0.0)
+    _play(profiler)
+    assert profiler.allocations == {}
+
+
+def test_tracing_started_elsewhere_is_left_running_with_its_peak() -> None:
+    tracemalloc.start()
+    try:
+        ballast: bytes = bytes(10_000_000)
+        del ballast
+        outer_peak: int = tracemalloc.get_traced_memory()[1]
+        profiler = AllocationProfiler()
+        _play(profiler)
+        assert tracemalloc.is_tracing()
+        assert tracemalloc.get_traced_memory()[1] >= outer_peak
+        command = profiler.allocations[(EngineStep.COMMAND, "initiate_tactical_action")]
+        assert 0 < command.peak_bytes < 10_000_000 * command.calls
+    finally:
+        tracemalloc.stop()
@@ -0,0 +1,117 @@
+import pytest
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import (
+    BatchResult,
+    CommandResult,
+    GameEngine,
+    InvariantPolicy,
+    InvariantViolationError,
+)
+from src.engine.core.game_session import GameSession
+from src.engine.core.game_state import GameState
+from src.engine.core.instrumentation import EngineInstrumentation
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+from .common import FailingInvariant
+
+CONFIG = SyntheticGameConfig(player_count=6, system_count=37, tactic_tokens=(1, 4))
+
+
+def _make_engine(**kwargs) -> GameEngine:
+    return GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants(), **kwargs)
+
+
+def _random_game(seed: int) -> tuple[GameState, list[Command], list[CommandResult]]:
+    state: GameState = generate_state(config=CONFIG, seed=seed)
+    stream = list(
+        generate_command_stream(engine=_make_engine(), state=state, seed=seed, max_commands=60)
+    )
+    return state, [command for command, _ in stream], [result for _, result in stream]
+
+
+@pytest.mark.parametrize("probed", [False, True], ids=["plain", "probed"])
+def test_batch_matches_applying_commands_one_at_a_time(probed: bool) -> None:
+    engine: GameEngine = _make_engine(probe=EngineInstrumentation() if probed else None)
+    for seed in range(5):
+        state, commands, results = _random_game(seed)
+        batch: BatchResult = engine.apply_commands(state=state, commands=commands)
+
+        assert batch.success
+        assert batch.failed_index is None
+        assert batch.command_count == len(commands)
+        assert batch.new_state == results[-1].new_state
+        assert batch.new_state.galaxy == results[-1].new_state.galaxy
+        assert batch.new_state.players == results[-1].new_state.players
+        assert list(batch.events) == [event for result in results for event in result.events]
+
+
+def test_batch_is_rejected_as_a_whole_at_the_first_illegal_command() -> None:
+    state, commands, _ = _random_game(seed=0)
+    illegal = Command(actor=state.active_player, command_type=CommandType.END_TURN)
+    batch: BatchResult = _make_engine().apply_commands(
+        state=state, commands=[*commands[:3], illegal, *commands[3:]]
+    )
+
+    assert not batch.success
+    assert batch.failed_index == 3
+    assert batch.new_state is state
+    assert batch.events == []
+
+
+def test_invariants_are_checked_according_to_policy() -> None:
+    state, commands, _ = _random_game(seed=1)
+    engine = GameEngine(rules_engine=TI4RulesEngine(), invariants=[FailingInvariant()])
+    with pytest.raises(InvariantViolationError):
+        engine.apply_commands(state=state, commands=commands)
+    with pytest.raises(InvariantViolationError):
+        engine.apply_commands(
+            state=state, commands=commands[:1], invariant_policy=InvariantPolicy.EVERY_COMMAND
+        )
+
+
+@pytest.mark.parametrize(
+    ("invariant_policy", "checks_per_command"),
+    [(InvariantPolicy.END_OF_BATCH, 0), (InvariantPolicy.EVERY_COMMAND, 1)],
+)
+def test_probed_batches_follow_the_invariant_policy(
+    invariant_policy: InvariantPolicy, checks_per_command: int
+) -> None:
+    state, commands, _ = _random_game(seed=3)
+    instrumentation = EngineInstrumentation()
+    engine = GameEngine(
+        rules_engine=TI4RulesEngine(), invariants=[FailingInvariant()], probe=instrumentation
+    )
+
+    with pytest.raises(InvariantViolationError):
+        engine.apply_commands(state=state, commands=commands, invariant_policy=invariant_policy)
+
+    # The end of batch check belongs to no command, so only per-command checks are reported.
+    invariant_checks: int = sum(
+        timing.calls for (step, _), timing in instrumentation.timings.items() if step == "invariant"
+    )
+    commands_applied: int = sum(
+        timing.calls for (step, _), timing in instrumentation.timings.items() if step == "command"
+    )
+    assert invariant_checks == checks_per_command
+    assert commands_applied == (len(commands) if checks_per_command == 0 else 1)
+
+
+def test_session_records_a_batch_as_one_undoable_entry() -> None:
+    state, commands, results = _random_game(seed=2)
+    session = GameSession(initial_state=state, engine=_make_engine())
+    session.apply_command(command=commands[0])
+
+    session.apply_commands(commands=commands[1:])
+    assert len(session.history) == 2
+    assert session.current_state == results[-1].new_state
+
+    assert session.undo() == results[0].new_state
+    assert not session.apply_commands(commands=commands[2:]).success
+    assert len(session.history) == 1
@@ -0,0 +1,209 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+import pytest
+
+from src.engine.core.cascade import (
+    CHAIN_TAIL_LENGTH,
+    CascadeAbortReason,
+    CascadeBudget,
+)
+from src.engine.core.command import Command, CommandRule, CommandType
+from src.engine.core.event import Event, EventRule
+from src.engine.core.game_engine import (
+    BatchResult,
+    CascadeAbortedBatchResult,
+    CascadeAbortedResult,
+    CommandResult,
+    GameEngine,
+)
+from src.engine.core.game_state import GameState, Phase
+from src.engine.core.instrumentation import EngineInstrumentation
+from src.engine.core.player import Player
+from src.engine.core.result_cache import CommandResultCache
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+
+PLAYERS = (Player("Player1"), Player("Player2"))
+STATE = GameState(players=PLAYERS, active_player=PLAYERS[0], phase=Phase.ACTION, galaxy=set())
+COMMAND = Command(actor=PLAYERS[0], command_type=CommandType.END_TURN)
+
+
+@dataclass(frozen=True)
+class PingEvent(Event):
+    payload = "ping"
+
+    def apply(self, previous_state: GameState) -> GameState:
+        return previous_state
+
+
+@dataclass(frozen=True)
+class PongEvent(PingEvent):
+    payload = "pong"
+
+
+@dataclass(frozen=True)
+class CountEvent(PingEvent):
+    count: int = 0
+
+
+@dataclass
+class MutableEvent(Event):
+    """Not frozen, so not hashable."""
+
+    payload = "mutable"
+
+    def apply(self, previous_state: GameState) -> GameState:
+        return previous_state
+
+
+class AnswerPing(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [PongEvent()] if type(event) is PingEvent else []
+
+
+class AnswerPong(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [PingEvent()] if type(event) is PongEvent else []
+
+
+class CountForever(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [CountEvent(count=event.count + 1)] if isinstance(event, CountEvent) else []
+
+
+class Start(CommandRule):
+    def __init__(self, event: Event) -> None:
+        self.event: Event = event
+
+    def __repr__(self) -> str:
+        return "Start"
+
+    @staticmethod
+    def is_applicable(command: Command) -> bool:
+        return True
+
+    def validate_legality(self, state: GameState, command: Command) -> bool:
+        return True
+
+    def derive_events(self, state: GameState, command: Command) -> Sequence[Event]:
+        return [self.event]
+
+
+def _engine(
+    first_event: Event, event_rules: Sequence[EventRule], budget: CascadeBudget, **options
+) -> GameEngine:
+    rules_engine = TI4RulesEngine()
+    rules_engine.command_rules = [Start(first_event)]
+    rules_engine.event_rules = event_rules
+    return GameEngine(rules_engine=rules_engine, cascade_budget=budget, **options)
+
+
+ENGINE_OPTIONS: dict[str, dict[str, object]] = {
+    "immutable": {},
+    "transactional": {"transactional": True},
+    "probed": {"probe": EngineInstrumentation()},
+}
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_rules_triggering_each_other_are_stopped_as_a_cycle(options: str) -> None:
+    engine: GameEngine = _engine(
+        PingEvent(),
+        [AnswerPing(), AnswerPong()],
+        CascadeBudget(watch_after=8),
+        **ENGINE_OPTIONS[options],
+    )
+
+    result: CommandResult = engine.apply_command(state=STATE, command=COMMAND)
+
+    assert isinstance(result, CascadeAbortedResult)
+    assert not result.success
+    assert result.new_state is STATE
+    assert result.reason == CascadeAbortReason.CYCLE
+    assert [link.rule for link in result.chain] == ["AnswerPing", "AnswerPong", "AnswerPing"]
+    assert [type(link.event) for link in result.chain] == [PingEvent, PongEvent, PingEvent]
+
+
+class AnswerMutable(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [MutableEvent()] if isinstance(event, MutableEvent) else []
+
+
+def test_cycles_of_unhashable_events_are_stopped() -> None:
+    engine: GameEngine = _engine(MutableEvent(), [AnswerMutable()], CascadeBudget(watch_after=8))
+
+    result: CommandResult = engine.apply_command(state=STATE, command=COMMAND)
+
+    assert isinstance(result, CascadeAbortedResult)
+    assert result.reason == CascadeAbortReason.CYCLE
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_cascades_over_the_event_budget_are_stopped(options: str) -> None:
+    engine: GameEngine = _engine(
+        CountEvent(),
+        [CountForever()],
+        CascadeBudget(max_events=200, watch_after=8),
+        **ENGINE_OPTIONS[options],
+    )
+
+    result: CommandResult = engine.apply_command(state=STATE, command=COMMAND)
+
+    assert isinstance(result, CascadeAbortedResult)
+    assert result.reason == CascadeAbortReason.EVENT_BUDGET
+    assert len(result.chain) == CHAIN_TAIL_LENGTH
+    assert [link.event.count for link in result.chain][-1] == 199  # type: ignore
+
+
+def test_cascades_over_the_time_budget_are_stopped() -> None:
+    engine: GameEngine = _engine(
+        CountEvent(), [CountForever()], CascadeBudget(max_events=10**9, max_seconds=0.01)
+    )
+
+    result: CommandResult = engine.apply_command(state=STATE, command=COMMAND)
+
+    assert isinstance(result, CascadeAbortedResult)
+    assert result.reason == CascadeAbortReason.TIME_BUDGET
+
+
+def test_aborted_commands_fail_their_batch_and_are_not_cached() -> None:
+    cache = CommandResultCache()
+    engine: GameEngine = _engine(
+        PingEvent(), [AnswerPing(), AnswerPong()], CascadeBudget(), result_cache=cache
+    )
+
+    batch: BatchResult = engine.apply_commands(state=STATE, commands=[COMMAND, COMMAND])
+    engine.apply_command(state=STATE, command=COMMAND)
+
+    assert not batch.success
+    assert batch.failed_index == 0
+    assert batch.new_state is STATE
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize("options", ENGINE_OPTIONS)
+def test_aborted_batches_report_the_offending_chain(options: str) -> None:
+    engine: GameEngine = _engine(
+        PingEvent(),
+        [AnswerPing(), AnswerPong()],
+        CascadeBudget(watch_after=8),
+        **ENGINE_OPTIONS[options],
+    )
+
+    batch: BatchResult = engine.apply_commands(state=STATE, commands=[COMMAND, COMMAND])
+
+    assert isinstance(batch, CascadeAbortedBatchResult)
+    assert not batch.success
+    assert batch.failed_index == 0
+    assert batch.new_state is STATE
+    assert batch.reason == CascadeAbortReason.CYCLE
+    assert [link.rule for link in batch.chain] == ["AnswerPing", "AnswerPong", "AnswerPing"]
+
+
+def test_short_cascades_are_unaffected() -> None:
+    engine: GameEngine = _engine(CountEvent(), [], CascadeBudget(max_events=1))
+
+    result: CommandResult = engine.apply_command(state=STATE, command=COMMAND)
+
+    assert result.success
+    assert result.events == [CountEvent()]
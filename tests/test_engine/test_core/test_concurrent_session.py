@@ -0,0 +1,173 @@
+import asyncio
+import sys
+import threading
+
+import pytest
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.concurrent_session import (
+    ConcurrentGameSession,
+    SessionSnapshot,
+    StaleVersionError,
+)
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.instrumentation import EngineInstrumentation
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.result_cache import CommandResultCache
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+    legal_commands,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+STATE: GameState = generate_state(config=SyntheticGameConfig(tactic_tokens=(2, 4)), seed=0)
+STREAM: list[tuple[Command, CommandResult]] = list(
+    generate_command_stream(engine=ENGINE, state=STATE, seed=0, max_commands=10)
+)
+
+
+class InterleavingEngine(GameEngine):
+    """Lets another client commit while the engine is resolving a submission."""
+
+    def __init__(self, session_command: Command) -> None:
+        super().__init__(rules_engine=TI4RulesEngine())
+        self.session: ConcurrentGameSession | None = None
+        self.session_command: Command = session_command
+
+    def apply_command(self, state: GameState, command: Command) -> CommandResult:
+        if command is not self.session_command and self.session is not None:
+            self.session.apply_command(
+                command=self.session_command, expected_version=self.session.version
+            )
+        return super().apply_command(state=state, command=command)
+
+
+def test_every_change_increments_the_version() -> None:
+    session = ConcurrentGameSession(initial_state=STATE, engine=ENGINE)
+    for version, (command, result) in enumerate(STREAM[:3]):
+        snapshot: SessionSnapshot = session.apply_command(command=command, expected_version=version)
+        assert snapshot.version == version + 1
+        assert snapshot.state == result.new_state
+
+    assert session.undo(expected_version=3).state == STREAM[1][1].new_state
+    assert session.redo(expected_version=4).state == STREAM[2][1].new_state
+    assert session.version == 5
+    assert session.history == [result for _, result in STREAM[:3]]
+    assert session.statistics.commits == 5
+
+
+def test_stale_submissions_are_rejected() -> None:
+    session = ConcurrentGameSession(initial_state=STATE, engine=ENGINE)
+    session.apply_command(command=STREAM[0][0], expected_version=0)
+
+    with pytest.raises(StaleVersionError) as error:
+        session.apply_command(command=STREAM[1][0], expected_version=0)
+    assert (error.value.expected_version, error.value.current_version) == (0, 1)
+    with pytest.raises(StaleVersionError):
+        session.undo(expected_version=0)
+    assert session.version == 1
+    assert session.current_state == STREAM[0][1].new_state
+    assert session.statistics.conflicts == 2
+
+
+def test_submissions_overtaken_while_the_engine_runs_are_rejected() -> None:
+    first_command: Command = STREAM[0][0]
+    alternative: Command = next(
+        command
+        for command in legal_commands(engine=ENGINE, state=STATE)
+        if command != first_command
+    )
+    engine = InterleavingEngine(session_command=first_command)
+    session = ConcurrentGameSession(initial_state=STATE, engine=engine)
+    engine.session = session
+
+    with pytest.raises(StaleVersionError):
+        session.apply_command(command=alternative, expected_version=0)
+    assert session.version == 1
+    assert session.history[0].new_state == STREAM[0][1].new_state
+    assert len(session.root.children) == 1
+
+
+def test_illegal_commands_keep_the_version() -> None:
+    session = ConcurrentGameSession(initial_state=STATE, engine=ENGINE)
+    illegal = Command(actor=STATE.active_player, command_type=CommandType.END_TURN)
+
+    snapshot: SessionSnapshot = session.apply_command(command=illegal, expected_version=0)
+
+    assert snapshot.version == 0
+    assert session.current_state is STATE
+    assert session.statistics.commits == 0
+
+
+@pytest.mark.parametrize("cached", [False, True], ids=["plain", "cached"])
+def test_racing_clients_build_one_consistent_history(cached: bool) -> None:
+    # A tiny cache shared by every client evicts constantly while others look entries up.
+    cache: CommandResultCache | None = (
+        CommandResultCache(max_entries=2, max_bytes=10**6) if cached else None
+    )
+    engine = GameEngine(
+        rules_engine=ENGINE.rules_engine, invariants=ENGINE.invariants, result_cache=cache
+    )
+    session = ConcurrentGameSession(initial_state=STATE, engine=engine)
+    target_version: int = 12
+
+    def client() -> None:
+        while True:
+            snapshot: SessionSnapshot = session.snapshot()
+            if snapshot.version >= target_version:
+                return
+            commands: list[Command] = legal_commands(engine=ENGINE, state=snapshot.state)
+            if not commands:
+                return
+            try:
+                session.apply_command(command=commands[0], expected_version=snapshot.version)
+            except StaleVersionError:
+                continue
+
+    threads: list[threading.Thread] = [threading.Thread(target=client) for _ in range(4)]
+    # Switch threads as often as possible, so that clients interleave inside the engine.
+    switch_interval: float = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    # Every client submits the first legal command, so the history is the same as played alone.
+    state: GameState = STATE
+    for result in session.history:
+        command: Command = legal_commands(engine=ENGINE, state=state)[0]
+        assert result.new_state == ENGINE.apply_command(state=state, command=command).new_state
+        state = result.new_state
+    assert session.current_state is state
+    assert session.version == len(session.history) == session.statistics.commits
+    assert len(session.root.children) == 1
+    if cache is not None:
+        assert len(cache) <= 2
+        assert cache.statistics.hits + cache.statistics.misses >= session.version
+        assert cache.current_bytes == sum(size for _, size in cache._entries.values())
+
+
+def test_engines_with_a_probe_are_rejected() -> None:
+    engine = GameEngine(rules_engine=ENGINE.rules_engine, probe=EngineInstrumentation())
+    with pytest.raises(ValueError):
+        ConcurrentGameSession(initial_state=STATE, engine=engine)
+
+
+def test_async_submissions_run_off_the_event_loop() -> None:
+    session = ConcurrentGameSession(initial_state=STATE, engine=ENGINE)
+
+    async def submit() -> SessionSnapshot:
+        return await session.apply_command_async(command=STREAM[0][0], expected_version=0)
+
+    snapshot: SessionSnapshot = asyncio.run(submit())
+
+    assert snapshot.version == 1
+    assert snapshot.state == STREAM[0][1].new_state
@@ -0,0 +1,118 @@
+import importlib
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import ClassVar
+
+import pytest
+
+from src.engine.actions.tactical_action import ActivateSystemEvent, TacticalActionCompletedEvent
+from src.engine.core.event import (
+    UNREGISTERED_TYPE_CODE,
+    event_class,
+    event_from_record,
+    event_to_record,
+    register_event,
+)
+from src.engine.core.rules_library import RULE_REGISTRY
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.turns.end_turn import EndTurnEvent
+from src.engine.turns.pass_action import AdvanceActionToStatusPhase, PassEvent
+from src.engine.turns.status_phase import (
+    ReadyStrategyCardsEvent,
+    ResetPassedPlayersEvent,
+    ReturnCommandTokensEvent,
+)
+
+from .common import TrivialEvent
+
+ROOT = Path(__file__).resolve().parents[3]
+
+REGISTERED_EVENTS = (
+    ActivateSystemEvent(player_id="A", system_id=3),
+    TacticalActionCompletedEvent(),
+    EndTurnEvent(),
+    PassEvent(),
+    AdvanceActionToStatusPhase(),
+    ReturnCommandTokensEvent(),
+    ReadyStrategyCardsEvent(),
+    ResetPassedPlayersEvent(),
+)
+
+
+@pytest.mark.parametrize("event", REGISTERED_EVENTS, ids=lambda event: event.payload)
+def test_registered_events_are_slotted_records_that_round_trip(event) -> None:
+    assert not hasattr(event, "__dict__")
+    assert event_class(event.type_code) is type(event)
+    assert event_from_record(event_to_record(event)) == event
+
+
+def test_every_event_type_is_registered_once() -> None:
+    codes = [event.type_code for event in REGISTERED_EVENTS]
+    assert len(set(codes)) == len(codes)
+    assert UNREGISTERED_TYPE_CODE not in codes
+
+
+def test_every_rules_module_registers_unique_codes_it_reserved() -> None:
+    codes: dict[int, str] = {}
+    for entry in RULE_REGISTRY:
+        module = importlib.import_module(entry.module_path)
+        for value in vars(module).values():
+            if not isinstance(value, type) or value.__module__ != entry.module_path:
+                continue
+            type_code: int = getattr(value, "type_code", UNREGISTERED_TYPE_CODE)
+            if type_code == UNREGISTERED_TYPE_CODE:
+                continue
+            assert type_code not in codes, (value, codes[type_code])
+            assert type_code in entry.event_codes, value
+            codes[type_code] = value.__qualname__
+    assert set(codes) == {code for entry in RULE_REGISTRY for code in entry.event_codes}
+
+
+def test_registering_a_taken_type_code_fails() -> None:
+    with pytest.raises(ValueError, match="already registered"):
+
+        @register_event(PassEvent.type_code)
+        @dataclass(frozen=True, slots=True)
+        class OtherPassEvent(PassEvent):
+            payload: ClassVar[str] = "OtherPass"
+
+
+def test_registering_a_type_code_not_reserved_for_the_module_fails() -> None:
+    with pytest.raises(ValueError, match="not reserved"):
+
+        @register_event(max(code for entry in RULE_REGISTRY for code in entry.event_codes) + 1)
+        @dataclass(frozen=True, slots=True)
+        class UnreservedEvent(PassEvent):
+            payload: ClassVar[str] = "Unreserved"
+
+
+def test_registering_an_event_without_a_positive_type_code_fails() -> None:
+    with pytest.raises(ValueError, match="positive"):
+
+        @register_event(UNREGISTERED_TYPE_CODE)
+        @dataclass(frozen=True, slots=True)
+        class UncodedEvent(PassEvent):
+            payload: ClassVar[str] = "Uncoded"
+
+
+def test_event_classes_are_found_before_their_rules_module_is_imported() -> None:
+    script: str = (
+        "import sys\n"
+        "from src.engine.core.event import event_from_record\n"
+        "from src.engine.core.rules_library import get_compiled_rule_set\n"
+        "assert 'src.engine.turns.status_phase' not in sys.modules\n"
+        f"event = event_from_record({event_to_record(ResetPassedPlayersEvent())!r}, "
+        "classes=get_compiled_rule_set().event_class)\n"
+        "assert type(event).__name__ == 'ResetPassedPlayersEvent', event\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+
+
+def test_unregistered_events_are_not_routed_or_serialized() -> None:
+    event = TrivialEvent(payload="PassAction")
+    assert event.type_code == UNREGISTERED_TYPE_CODE
+    assert TI4RulesEngine().event_rules_for(event) == ()
+    with pytest.raises(TypeError):
+        event_to_record(event)
@@ -0,0 +1,94 @@
+import pickle
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from src.engine.core.galaxy_layout import GalaxyLayout, HexCoordinate, Wormhole, hex_spiral
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState, System
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+SPIRAL: list[HexCoordinate] = hex_spiral(37)
+MAP: set[System] = {
+    System(id=system_id, command_tokens=(), coordinate=coordinate)
+    for system_id, coordinate in enumerate(SPIRAL)
+}
+
+
+def test_spiral_fills_rings_around_the_centre() -> None:
+    centre = HexCoordinate(q=0, r=0)
+    assert len(set(SPIRAL)) == 37
+    assert [sum(1 for c in SPIRAL if c.distance_to(centre) == ring) for ring in range(4)] == [
+        1,
+        6,
+        12,
+        18,
+    ]
+
+
+def test_distances_on_a_plain_map_are_hex_distances() -> None:
+    layout: GalaxyLayout = GalaxyLayout.from_galaxy(MAP)
+    for first in range(37):
+        for second in range(37):
+            assert layout.distance(first, second) == SPIRAL[first].distance_to(SPIRAL[second])
+    assert layout.adjacency[0] == frozenset(range(1, 7))
+    assert layout.within(0, max_distance=1) == frozenset(range(7))
+    with pytest.raises(ValueError):
+        layout.distances[0, 1] = 5
+
+
+def test_wormholes_and_hyperlanes_override_geometry() -> None:
+    far_apart = (19, 28)
+    assert SPIRAL[far_apart[0]].distance_to(SPIRAL[far_apart[1]]) == 6
+    systems: set[System] = {
+        System(
+            id=system.id,
+            command_tokens=(),
+            coordinate=system.coordinate,
+            wormholes=frozenset({Wormhole.ALPHA}) if system.id in far_apart else frozenset(),
+        )
+        for system in MAP
+    } | {System(id=100, command_tokens=())}
+
+    layout: GalaxyLayout = GalaxyLayout.from_galaxy(systems, hyperlanes=[(0, 100)])
+
+    assert layout.are_adjacent(*far_apart)
+    assert layout.distance(*far_apart) == 1
+    assert layout.adjacency[100] == frozenset({0})
+    assert layout.distance(100, 19) == 4
+    isolated: GalaxyLayout = GalaxyLayout.from_galaxy(systems)
+    assert isolated.distance(0, 100) is None
+    assert isolated.within(100, max_distance=10) == frozenset({100})
+
+
+def test_layout_is_built_once_and_shared_by_successor_states() -> None:
+    for transactional in (False, True):
+        engine = GameEngine(rules_engine=TI4RulesEngine(), transactional=transactional)
+        state: GameState = generate_state(config=SyntheticGameConfig(), seed=0)
+        layout: GalaxyLayout = state.layout
+        for _, result in generate_command_stream(
+            engine=engine, state=state, seed=0, max_commands=30
+        ):
+            assert result.new_state.layout is layout
+        assert np.array_equal(layout.distances, GalaxyLayout.from_galaxy(state.galaxy).distances)
+
+
+def test_layouts_with_hyperlanes_survive_pickling_a_state() -> None:
+    state: GameState = generate_state(config=SyntheticGameConfig(), seed=0)
+    first, second = state.layout.system_ids[0], state.layout.system_ids[-1]
+    assert not state.layout.are_adjacent(first, second)
+    laned: GameState = replace(
+        state, galaxy_layout=GalaxyLayout.from_galaxy(state.galaxy, hyperlanes=[(first, second)])
+    )
+
+    restored: GameState = pickle.loads(pickle.dumps(laned))
+
+    assert restored.layout.are_adjacent(first, second)
+    assert restored.layout.distance(first, second) == 1
+    assert pickle.loads(pickle.dumps(state)).galaxy_layout is None
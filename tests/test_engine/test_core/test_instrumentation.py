@@ -0,0 +1,94 @@
+import pytest
+
+from src.engine.actions.tactical_action import ActivateCommand
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState, Phase, System
+from src.engine.core.instrumentation import EngineInstrumentation, EngineStep
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import CommandSheet, Player
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.strategy_cards import StrategyCard
+
+PLAYER_A = Player(
+    name="A",
+    strategy_cards=(StrategyCard(name="Leadership", initiative=1),),
+    command_sheet=CommandSheet.make_from_int("A", tactic=1, fleet=0, strategy=0),
+)
+STATE = GameState(
+    players=(PLAYER_A,),
+    active_player=PLAYER_A,
+    phase=Phase.ACTION,
+    galaxy={System(id=0, command_tokens=())},
+)
+ACTIVATE = ActivateCommand(
+    actor=PLAYER_A, command_type=CommandType.INITIATE_TACTICAL_ACTION, system_id=0
+)
+
+
+def _make_engine(
+    instrumentation: EngineInstrumentation | None, transactional: bool = False
+) -> GameEngine:
+    return GameEngine(
+        rules_engine=TI4RulesEngine(),
+        invariants=make_all_invariants(),
+        probe=instrumentation,
+        transactional=transactional,
+    )
+
+
+@pytest.mark.parametrize("transactional", [False, True])
+def test_instrumented_engine_produces_identical_results(transactional: bool) -> None:
+    plain: CommandResult = _make_engine(None).apply_command(state=STATE, command=ACTIVATE)
+    instrumented: CommandResult = _make_engine(
+        EngineInstrumentation(), transactional=transactional
+    ).apply_command(state=STATE, command=ACTIVATE)
+
+    assert plain.new_state == instrumented.new_state
+    assert plain.new_state.galaxy == instrumented.new_state.galaxy
+    assert [type(event) for event in plain.events] == [type(event) for event in instrumented.events]
+
+
+def test_every_step_is_counted_per_rule_and_event() -> None:
+    instrumentation = EngineInstrumentation()
+    engine: GameEngine = _make_engine(instrumentation)
+    engine.apply_command(state=STATE, command=ACTIVATE)
+    engine.apply_command(state=STATE, command=ACTIVATE)
+
+    snapshot = instrumentation.snapshot()
+
+    assert snapshot["command"]["initiate_tactical_action"]["calls"] == 2
+    assert snapshot["validate"]["InitiateTacticalActionCommandRule"]["calls"] == 2
+    assert snapshot["derive"]["InitiateTacticalActionCommandRule"]["calls"] == 2
+    assert snapshot["apply"]["ActivateSystemEvent"]["calls"] == 2
+    assert snapshot["apply"]["TacticalActionCompletedEvent"]["calls"] == 2
+    assert snapshot["on_event"] == {}
+    assert snapshot["invariant"]["UniqueTokenInvariant"]["calls"] == 2
+    assert all(
+        timing["total_seconds"] >= 0 for step in snapshot.values() for timing in step.values()
+    )
+
+
+def test_rejected_command_stops_after_validation() -> None:
+    instrumentation = EngineInstrumentation()
+    result: CommandResult = _make_engine(instrumentation).apply_command(
+        state=STATE, command=Command(actor=PLAYER_A, command_type=CommandType.END_TURN)
+    )
+
+    assert not result.success
+    assert instrumentation.timings[(EngineStep.COMMAND, "end_turn")].calls == 1
+    assert not any(step == EngineStep.APPLY for step, _ in instrumentation.timings)
+
+
+def test_prometheus_export_lists_every_timing() -> None:
+    instrumentation = EngineInstrumentation()
+    _make_engine(instrumentation).apply_command(state=STATE, command=ACTIVATE)
+
+    text: str = instrumentation.to_prometheus()
+
+    assert "# TYPE ti4_engine_step_calls_total counter" in text
+    assert 'ti4_engine_step_calls_total{step="apply",name="ActivateSystemEvent"} 1' in text
+    assert text.count("ti4_engine_step_seconds_total{") == len(instrumentation.timings)
+
+    instrumentation.reset()
+    assert instrumentation.timings == {}
@@ -0,0 +1,70 @@
+from dataclasses import replace
+
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState, System
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.occupancy import CommandTokenIndex
+from src.engine.core.state_builder import GameStateBuilder
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+from src.engine.tokens import CommandToken
+
+CONFIG = SyntheticGameConfig(
+    player_count=6, system_count=37, tactic_tokens=(2, 4), board_token_probability=0.2
+)
+
+
+def _assert_matches_galaxy(index: CommandTokenIndex, state: GameState) -> None:
+    rebuilt: CommandTokenIndex = CommandTokenIndex.from_galaxy(state.galaxy)
+    assert index.galaxy is state.galaxy
+    assert index.system_ids == rebuilt.system_ids
+    for player in state.players:
+        assert index.activated_systems(player.name) == rebuilt.activated_systems(player.name)
+        for system in state.galaxy:
+            assert index.has_token(system_id=system.id, player_name=player.name) == any(
+                token.player_name == player.name for token in system.command_tokens
+            )
+
+
+def test_index_is_carried_forward_by_activations() -> None:
+    for transactional in (False, True):
+        engine = GameEngine(
+            rules_engine=TI4RulesEngine(),
+            invariants=make_all_invariants(),
+            transactional=transactional,
+        )
+        state: GameState = generate_state(config=CONFIG, seed=3)
+        for _, result in generate_command_stream(
+            engine=engine, state=state, seed=3, max_commands=150
+        ):
+            assert result.new_state.occupancy_index is not None
+            _assert_matches_galaxy(result.new_state.occupancy_index, result.new_state)
+
+
+def test_index_is_rebuilt_when_galaxy_is_replaced_directly() -> None:
+    state: GameState = generate_state(config=CONFIG, seed=0)
+    stale: CommandTokenIndex = state.occupancy
+    changed: GameState = replace(
+        state, galaxy={System(id=99, command_tokens=(CommandToken(player_name="Player1"),))}
+    )
+
+    assert changed.occupancy is not stale
+    assert changed.occupancy.activated_systems("Player1") == {99}
+    assert changed.occupancy.has_token(system_id=99, player_name="Player1")
+
+
+def test_removing_tokens_clears_them_from_the_index() -> None:
+    state: GameState = generate_state(config=CONFIG, seed=1)
+    builder = GameStateBuilder(state)
+    for system_id in state.occupancy.system_masks:
+        builder.replace_system(System(id=system_id, command_tokens=()))
+    cleared: GameState = builder.freeze()
+
+    assert cleared.occupancy_index is not None
+    assert cleared.occupancy_index.system_masks == {}
+    assert all(not cleared.occupancy.activated_systems(player.name) for player in state.players)
+    _assert_matches_galaxy(cleared.occupancy, cleared)
@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+
+import pytest
+
+from src.engine.core.command import Command
+from src.engine.core.event import Event
+from src.engine.core.game_engine import BatchResult, CommandResult, GameEngine
+from src.engine.core.game_state import GameState, Phase
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.projection import PlayerView, ProjectionCache
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+from src.engine.turns.status_phase import status_phase_cleanup_events
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+CONFIG = SyntheticGameConfig(
+    player_count=4, system_count=19, board_token_probability=0.2, ready_card_probability=0.0
+)
+
+
+def _stream(seed: int) -> tuple[GameState, list[tuple[Command, CommandResult]]]:
+    state: GameState = generate_state(config=CONFIG, seed=seed)
+    return state, list(
+        generate_command_stream(engine=ENGINE, state=state, seed=seed, max_commands=200)
+    )
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_advanced_views_equal_views_projected_from_scratch(seed: int) -> None:
+    state, stream = _stream(seed)
+    views: dict[str, PlayerView] = {
+        player.name: PlayerView.from_state(state, viewer=player.name) for player in state.players
+    }
+    for _, result in stream:
+        for name, view in views.items():
+            views[name] = view.advanced(events=result.events, new_state=result.new_state)
+            assert views[name] == PlayerView.from_state(result.new_state, viewer=name)
+    assert result.new_state.phase == Phase.STATUS
+
+    cleaned: GameState = result.new_state
+    for event in status_phase_cleanup_events():
+        cleaned = event.apply(previous_state=cleaned)
+    for name, view in views.items():
+        advanced: PlayerView = view.advanced(
+            events=status_phase_cleanup_events(), new_state=cleaned
+        )
+        assert advanced == PlayerView.from_state(cleaned, viewer=name)
+        assert not advanced.command_tokens
+
+
+def test_batches_of_commands_advance_views_in_one_step() -> None:
+    state, stream = _stream(seed=1)
+    batch: BatchResult = ENGINE.apply_commands(
+        state=state, commands=[command for command, _ in stream]
+    )
+
+    for player in state.players:
+        view: PlayerView = PlayerView.from_state(state, viewer=player.name)
+        assert view.advanced(events=batch.events, new_state=batch.new_state) == (
+            PlayerView.from_state(batch.new_state, viewer=player.name)
+        )
+
+
+def test_unknown_events_rebuild_the_view() -> None:
+    @dataclass(frozen=True)
+    class UnknownEvent(Event):
+        payload = "Unknown"
+
+        def apply(self, previous_state: GameState) -> GameState:
+            return previous_state
+
+    state, stream = _stream(seed=2)
+    view: PlayerView = PlayerView.from_state(state, viewer=state.players[0].name)
+    new_state: GameState = stream[0][1].new_state
+
+    advanced: PlayerView = view.advanced(events=[UnknownEvent()], new_state=new_state)
+
+    assert advanced == PlayerView.from_state(new_state, viewer=view.viewer)
+
+
+def test_cache_advances_the_views_of_every_subscribed_player() -> None:
+    state, stream = _stream(seed=3)
+    cache = ProjectionCache()
+    names: list[str] = [player.name for player in state.players[:2]]
+    for name in names:
+        cache.view(state, player=name)
+    for _, result in stream[:5]:
+        views: dict[str, PlayerView] = cache.advance(state=state, result=result)
+        assert sorted(views) == names
+        assert all(cache.view(result.new_state, player=name) is views[name] for name in names)
+        state = result.new_state
+
+    assert cache.statistics.misses == 2
+    assert cache.statistics.incremental_updates == 10
+    assert cache.statistics.hits == 10
+    assert not hasattr(views[names[0]], "rng")
+
+
+def test_unchanged_player_summaries_are_shared_between_views() -> None:
+    state, stream = _stream(seed=4)
+    view: PlayerView = PlayerView.from_state(state, viewer=state.players[0].name)
+    result: CommandResult = stream[0][1]
+    advanced: PlayerView = view.advanced(events=result.events, new_state=result.new_state)
+    unchanged = [summary for summary in view.players if advanced.summary(summary.name) == summary]
+
+    assert unchanged
+    assert all(advanced.summary(summary.name) is summary for summary in unchanged)
+
+
+def test_least_recently_used_views_are_evicted() -> None:
+    state, stream = _stream(seed=0)
+    cache = ProjectionCache(max_entries=2)
+    cache.view(state, player="Player1")
+    cache.view(stream[0][1].new_state, player="Player1")
+    cache.view(state, player="Player1")
+    cache.view(stream[1][1].new_state, player="Player1")
+
+    assert len(cache) == 2
+    assert cache.statistics.evictions == 1
+    assert cache.advance(state=state, result=stream[0][1]) == {
+        "Player1": PlayerView.from_state(stream[0][1].new_state, viewer="Player1")
+    }
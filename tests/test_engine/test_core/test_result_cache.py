@@ -0,0 +1,160 @@
+import pickle
+import sys
+import threading
+from dataclasses import replace
+
+import pytest
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.fingerprint import fingerprint
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import CommandSheet
+from src.engine.core.result_cache import CommandResultCache
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+from src.engine.tokens import CommandToken
+
+CONFIG = SyntheticGameConfig(tactic_tokens=(2, 4))
+STATE: GameState = generate_state(config=CONFIG, seed=0)
+
+
+def _make_engine(cache: CommandResultCache | None = None) -> GameEngine:
+    return GameEngine(
+        rules_engine=TI4RulesEngine(), invariants=make_all_invariants(), result_cache=cache
+    )
+
+
+STREAM: list[tuple[Command, CommandResult]] = list(
+    generate_command_stream(engine=_make_engine(), state=STATE, seed=0, max_commands=30)
+)
+
+
+def _replay(engine: GameEngine) -> list[CommandResult]:
+    state: GameState = STATE
+    results: list[CommandResult] = []
+    for command, _ in STREAM:
+        results.append(engine.apply_command(state=state, command=command))
+        state = results[-1].new_state
+    return results
+
+
+def test_equal_states_have_equal_fingerprints_and_different_states_do_not() -> None:
+    copy: GameState = generate_state(config=CONFIG, seed=0)
+    changed: GameState = replace(STATE, rng=STATE.rng.jump(1))
+
+    assert copy is not STATE
+    assert fingerprint(copy) == fingerprint(STATE)
+    assert fingerprint(changed) != fingerprint(STATE)
+    assert fingerprint(STREAM[0][1].new_state) != fingerprint(STATE)
+
+
+def test_fingerprints_and_derived_caches_are_not_pickled_with_a_state() -> None:
+    state: GameState = generate_state(config=CONFIG, seed=5)
+    fresh_size: int = len(pickle.dumps(state))
+
+    digest: bytes = fingerprint(state)
+    assert state.occupancy is not None and state.layout is not None
+    restored: GameState = pickle.loads(pickle.dumps(state))
+
+    assert len(pickle.dumps(state)) == fresh_size
+    assert restored.occupancy_index is None and restored.galaxy_layout is None
+    assert restored == state
+    assert fingerprint(restored) == digest
+
+
+def test_command_sheets_cannot_change_after_being_fingerprinted() -> None:
+    token = CommandToken(player_name="A")
+    sheet = CommandSheet(tactic=[token], fleet=[token, token])  # type: ignore
+
+    assert sheet == CommandSheet.make_from_int("A", tactic=1, fleet=2, strategy=0)
+    assert fingerprint(sheet) == fingerprint(CommandSheet(tactic=(token,), fleet=(token, token)))
+    with pytest.raises(AttributeError):
+        sheet.tactic.append(token)  # type: ignore
+
+
+def test_replaying_a_game_is_served_from_the_cache() -> None:
+    cache = CommandResultCache()
+    engine: GameEngine = _make_engine(cache)
+    first: list[CommandResult] = _replay(engine)
+    second: list[CommandResult] = _replay(engine)
+
+    assert first == [result for _, result in STREAM]
+    assert all(cached is original for cached, original in zip(second, first, strict=True))
+    assert cache.statistics.misses == len(STREAM)
+    assert cache.statistics.hits == len(STREAM)
+    assert cache.statistics.hit_rate == 0.5
+
+
+def test_illegal_commands_are_cached_and_the_actor_is_part_of_the_key() -> None:
+    cache = CommandResultCache()
+    engine: GameEngine = _make_engine(cache)
+    illegal = Command(actor=STATE.active_player, command_type=CommandType.END_TURN)
+    result: CommandResult = engine.apply_command(state=STATE, command=illegal)
+    actor = replace(STATE.active_player, command_sheet=CommandSheet())
+    other = Command(actor=actor, command_type=CommandType.END_TURN)
+
+    assert not result.success
+    assert engine.apply_command(state=STATE, command=illegal) is result
+    assert cache.key(state=STATE, command=other) != cache.key(state=STATE, command=illegal)
+
+
+def test_least_recently_used_entries_are_evicted_first() -> None:
+    cache = CommandResultCache(max_entries=2)
+    engine: GameEngine = _make_engine(cache)
+    states: list[GameState] = [STATE] + [result.new_state for _, result in STREAM]
+    for index in (0, 1, 2, 0, 2):
+        engine.apply_command(state=states[index], command=STREAM[index][0])
+
+    assert len(cache) == 2
+    assert cache.statistics.evictions == 2
+    assert cache.statistics.misses == 4
+    assert cache.statistics.hits == 1
+
+
+def test_byte_bound_limits_the_estimated_size_of_cached_results() -> None:
+    cache = CommandResultCache(max_entries=None, max_bytes=60_000)
+    _replay(_make_engine(cache))
+
+    assert 0 < cache.current_bytes <= 60_000
+    assert 0 < len(cache) < len(STREAM)
+    assert cache.statistics.evictions == len(STREAM) - len(cache)
+
+
+def test_a_cache_needs_a_bound() -> None:
+    with pytest.raises(ValueError, match="bound"):
+        CommandResultCache(max_entries=None)
+
+
+def test_threads_sharing_a_cached_engine_keep_the_cache_consistent() -> None:
+    cache = CommandResultCache(max_entries=2, max_bytes=10**6)
+    engine: GameEngine = _make_engine(cache)
+    stream: list[tuple[Command, CommandResult]] = STREAM[:10]
+    states: list[GameState] = [STATE] + [result.new_state for _, result in stream[:-1]]
+    rounds: int = 100
+
+    def replay() -> None:
+        for _ in range(rounds):
+            for state, (command, _) in zip(states, stream, strict=True):
+                engine.apply_command(state=state, command=command)
+
+    threads: list[threading.Thread] = [threading.Thread(target=replay) for _ in range(4)]
+    # Switch threads as often as possible, so that lookups interleave with evictions.
+    switch_interval: float = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(switch_interval)
+
+    assert cache.statistics.hits + cache.statistics.misses == len(threads) * rounds * len(stream)
+    assert len(cache) <= 2
+    assert cache.current_bytes == sum(size for _, size in cache._entries.values())
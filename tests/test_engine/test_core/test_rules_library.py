@@ -0,0 +1,86 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.engine.core import rules_library
+from src.engine.core.command import Command, CommandType
+from src.engine.core.player import Player
+from src.engine.core.rules_library import (
+    RULE_REGISTRY,
+    CompiledRuleSet,
+    RuleManifest,
+    RuleModuleEntry,
+)
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.turns.pass_action import PassEvent
+
+ROOT = Path(__file__).resolve().parents[3]
+
+
+def test_engine_construction_does_not_import_rule_modules() -> None:
+    script: str = (
+        "import sys\n"
+        "from src.engine.core.ti4_rules_engine import TI4RulesEngine\n"
+        "TI4RulesEngine()\n"
+        f"loaded = [path for path in {[entry.module_path for entry in RULE_REGISTRY]!r} "
+        "if path in sys.modules]\n"
+        "assert not loaded, loaded\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=ROOT, check=True)
+
+
+def test_rule_modules_are_imported_on_first_use() -> None:
+    rule_set = CompiledRuleSet(manifest=RuleManifest.from_registry(RULE_REGISTRY))
+    assert rule_set.loaded_module_paths == frozenset()
+
+    rule_set.command_rules_for(CommandType.END_TURN)
+    assert rule_set.loaded_module_paths == {"src.engine.turns.end_turn"}
+
+    rule_set.event_rules_for(PassEvent())
+    assert rule_set.loaded_module_paths == {
+        "src.engine.turns.end_turn",
+        "src.engine.turns.pass_action",
+    }
+
+
+def test_engines_share_one_compiled_rule_set() -> None:
+    first, second = TI4RulesEngine(), TI4RulesEngine()
+    command = Command(actor=Player("A"), command_type=CommandType.PASS_ACTION)
+
+    assert first.rule_set is second.rule_set
+    assert first.command_rules_for(command) is second.command_rules_for(command)
+
+
+@pytest.mark.parametrize("entry", RULE_REGISTRY, ids=lambda entry: entry.module_path)
+def test_registry_declares_exactly_the_commands_its_rules_apply_to(
+    entry: RuleModuleEntry,
+) -> None:
+    rule_set = CompiledRuleSet(manifest=RuleManifest.from_registry([entry]))
+    (command_rules, _) = rule_set._load(entry)
+    for command_type in CommandType.all_command_types():
+        command = Command(actor=Player("A"), command_type=command_type)
+        applicable: bool = any(rule.is_applicable(command) for rule in command_rules)
+        assert applicable == (command_type in entry.command_types), command_type
+
+
+def test_all_rules_are_still_available_in_registry_order() -> None:
+    assert [repr(rule) for rule in rules_library.get_command_rules()] == [
+        "EndTurn",
+        "InitiateTacticalAction",
+        "PassAction",
+    ]
+    assert [type(rule).__name__ for rule in rules_library.get_event_rules()] == [
+        "AdvanceToStatusRule"
+    ]
+
+
+def test_two_modules_cannot_reserve_the_same_event_code() -> None:
+    with pytest.raises(ValueError, match="reserved by both"):
+        RuleManifest.from_registry(
+            [
+                RuleModuleEntry(module_path="first", event_codes=frozenset({1, 2})),
+                RuleModuleEntry(module_path="second", event_codes=frozenset({2, 3})),
+            ]
+        )
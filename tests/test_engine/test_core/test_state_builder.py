@@ -0,0 +1,135 @@
+from collections.abc import Sequence
+from dataclasses import FrozenInstanceError, replace
+
+import pytest
+
+from src.engine.core.command import Command, CommandRule, CommandType
+from src.engine.core.event import Event, EventRule
+from src.engine.core.game_engine import CommandResult, GameEngine, IllegalStateMutationError
+from src.engine.core.game_state import GameState, Phase, System
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import Player
+from src.engine.core.rules_engine import RulesEngine
+from src.engine.core.state_builder import GameStateBuilder
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+from .common import TrivialEvent
+
+PLAYERS = (Player("A"), Player("B"))
+STATE = GameState(
+    players=PLAYERS,
+    active_player=PLAYERS[0],
+    phase=Phase.ACTION,
+    galaxy={System(id=0, command_tokens=()), System(id=1, command_tokens=())},
+)
+
+
+class EmitEvents(CommandRule):
+    def __init__(self, events: Sequence[Event]) -> None:
+        self.events: Sequence[Event] = events
+
+    def __repr__(self) -> str:
+        return "EmitEvents"
+
+    def validate_legality(self, state: GameState, command: Command) -> bool:
+        return True
+
+    def derive_events(self, state: GameState, command: Command) -> Sequence[Event]:
+        return self.events
+
+    @staticmethod
+    def is_applicable(command: Command) -> bool:
+        return True
+
+
+class MutatingEventRule(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        state.phase = Phase.STATUS  # type: ignore
+        return []
+
+
+class ListRulesEngine(RulesEngine):
+    def __init__(self, command_rules: Sequence[CommandRule], event_rules: Sequence[EventRule]):
+        self.command_rules: Sequence[CommandRule] = command_rules
+        self.event_rules: Sequence[EventRule] = event_rules
+
+
+def test_transactional_engine_matches_immutable_engine_on_random_games() -> None:
+    immutable = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+    transactional = GameEngine(
+        rules_engine=TI4RulesEngine(), invariants=make_all_invariants(), transactional=True
+    )
+    config = SyntheticGameConfig(player_count=8, system_count=61, tactic_tokens=(1, 4))
+    for seed in range(10):
+        state: GameState = generate_state(config=config, seed=seed)
+        for command, expected in generate_command_stream(
+            engine=immutable, state=state, seed=seed, max_commands=200
+        ):
+            actual: CommandResult = transactional.apply_command(state=state, command=command)
+            assert actual.new_state == expected.new_state
+            assert actual.new_state.players == expected.new_state.players
+            assert actual.new_state.galaxy == expected.new_state.galaxy
+            assert actual.new_state.turn_context == expected.new_state.turn_context
+            assert [event.payload for event in actual.events] == [
+                event.payload for event in expected.events
+            ]
+            state = expected.new_state
+
+
+def test_builder_copies_on_write_and_leaves_base_untouched() -> None:
+    builder = GameStateBuilder(STATE)
+    assert builder.freeze() is STATE
+
+    builder.replace_player(replace(PLAYERS[1], has_passed=True))
+    builder.replace_system(System(id=1, command_tokens=()))
+    builder.set(phase=Phase.STATUS)
+    frozen: GameState = builder.freeze()
+
+    assert frozen.get_player(name="B").has_passed
+    assert frozen.phase == Phase.STATUS
+    assert isinstance(frozen.players, tuple)
+    assert frozen.galaxy is not STATE.galaxy
+    assert not STATE.get_player(name="B").has_passed
+    assert STATE.phase == Phase.ACTION
+
+
+def test_builder_rejects_direct_assignment_and_unknown_fields() -> None:
+    builder = GameStateBuilder(STATE)
+    with pytest.raises(FrozenInstanceError):
+        builder.phase = Phase.STATUS  # type: ignore
+    with pytest.raises(TypeError):
+        builder.set(not_a_field=1)
+
+
+def test_events_without_builder_form_still_apply_transactionally() -> None:
+    engine = GameEngine(
+        rules_engine=ListRulesEngine(
+            command_rules=[EmitEvents([TrivialEvent(payload="plain")])], event_rules=[]
+        ),
+        transactional=True,
+    )
+    result: CommandResult = engine.apply_command(
+        state=STATE, command=Command(actor=PLAYERS[0], command_type=CommandType.ALWAYS_VALID)
+    )
+    assert result.success
+    assert result.new_state is STATE
+
+
+def test_rules_mutating_the_view_are_rejected() -> None:
+    engine = GameEngine(
+        rules_engine=ListRulesEngine(
+            command_rules=[EmitEvents([TrivialEvent(payload="plain")])],
+            event_rules=[MutatingEventRule()],
+        ),
+        transactional=True,
+    )
+    with pytest.raises(IllegalStateMutationError):
+        engine.apply_command(
+            state=STATE, command=Command(actor=PLAYERS[0], command_type=CommandType.ALWAYS_VALID)
+        )
+    assert STATE.phase == Phase.ACTION
@@ -0,0 +1,72 @@
+from src.engine.core.command import Command
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_session import GameSession
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+    legal_commands,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+STATE: GameState = generate_state(config=SyntheticGameConfig(tactic_tokens=(2, 4)), seed=0)
+STREAM: list[tuple[Command, CommandResult]] = list(
+    generate_command_stream(engine=ENGINE, state=STATE, seed=0, max_commands=10)
+)
+
+
+def _play(session: GameSession, count: int) -> None:
+    for command, _ in STREAM[:count]:
+        session.apply_command(command=command)
+
+
+def test_undo_and_redo_walk_the_timeline_without_discarding_it() -> None:
+    session = GameSession(initial_state=STATE, engine=ENGINE)
+    _play(session, count=3)
+
+    assert session.undo() == STREAM[1][1].new_state
+    assert session.undo() == STREAM[0][1].new_state
+    assert len(session.history) == 1
+    assert session.redo() == STREAM[1][1].new_state
+    assert session.redo() == STREAM[2][1].new_state
+    assert session.redo() == STREAM[2][1].new_state
+    assert list(session.history) == [result for _, result in STREAM[:3]]
+    assert session.history[-2] == STREAM[1][1]
+
+
+def test_applying_after_undo_starts_a_branch_and_keeps_the_old_one() -> None:
+    session = GameSession(initial_state=STATE, engine=ENGINE)
+    _play(session, count=3)
+    old_tip = session.current_node
+    for _ in range(3):
+        session.undo()
+    alternatives = [
+        command
+        for command in legal_commands(engine=ENGINE, state=session.current_state)
+        if command != STREAM[0][0]
+    ]
+    session.apply_command(command=alternatives[0])
+
+    assert len(session.branch_tips()) == 2
+    assert old_tip in session.branch_tips()
+    assert session.current_node.parent is session.root
+    assert len(session.history) == 1
+    assert session.checkout(old_tip) == STREAM[2][1].new_state
+
+
+def test_forks_share_their_common_prefix() -> None:
+    session = GameSession(initial_state=STATE, engine=ENGINE)
+    _play(session, count=2)
+    fork_point = session.current_node
+    fork: GameSession = session.fork()
+    for command, _ in STREAM[2:5]:
+        fork.apply_command(command=command)
+
+    assert session.current_node is fork_point
+    assert fork.root is session.root
+    assert fork.current_node.ancestor(depth=2) is fork_point
+    assert fork.current_state == STREAM[4][1].new_state
+    assert session.redo() == STREAM[2][1].new_state
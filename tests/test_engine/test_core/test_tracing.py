@@ -0,0 +1,150 @@
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+from src.engine.core.command import Command, CommandRule, CommandType
+from src.engine.core.event import Event, EventRule
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState, Phase
+from src.engine.core.instrumentation import EngineInstrumentation, EngineStep, ProbeGroup
+from src.engine.core.player import Player
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.core.tracing import CascadeTracer, Span
+from src.engine.strategy_cards import StrategyCard
+
+PLAYER = Player(name="A", strategy_cards=(StrategyCard(name="XXX", initiative=1, is_ready=False),))
+STATE = GameState(players=(PLAYER,), active_player=PLAYER, phase=Phase.ACTION, galaxy=set())
+PASS = Command(actor=PLAYER, command_type=CommandType.PASS_ACTION)
+
+
+def _children(span: Span, step: EngineStep) -> list[Span]:
+    return [child for child in span.children if child.step == step]
+
+
+def _only_child(span: Span, step: EngineStep, name: str) -> Span:
+    (child,) = [child for child in _children(span, step) if child.name == name]
+    return child
+
+
+def test_triggered_events_are_nested_under_their_cause() -> None:
+    tracer = CascadeTracer()
+    GameEngine(rules_engine=TI4RulesEngine(), probe=tracer).apply_command(state=STATE, command=PASS)
+
+    (trace,) = tracer.traces
+    assert (trace.step, trace.name) == (EngineStep.COMMAND, "pass_action")
+    derived: Span = _only_child(trace, EngineStep.CASCADE, "PassCommandRule")
+    assert [span.name for span in _children(derived, EngineStep.EVENT)] == [
+        "PassEvent",
+        "EndTurnEvent",
+    ]
+    pass_span: Span = _only_child(derived, EngineStep.EVENT, "PassEvent")
+    assert [child.step for child in pass_span.children] == [
+        EngineStep.APPLY,
+        EngineStep.ON_EVENT,
+        EngineStep.CASCADE,
+    ]
+    triggered: Span = _only_child(pass_span, EngineStep.CASCADE, "AdvanceToStatusRule")
+    assert [span.name for span in _children(triggered, EngineStep.EVENT)] == [
+        "AdvanceActionToStatusPhase"
+    ]
+    assert all(
+        span.start_ns <= child.start_ns <= child.end_ns <= span.end_ns
+        for _, span in trace.walk()
+        for child in span.children
+    )
+
+
+@dataclass(frozen=True)
+class Cause(Event):
+    payload = "cause"
+
+    def apply(self, previous_state: GameState) -> GameState:
+        return previous_state
+
+
+@dataclass(frozen=True)
+class FirstEffect(Cause):
+    payload = "first"
+
+
+@dataclass(frozen=True)
+class SecondEffect(Cause):
+    payload = "second"
+
+
+class FirstRule(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [FirstEffect(), FirstEffect()] if type(event) is Cause else []
+
+
+class SecondRule(EventRule):
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        return [SecondEffect()] if type(event) is Cause else []
+
+
+class DeriveCause(CommandRule):
+    @staticmethod
+    def is_applicable(command: Command) -> bool:
+        return True
+
+    def validate_legality(self, state: GameState, command: Command) -> bool:
+        return True
+
+    def derive_events(self, state: GameState, command: Command) -> Sequence[Event]:
+        return [Cause()]
+
+
+def test_events_of_rules_triggering_on_the_same_event_keep_their_rule_as_parent() -> None:
+    rules_engine = TI4RulesEngine()
+    rules_engine.command_rules = [DeriveCause()]
+    rules_engine.event_rules = [FirstRule(), SecondRule()]
+    tracer = CascadeTracer()
+    GameEngine(rules_engine=rules_engine, probe=tracer).apply_command(state=STATE, command=PASS)
+
+    cause: Span = _only_child(
+        _only_child(tracer.traces[0], EngineStep.CASCADE, "DeriveCause"), EngineStep.EVENT, "Cause"
+    )
+    # Both rules run before either's events resolve, and the later rule's events resolve first.
+    assert [(child.step, child.name) for child in cause.children] == [
+        (EngineStep.APPLY, "Cause"),
+        (EngineStep.ON_EVENT, "FirstRule"),
+        (EngineStep.ON_EVENT, "SecondRule"),
+        (EngineStep.CASCADE, "SecondRule"),
+        (EngineStep.CASCADE, "FirstRule"),
+    ]
+    first: Span = _only_child(cause, EngineStep.CASCADE, "FirstRule")
+    second: Span = _only_child(cause, EngineStep.CASCADE, "SecondRule")
+    assert [span.name for span in first.children] == ["FirstEffect", "FirstEffect"]
+    assert [span.name for span in second.children] == ["SecondEffect"]
+
+
+def test_chrome_trace_export(tmp_path: Path) -> None:
+    tracer = CascadeTracer()
+    GameEngine(rules_engine=TI4RulesEngine(), probe=tracer).apply_command(state=STATE, command=PASS)
+    path: Path = tmp_path / "trace.json"
+
+    tracer.dump_chrome_trace(path)
+
+    trace_events = json.loads(path.read_text())["traceEvents"]
+    assert len(trace_events) == sum(1 for _ in tracer.traces[0].walk())
+    assert all(trace_event["ph"] == "X" for trace_event in trace_events)
+    assert {"pass_action", "PassEvent", "AdvanceToStatusRule"} <= {
+        trace_event["name"] for trace_event in trace_events
+    }
+
+
+def test_sampling_skips_unsampled_commands() -> None:
+    never = CascadeTracer(sample_rate=0.0)
+    sometimes = CascadeTracer(sample_rate=0.5, seed=1)
+    instrumentation = EngineInstrumentation()
+    engine = GameEngine(
+        rules_engine=TI4RulesEngine(), probe=ProbeGroup([never, sometimes, instrumentation])
+    )
+
+    for _ in range(100):
+        engine.apply_command(state=STATE, command=PASS)
+
+    assert len(never.traces) == 0
+    assert 20 < len(sometimes.traces) < 80
+    assert instrumentation.timings[(EngineStep.COMMAND, "pass_action")].calls == 100
@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.persistence.game_archive import (
+    ArchiveCodec,
+    ArchiveFormatError,
+    ArchiveWriter,
+    GameArchive,
+    GameNotFoundError,
+)
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+CONFIG = SyntheticGameConfig(tactic_tokens=(3, 5), ready_card_probability=0.0)
+GAMES: dict[str, tuple[GameState, list[tuple[Command, CommandResult]]]] = {}
+for seed in range(3):
+    initial_state: GameState = generate_state(config=CONFIG, seed=seed)
+    GAMES[f"game-{seed}"] = (
+        initial_state,
+        list(
+            generate_command_stream(engine=ENGINE, state=initial_state, seed=seed, max_commands=30)
+        ),
+    )
+
+
+def _write_archive(path: Path, codec: ArchiveCodec = ArchiveCodec.ZLIB) -> None:
+    with ArchiveWriter(path, codec=codec, checkpoint_interval=4) as writer:
+        for game_id, (initial_state, stream) in GAMES.items():
+            writer.add_game(game_id, initial_state=initial_state, moves=stream)
+
+
+@pytest.mark.parametrize("codec", list(ArchiveCodec))
+def test_state_at_every_move_matches_the_engine(tmp_path: Path, codec: ArchiveCodec) -> None:
+    _write_archive(tmp_path / "games.archive", codec=codec)
+
+    with GameArchive(tmp_path / "games.archive") as archive:
+        assert archive.game_ids == tuple(GAMES)
+        for game_id, (initial_state, stream) in GAMES.items():
+            assert archive.game(game_id).move_count == len(stream)
+            assert archive.state_at(game_id, move=0) == initial_state
+            for move, (_, result) in enumerate(stream, start=1):
+                assert archive.state_at(game_id, move=move) == result.new_state
+
+
+def test_seeking_to_a_move_reads_a_single_block(tmp_path: Path) -> None:
+    _write_archive(tmp_path / "games.archive")
+    game_id: str = "game-2"
+    stream: list[tuple[Command, CommandResult]] = GAMES[game_id][1]
+    move: int = len(stream) - 2
+
+    with GameArchive(tmp_path / "games.archive") as archive:
+        state: GameState = archive.state_at(game_id, move=move)
+
+        assert state == stream[move - 1][1].new_state
+        assert archive.statistics.blocks_read == 1
+        assert len(archive.game(game_id).blocks) == -(-len(stream) // 4)
+
+
+def test_moves_resume_from_any_move(tmp_path: Path) -> None:
+    _write_archive(tmp_path / "games.archive")
+    stream: list[tuple[Command, CommandResult]] = GAMES["game-0"][1]
+
+    with GameArchive(tmp_path / "games.archive") as archive:
+        moves = list(archive.moves("game-0", start=6))
+
+    assert [move.command for move in moves] == [command for command, _ in stream[6:]]
+    assert [move.events for move in moves] == [tuple(result.events) for _, result in stream[6:]]
+
+
+def test_missing_games_and_moves_are_reported(tmp_path: Path) -> None:
+    _write_archive(tmp_path / "games.archive")
+
+    with GameArchive(tmp_path / "games.archive") as archive:
+        with pytest.raises(GameNotFoundError):
+            archive.state_at("game-9", move=0)
+        with pytest.raises(IndexError):
+            archive.state_at("game-0", move=len(GAMES["game-0"][1]) + 1)
+
+
+def test_failed_commands_cannot_be_archived(tmp_path: Path) -> None:
+    initial_state: GameState = GAMES["game-0"][0]
+    illegal = Command(actor=initial_state.active_player, command_type=CommandType.END_TURN)
+    result: CommandResult = ENGINE.apply_command(state=initial_state, command=illegal)
+
+    with ArchiveWriter(tmp_path / "games.archive") as writer, pytest.raises(ValueError):
+        writer.add_game("game-0", initial_state=initial_state, moves=[(illegal, result)])
+
+
+def test_an_archive_that_was_never_closed_is_rejected(tmp_path: Path) -> None:
+    writer = ArchiveWriter(tmp_path / "games.archive")
+    writer.add_game("game-0", initial_state=GAMES["game-0"][0], moves=GAMES["game-0"][1])
+    writer._file.flush()
+
+    with pytest.raises(ArchiveFormatError):
+        GameArchive(tmp_path / "games.archive")
+    writer.close()
@@ -0,0 +1,149 @@
+from pathlib import Path
+
+import pytest
+
+from src.engine.actions.tactical_action import ActivateCommand
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState, Phase, System
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import CommandSheet, Player
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.persistence.session_store import SessionNotFoundError, SessionStore
+from src.engine.strategy_cards import StrategyCard
+
+PLAYER_A = Player(
+    name="A",
+    strategy_cards=(StrategyCard(name="Leadership", initiative=1),),
+    command_sheet=CommandSheet.make_from_int("A", tactic=3, fleet=0, strategy=0),
+)
+PLAYER_B = Player(
+    name="B",
+    strategy_cards=(StrategyCard(name="Diplomacy", initiative=2),),
+    command_sheet=CommandSheet.make_from_int("B", tactic=3, fleet=0, strategy=0),
+)
+INITIAL_STATE = GameState(
+    players=(PLAYER_A, PLAYER_B),
+    active_player=PLAYER_A,
+    phase=Phase.ACTION,
+    galaxy={System(id=0, command_tokens=()), System(id=1, command_tokens=())},
+)
+
+
+def _make_store(
+    directory: Path, max_sessions: int = 2, max_bytes: int | None = None
+) -> SessionStore:
+    return SessionStore(
+        engine=GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants()),
+        directory=directory,
+        max_sessions=max_sessions,
+        max_bytes=max_bytes,
+    )
+
+
+def _activate(player: Player, system_id: int) -> ActivateCommand:
+    return ActivateCommand(
+        actor=player, command_type=CommandType.INITIATE_TACTICAL_ACTION, system_id=system_id
+    )
+
+
+def _play_one_turn(store: SessionStore, session_id: str) -> GameState:
+    store.apply_command(session_id, _activate(player=PLAYER_A, system_id=0))
+    return store.apply_command(
+        session_id, Command(actor=PLAYER_A, command_type=CommandType.END_TURN)
+    )
+
+
+def test_least_recently_used_session_is_evicted_when_over_count_budget(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, max_sessions=2)
+    for session_id in ("first", "second", "third"):
+        store.create_session(session_id, INITIAL_STATE)
+
+    assert store.resident_session_ids == ("second", "third")
+    assert "first" in store
+    assert store.metrics.evictions == 1
+
+
+def test_evicted_session_is_rehydrated_on_next_command(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, max_sessions=1)
+    store.create_session("cold", INITIAL_STATE)
+    state_before_eviction: GameState = _play_one_turn(store, "cold")
+    store.create_session("hot", INITIAL_STATE)
+    assert store.resident_session_ids == ("hot",)
+
+    state_after: GameState = store.apply_command("cold", _activate(player=PLAYER_B, system_id=1))
+
+    assert store.resident_session_ids == ("cold",)
+    assert state_after.active_player == state_before_eviction.active_player
+    assert state_after.get_system(id=0) == state_before_eviction.get_system(id=0)
+    assert state_after.turn_context.has_taken_action
+    assert store.metrics.misses == 1
+    assert store.metrics.mean_rehydrate_seconds > 0
+
+
+def test_log_past_checkpoint_is_replayed_by_a_fresh_store(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    store.create_session("game", INITIAL_STATE)
+    expected_state: GameState = _play_one_turn(store, "game")
+    store.apply_command("game", _activate(player=PLAYER_B, system_id=1))
+    store.undo("game")
+
+    rehydrated = _make_store(tmp_path)
+
+    assert rehydrated.current_state("game") == expected_state
+    assert rehydrated.current_state("game").galaxy == expected_state.galaxy
+    assert len(rehydrated.history("game")) == 2
+
+
+def test_redo_is_replayed_by_a_fresh_store(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    store.create_session("game", INITIAL_STATE)
+    expected_state: GameState = _play_one_turn(store, "game")
+    store.undo("game")
+    store.undo("game")
+    store.redo("game")
+
+    assert store.redo("game") == expected_state
+    assert _make_store(tmp_path).current_state("game") == expected_state
+
+
+def test_undo_and_redo_leave_the_resident_size_alone(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    store.create_session("game", INITIAL_STATE)
+    _play_one_turn(store, "game")
+    resident_bytes: int = store.resident_bytes
+
+    store.undo("game")
+    store.redo("game")
+
+    assert store.resident_bytes == resident_bytes
+
+
+def test_hit_rate_counts_resident_lookups(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, max_sessions=1)
+    store.create_session("game", INITIAL_STATE)
+    store.current_state("game")
+    store.current_state("game")
+    store.evict("game")
+    store.current_state("game")
+
+    assert store.metrics.hits == 2
+    assert store.metrics.misses == 1
+    assert store.metrics.hit_rate == pytest.approx(2 / 3)
+
+
+def test_memory_budget_keeps_only_the_most_recent_session(tmp_path: Path) -> None:
+    store = _make_store(tmp_path, max_sessions=10, max_bytes=1)
+    store.create_session("first", INITIAL_STATE)
+    store.create_session("second", INITIAL_STATE)
+    _play_one_turn(store, "first")
+
+    assert store.resident_session_ids == ("first",)
+
+
+def test_unknown_session_raises(tmp_path: Path) -> None:
+    store = _make_store(tmp_path)
+    with pytest.raises(SessionNotFoundError):
+        store.current_state("missing")
+    with pytest.raises(ValueError):
+        store.create_session("../escape", INITIAL_STATE)
@@ -0,0 +1,78 @@
+from collections import Counter
+from pathlib import Path
+
+from src.engine.core.command import Command, CommandType
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState, Phase
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.persistence.game_archive import ArchiveWriter, GameArchive
+from src.engine.simulation.analytics import GameStatistics, collect_statistics, replay_states
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+CONFIG = SyntheticGameConfig(
+    tactic_tokens=(1, 3), ready_card_probability=0.0, passed_probability=0.0
+)
+GAMES: dict[str, tuple[GameState, list[tuple[Command, CommandResult]]]] = {}
+for seed in range(5):
+    initial_state: GameState = generate_state(config=CONFIG, seed=seed)
+    GAMES[f"game-{seed}"] = (
+        initial_state,
+        list(
+            generate_command_stream(engine=ENGINE, state=initial_state, seed=seed, max_commands=100)
+        ),
+    )
+
+
+def _write_archive(path: Path) -> Path:
+    with ArchiveWriter(path, checkpoint_interval=8) as writer:
+        for game_id, (initial_state, stream) in GAMES.items():
+            writer.add_game(game_id, initial_state=initial_state, moves=stream)
+    return path
+
+
+def _commands_of_type(command_type: CommandType) -> list[Command]:
+    return [
+        command
+        for _, stream in GAMES.values()
+        for command, _ in stream
+        if command.command_type == command_type
+    ]
+
+
+def test_statistics_agree_with_the_commands_played(tmp_path: Path) -> None:
+    statistics: GameStatistics = collect_statistics(_write_archive(tmp_path / "games.archive"))
+
+    passes: list[Command] = _commands_of_type(CommandType.PASS_ACTION)
+    assert all(stream[-1][1].new_state.phase == Phase.STATUS for _, stream in GAMES.values())
+    assert statistics.games == len(GAMES)
+    assert statistics.rounds_per_game == 1.0
+    assert statistics.passes == len(passes)
+    assert statistics.passes_per_round == len(passes) / len(GAMES)
+    assert statistics.turns == len(passes) + len(_commands_of_type(CommandType.END_TURN))
+    # Every game ends on a pass, so every event belongs to a turn.
+    assert statistics.turn_events == statistics.events
+    assert statistics.tactical_actions == Counter(
+        command.actor.name for command in _commands_of_type(CommandType.INITIATE_TACTICAL_ACTION)
+    )
+
+
+def test_statistics_merged_across_processes_match_a_single_pass(tmp_path: Path) -> None:
+    path: Path = _write_archive(tmp_path / "games.archive")
+
+    assert collect_statistics(path, processes=2, chunk_size=2) == collect_statistics(path)
+
+
+def test_replayed_states_match_the_archive(tmp_path: Path) -> None:
+    game_id: str = "game-3"
+    stream: list[tuple[Command, CommandResult]] = GAMES[game_id][1]
+
+    with GameArchive(_write_archive(tmp_path / "games.archive")) as archive:
+        states: list[GameState] = list(replay_states(archive, game_id, engine=ENGINE))
+
+    assert states == [result.new_state for _, result in stream]
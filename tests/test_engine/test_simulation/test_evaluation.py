@@ -0,0 +1,92 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.evaluation import (
+    PLAYER_FEATURES,
+    EvaluationBroker,
+    FeatureEncoder,
+    LinearEvaluator,
+)
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+STATE: GameState = generate_state(
+    config=SyntheticGameConfig(player_count=4, system_count=19, board_token_probability=0.2),
+    seed=0,
+)
+STATES: list[GameState] = [STATE] + [
+    result.new_state
+    for _, result in generate_command_stream(engine=ENGINE, state=STATE, seed=0, max_commands=9)
+]
+ENCODER: FeatureEncoder = FeatureEncoder.for_state(STATE)
+EVALUATOR = LinearEvaluator(
+    weights=np.arange(ENCODER.feature_count * 2, dtype=np.float32).reshape(-1, 2)
+)
+
+
+def test_features_describe_players_and_command_tokens() -> None:
+    features: np.ndarray = ENCODER.encode([STATE])
+    player_count: int = len(STATE.players)
+    players: np.ndarray = features[0, : player_count * PLAYER_FEATURES].reshape(player_count, -1)
+    tokens: np.ndarray = features[0, player_count * PLAYER_FEATURES :].reshape(-1, player_count)
+
+    assert features.shape == (1, ENCODER.feature_count)
+    for index, player in enumerate(STATE.players):
+        assert players[index, 0] == len(player.command_sheet.tactic)
+        assert players[index, 5] == (player == STATE.active_player)
+        assert {
+            ENCODER.system_ids[position] for position in np.flatnonzero(tokens[:, index])
+        } == STATE.occupancy.activated_systems(player.name)
+
+
+def test_concurrent_requests_are_evaluated_in_batches() -> None:
+    broker = EvaluationBroker(evaluator=EVALUATOR, encoder=ENCODER, max_batch_size=4)
+
+    async def search() -> list[np.ndarray]:
+        return await asyncio.gather(*(broker.evaluate(state) for state in STATES))
+
+    values: list[np.ndarray] = asyncio.run(search())
+
+    assert np.array_equal(np.stack(values), EVALUATOR(ENCODER.encode(STATES)))
+    assert broker.statistics.batches == 3
+    assert broker.statistics.evaluations == len(STATES)
+    assert broker.statistics.mean_batch_size == len(STATES) / 3
+
+
+def test_a_lone_request_is_evaluated_after_the_deadline() -> None:
+    broker = EvaluationBroker(evaluator=EVALUATOR, encoder=ENCODER, max_delay=0.01)
+    value: np.ndarray = asyncio.run(broker.evaluate(STATE))
+
+    assert np.array_equal(value, EVALUATOR(ENCODER.encode([STATE]))[0])
+    assert broker.statistics.batches == 1
+    assert broker.statistics.wait_seconds_max >= 0.01
+
+
+def test_a_failed_evaluation_fails_every_request_of_the_batch() -> None:
+    def failing_evaluator(features: np.ndarray) -> np.ndarray:
+        raise FloatingPointError("model diverged")
+
+    broker = EvaluationBroker(evaluator=failing_evaluator, encoder=ENCODER)
+
+    async def search() -> list[np.ndarray | BaseException]:
+        return await asyncio.gather(
+            *(broker.evaluate(state) for state in STATES[:3]), return_exceptions=True
+        )
+
+    outcomes: list[np.ndarray | BaseException] = asyncio.run(search())
+    assert all(isinstance(outcome, FloatingPointError) for outcome in outcomes)
+
+
+def test_batches_must_hold_a_request() -> None:
+    with pytest.raises(ValueError, match="at least one"):
+        EvaluationBroker(evaluator=EVALUATOR, encoder=ENCODER, max_batch_size=0)
@@ -0,0 +1,91 @@
+from collections.abc import Sequence
+
+from src.engine.actions.tactical_action import ActivateCommand, TacticalActionEventType
+from src.engine.core.command import Command
+from src.engine.core.event import Event, EventRule
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.fuzzing import FuzzCheck, Fuzzer, FuzzReport, minimise
+from src.engine.simulation.synthetic import SyntheticGameConfig
+
+CONFIG = SyntheticGameConfig(
+    player_count=3,
+    system_count=7,
+    tactic_tokens=(2, 3),
+    ready_card_probability=0.0,
+    passed_probability=0.0,
+    board_token_probability=0.0,
+)
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+
+
+class SecondActivationRaises(EventRule):
+    """A broken rule: a player's second activated system raises."""
+
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        if event.type_code == TacticalActionEventType.ACTIVATE_SYSTEM:
+            if len(state.occupancy.activated_systems(event.player_id)) >= 2:  # type: ignore
+                raise ZeroDivisionError("second activation")
+        return []
+
+
+def _broken_engine() -> GameEngine:
+    rules_engine = TI4RulesEngine()
+    rules_engine.event_rules = [*rules_engine.event_rules, SecondActivationRaises()]
+    return GameEngine(rules_engine=rules_engine, invariants=make_all_invariants())
+
+
+def test_minimise_keeps_only_what_the_failure_needs() -> None:
+    assert minimise(range(20), lambda items: {3, 7} <= set(items)) == (3, 7)
+    assert minimise(range(20), lambda items: sum(items) >= 19) == (19,)
+
+
+def test_engine_agrees_with_itself_and_the_transactional_engine() -> None:
+    reference = GameEngine(
+        rules_engine=ENGINE.rules_engine, invariants=ENGINE.invariants, transactional=True
+    )
+    report: FuzzReport = Fuzzer(ENGINE, config=CONFIG, reference=reference).run(sequences=30)
+
+    assert report.failures == ()
+    assert report.sequences == 30
+    assert 0 < report.commands <= 30 * 32
+
+
+def test_crashes_are_found_and_minimised() -> None:
+    fuzzer = Fuzzer(_broken_engine(), config=CONFIG, sequence_length=40)
+    report: FuzzReport = fuzzer.run(sequences=10)
+
+    assert report.failures
+    for failure in report.failures:
+        assert failure.check == FuzzCheck.CRASH
+        assert "second activation" in failure.detail
+        assert len(failure.commands) < failure.original_length
+        assert isinstance(failure.commands[-1], ActivateCommand)
+        # Only the turns that bring the failing player round to a second activation are left.
+        actor: str = failure.commands[-1].actor.name
+        activations: list[Command] = [
+            command
+            for command in failure.commands
+            if isinstance(command, ActivateCommand) and command.actor.name == actor
+        ]
+        assert len(activations) == 2
+
+
+def test_disagreeing_engines_are_reported() -> None:
+    fuzzer = Fuzzer(ENGINE, config=CONFIG, sequence_length=40, reference=_broken_engine())
+    report: FuzzReport = fuzzer.run(sequences=10)
+
+    assert report.failures
+    assert {failure.check for failure in report.failures} == {FuzzCheck.DIFFERENTIAL}
+
+
+def test_parallel_runs_find_the_same_failures() -> None:
+    fuzzer = Fuzzer(_broken_engine(), config=CONFIG, sequence_length=40)
+
+    serial: FuzzReport = fuzzer.run(sequences=8)
+    parallel: FuzzReport = fuzzer.run(sequences=8, processes=2)
+
+    assert parallel.failures == serial.failures
+    assert parallel.commands == serial.commands
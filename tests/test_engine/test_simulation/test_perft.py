@@ -0,0 +1,63 @@
+import pytest
+
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.perft import PerftResult, perft
+from src.engine.simulation.synthetic import SyntheticGameConfig, generate_state
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+STATE: GameState = generate_state(
+    config=SyntheticGameConfig(
+        player_count=3,
+        system_count=7,
+        tactic_tokens=(2, 3),
+        ready_card_probability=0.0,
+        passed_probability=0.0,
+    ),
+    seed=1,
+)
+# Golden counts for STATE: a change in any of them means the rule set now allows different
+# command sequences, which should be deliberate.
+SEQUENCES: dict[int, int] = {1: 5, 2: 16, 3: 85, 4: 278, 5: 1149}
+DISTINCT_STATES: dict[int, int] = {1: 5, 2: 16, 3: 85, 4: 278, 5: 1107, 6: 2487}
+
+
+@pytest.mark.parametrize("depth", SEQUENCES)
+def test_sequence_counts_match_the_golden_values(depth: int) -> None:
+    result: PerftResult = perft(engine=ENGINE, state=STATE, depth=depth)
+
+    assert result.leaves == SEQUENCES[depth]
+    assert result.leaves == sum(leaves for _, leaves in result.divide)
+    assert result.nodes == sum(SEQUENCES[level] for level in range(1, depth + 1))
+
+
+@pytest.mark.parametrize("depth", DISTINCT_STATES)
+def test_distinct_state_counts_match_the_golden_values(depth: int) -> None:
+    result: PerftResult = perft(engine=ENGINE, state=STATE, depth=depth, dedupe=True)
+
+    assert result.leaves == DISTINCT_STATES[depth]
+
+
+@pytest.mark.parametrize("dedupe", [False, True], ids=["sequences", "distinct"])
+def test_worker_processes_count_the_same_leaves(dedupe: bool) -> None:
+    serial: PerftResult = perft(engine=ENGINE, state=STATE, depth=5, dedupe=dedupe)
+    parallel: PerftResult = perft(engine=ENGINE, state=STATE, depth=5, dedupe=dedupe, processes=2)
+
+    assert parallel.leaves == serial.leaves
+    assert parallel.divide == serial.divide
+    assert parallel.nodes_per_second > 0
+
+
+def test_report_ends_with_the_totals() -> None:
+    report: str = perft(engine=ENGINE, state=STATE, depth=2).report()
+
+    assert report.splitlines()[0] == "pass_action: 8"
+    assert report.splitlines()[1].startswith("initiate_tactical_action ")
+    assert report.splitlines()[-1].startswith("depth 2: 16 leaves, 21 nodes in ")
+
+
+def test_depth_must_be_positive() -> None:
+    with pytest.raises(ValueError, match="at least 1"):
+        perft(engine=ENGINE, state=STATE, depth=0)
@@ -0,0 +1,117 @@
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import replace
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+from src.engine.core.fingerprint import fingerprint
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.player import Player
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.shared_states import (
+    SharedGame,
+    SharedState,
+    SharedStatePool,
+    detach_all,
+)
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+STATE: GameState = generate_state(
+    config=SyntheticGameConfig(player_count=4, system_count=19, board_token_probability=0.2),
+    seed=3,
+)
+STATES: list[GameState] = [STATE] + [
+    result.new_state
+    for _, result in generate_command_stream(engine=ENGINE, state=STATE, seed=3, max_commands=20)
+]
+
+
+def _fingerprint_in_worker(handle: SharedState) -> bytes:
+    return fingerprint(handle.state)
+
+
+@pytest.fixture
+def pool():
+    with SharedStatePool() as pool:
+        yield pool
+    detach_all()
+
+
+def test_published_states_decode_to_equal_states(pool: SharedStatePool) -> None:
+    game: SharedGame = pool.publish_game(STATE)
+    handles: list[SharedState] = [
+        pickle.loads(pickle.dumps(handle)) for handle in pool.publish(game, STATES)
+    ]
+
+    for handle, state in zip(handles, STATES, strict=True):
+        assert handle.state == state
+        assert handle.state.galaxy == state.galaxy
+        assert handle.state.active_player.command_sheet == state.active_player.command_sheet
+        assert fingerprint(handle.state) == fingerprint(state)
+        assert handle.state.layout is game.layout
+    assert np.array_equal(game.layout.distances, STATE.layout.distances)
+    assert not game.layout.distances.flags.writeable
+    assert len(pickle.dumps(handles[0])) < len(pickle.dumps(STATES[0])) // 10
+
+
+def test_workers_decode_states_from_shared_memory(pool: SharedStatePool) -> None:
+    handles: list[SharedState] = pool.publish(pool.publish_game(STATE), STATES)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        fingerprints: list[bytes] = list(executor.map(_fingerprint_in_worker, handles))
+
+    assert fingerprints == [fingerprint(state) for state in STATES]
+
+
+def test_blocks_are_unlinked_once_nothing_refers_to_them(pool: SharedStatePool) -> None:
+    game: SharedGame = pool.publish_game(STATE)
+    handles: list[SharedState] = pool.publish(game, STATES[:2])
+    pool.release(game)
+    pool.release(handles[0])
+
+    assert handles[1].state == STATES[1]
+    assert len(pool) == 2
+    pool.release(handles[1])
+    assert len(pool) == 0
+    for block_name in (game.block_name, handles[0].block_name):
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=block_name, track=False)
+    with pytest.raises(KeyError):
+        pool.release(game)
+
+
+def test_publishing_no_states_leaves_the_game_releasable(pool: SharedStatePool) -> None:
+    game: SharedGame = pool.publish_game(STATE)
+
+    assert pool.publish(game, []) == []
+    assert len(pool) == 1
+    pool.release(game)
+    assert len(pool) == 0
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=game.block_name, track=False)
+
+
+def test_closing_the_pool_unlinks_every_block() -> None:
+    with SharedStatePool() as pool:
+        handles: list[SharedState] = pool.publish(pool.publish_game(STATE), STATES)
+    detach_all()
+
+    assert len(pool) == 0
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=handles[0].block_name, track=False)
+
+
+def test_states_of_another_game_are_rejected(pool: SharedStatePool) -> None:
+    game: SharedGame = pool.publish_game(STATE)
+    stranger: GameState = replace(STATE, players=(*STATE.players[1:], Player(name="Stranger")))
+
+    with pytest.raises(ValueError, match="players"):
+        pool.publish(game, [stranger])
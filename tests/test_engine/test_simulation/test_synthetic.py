@@ -0,0 +1,60 @@
+import pytest
+
+from src.engine.core.game_engine import GameEngine
+from src.engine.core.game_state import GameState
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+    legal_commands,
+)
+
+ENGINE = GameEngine(rules_engine=TI4RulesEngine(), invariants=make_all_invariants())
+CONFIGS: list[SyntheticGameConfig] = [
+    SyntheticGameConfig(player_count=8, system_count=61, naalu_zero_probability=0.5),
+    SyntheticGameConfig(player_count=3, system_count=19, strategy_cards_per_player=2),
+    SyntheticGameConfig(player_count=2, system_count=120, passed_probability=1.0),
+]
+
+
+@pytest.mark.parametrize("config", CONFIGS)
+def test_generated_states_satisfy_invariants(config: SyntheticGameConfig) -> None:
+    for seed in range(50):
+        state: GameState = generate_state(config=config, seed=seed)
+        assert len(state.players) == config.player_count
+        assert len(state.galaxy) == config.system_count
+        assert not state.active_player.has_passed
+        assert all(invariant.check(state=state) for invariant in make_all_invariants())
+
+
+def test_generation_is_deterministic_per_seed() -> None:
+    config = SyntheticGameConfig(player_count=8, system_count=61)
+    first: GameState = generate_state(config=config, seed=7)
+    second: GameState = generate_state(config=config, seed=7)
+    assert first == second
+    assert first.galaxy == second.galaxy
+    assert [player.command_sheet for player in first.players] == [
+        player.command_sheet for player in second.players
+    ]
+
+
+def test_impossible_configs_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        SyntheticGameConfig(player_count=9)
+    with pytest.raises(ValueError):
+        SyntheticGameConfig(player_count=5, strategy_cards_per_player=2)
+
+
+def test_command_stream_only_applies_legal_commands() -> None:
+    state: GameState = generate_state(
+        config=SyntheticGameConfig(player_count=8, system_count=61, tactic_tokens=(1, 3)), seed=3
+    )
+    stream = list(generate_command_stream(engine=ENGINE, state=state, seed=3, max_commands=500))
+
+    assert stream
+    assert all(result.success for _, result in stream)
+    assert legal_commands(engine=ENGINE, state=stream[-1][1].new_state) == []
+    replayed = list(generate_command_stream(engine=ENGINE, state=state, seed=3, max_commands=500))
+    assert [command for command, _ in replayed] == [command for command, _ in stream]
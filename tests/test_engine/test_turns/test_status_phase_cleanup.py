@@ -0,0 +1,96 @@
+from collections.abc import Sequence
+
+import pytest
+
+from src.engine.core.command import Command, CommandRule, CommandType
+from src.engine.core.event import Event, EventRule
+from src.engine.core.game_engine import CommandResult, GameEngine
+from src.engine.core.game_state import GameState, Phase, System
+from src.engine.core.invariants import make_all_invariants
+from src.engine.core.state_builder import GameStateBuilder
+from src.engine.core.ti4_rules_engine import TI4RulesEngine
+from src.engine.simulation.synthetic import (
+    SyntheticGameConfig,
+    generate_command_stream,
+    generate_state,
+)
+from src.engine.turns.status_phase import status_phase_cleanup_events
+
+CONFIG = SyntheticGameConfig(
+    player_count=6, system_count=37, tactic_tokens=(2, 4), ready_card_probability=0.0
+)
+
+
+class CleanUpCommandRule(CommandRule):
+    def __repr__(self) -> str:
+        return "CleanUp"
+
+    @staticmethod
+    def is_applicable(command: Command) -> bool:
+        return True
+
+    def validate_legality(self, state: GameState, command: Command) -> bool:
+        return state.phase == Phase.STATUS
+
+    def derive_events(self, state: GameState, command: Command) -> Sequence[Event]:
+        return status_phase_cleanup_events()
+
+
+class RecordingEventRule(EventRule):
+    def __init__(self) -> None:
+        self.seen: list[str] = []
+
+    def on_event(self, state: GameState, event: Event) -> Sequence[Event]:
+        self.seen.append(event.payload)
+        return []
+
+
+def _end_of_action_phase(seed: int) -> GameState:
+    state: GameState = generate_state(config=CONFIG, seed=seed)
+    engine = GameEngine(rules_engine=TI4RulesEngine())
+    for _, result in generate_command_stream(
+        engine=engine, state=state, seed=seed, max_commands=500
+    ):
+        state = result.new_state
+    assert state.phase == Phase.STATUS
+    return state
+
+
+@pytest.mark.parametrize("transactional", [False, True])
+def test_cleanup_resets_board_and_players_with_one_event_per_step(transactional: bool) -> None:
+    recorder = RecordingEventRule()
+    rules_engine = TI4RulesEngine()
+    rules_engine.command_rules = [CleanUpCommandRule()]
+    rules_engine.event_rules = [recorder]
+    engine = GameEngine(
+        rules_engine=rules_engine, invariants=make_all_invariants(), transactional=transactional
+    )
+    state: GameState = _end_of_action_phase(seed=4)
+    assert state.occupancy.system_masks
+
+    result: CommandResult = engine.apply_command(
+        state=state, command=Command(actor=state.active_player, command_type=CommandType.END_TURN)
+    )
+
+    assert result.success
+    assert recorder.seen == [event.payload for event in result.events]
+    assert len(result.events) == 3
+    cleaned: GameState = result.new_state
+    assert all(system.command_tokens == () for system in cleaned.galaxy)
+    assert cleaned.occupancy.system_masks == {}
+    assert all(not player.has_passed for player in cleaned.players)
+    assert not cleaned.active_player.has_passed
+    assert all(card.is_ready for player in cleaned.players for card in player.strategy_cards)
+    # Players compare by name, so compare the fields of the active player with its entry.
+    assert vars(cleaned.active_player) == vars(cleaned.get_player(cleaned.active_player.name))
+    assert len(cleaned.galaxy) == len(state.galaxy)
+
+
+def test_bulk_replacement_rejects_unknown_systems_without_changes() -> None:
+    state: GameState = generate_state(config=CONFIG, seed=0)
+    builder = GameStateBuilder(state)
+    with pytest.raises(ValueError):
+        builder.replace_systems(
+            [System(id=0, command_tokens=()), System(id=999, command_tokens=())]
+        )
+    assert builder.freeze() is state
@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from src.engine.core.game_state import GameState
+from src.engine.core.state_builder import GameStateBuilder
+from src.engine.simulation.synthetic import SyntheticGameConfig, generate_state
+from src.engine.util.rng import MASK64, RandomStream
+
+ROOT = Path(__file__).resolve().parents[3]
+# The first outputs of the reference SplitMix64 generator seeded with 0.
+SPLITMIX64_SEED_0 = (0xE220A8397B1DCDAF, 0x6E789E6AA1B965F4, 0x06C45D188009454F)
+
+
+def test_stream_is_splitmix64() -> None:
+    stream = RandomStream(seed=0)
+    drawn: list[int] = []
+    for _ in SPLITMIX64_SEED_0:
+        value, stream = stream.next_u64()
+        drawn.append(value)
+    assert tuple(drawn) == SPLITMIX64_SEED_0
+    assert tuple(RandomStream(seed=0).draw_u64(3)[0].tolist()) == SPLITMIX64_SEED_0
+
+
+@pytest.mark.parametrize(
+    "stream", [RandomStream(seed=7), RandomStream(seed=MASK64, counter=MASK64 - 3)]
+)
+def test_batched_draws_and_jumps_match_sequential_draws(stream: RandomStream) -> None:
+    sequential: list[int] = []
+    rolled: RandomStream = stream
+    for _ in range(50):
+        roll, rolled = rolled.roll(sides=6)
+        sequential.append(roll)
+
+    rolls, batched = stream.roll_dice(count=50, sides=6)
+    assert list(rolls) == sequential
+    assert batched == rolled == stream.jump(50)
+    assert stream.draw_u64(50)[0].tolist() == [stream.peek(offset) for offset in range(50)]
+
+
+def test_split_streams_are_deterministic_and_distinct() -> None:
+    parent = RandomStream(seed=42)
+    children: list[RandomStream] = [parent.split(key) for key in range(100)]
+    assert children == [parent.split(key) for key in range(100)]
+    assert len({child.peek() for child in children}) == 100
+    assert parent.jump(1).split(0) != parent.split(0)
+
+
+def test_rolls_are_uniform_and_in_range() -> None:
+    rolls, _ = RandomStream(seed=3).roll_dice(count=100_000, sides=10)
+    counts: Counter[int] = Counter(rolls)
+    assert sorted(counts) == list(range(1, 11))
+    assert all(abs(count - 10_000) < 500 for count in counts.values())
+    with pytest.raises(ValueError):
+        RandomStream(seed=3).roll(sides=0)
+
+
+def test_rolls_are_identical_in_another_process() -> None:
+    script = (
+        "from src.engine.util.rng import RandomStream\n"
+        "print(RandomStream(seed=123, counter=456).split(9).roll_dice(count=20)[0])\n"
+    )
+    output: str = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONHASHSEED": "random"},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    expected = RandomStream(seed=123, counter=456).split(9).roll_dice(count=20)[0]
+    assert output.strip() == str(expected)
+
+
+def test_rolling_through_a_builder_advances_the_state_stream() -> None:
+    state: GameState = generate_state(config=SyntheticGameConfig(), seed=5)
+    builder = GameStateBuilder(state)
+    rolls: tuple[int, ...] = builder.roll_dice(count=8)
+    rolled: GameState = builder.freeze()
+
+    assert rolls == state.rng.roll_dice(count=8)[0]
+    assert rolled.rng == state.rng.jump(8)
+    assert rolled != state
@@ -0,0 +1,29 @@
+import sys
+
+from src.engine.core.game_state import GameState, Phase, System
+from src.engine.core.player import Player
+from src.engine.util.sizing import deep_getsizeof
+
+
+def test_shared_objects_are_counted_once() -> None:
+    payload = tuple(range(1000))
+    assert deep_getsizeof((payload, payload)) == deep_getsizeof((payload,)) + sys.getsizeof(
+        (payload, payload)
+    ) - sys.getsizeof((payload,))
+
+
+def test_state_size_grows_with_galaxy() -> None:
+    player = Player("A")
+    small = GameState(
+        players=(player,),
+        active_player=player,
+        phase=Phase.ACTION,
+        galaxy={System(id=0, command_tokens=())},
+    )
+    large = GameState(
+        players=(player,),
+        active_player=player,
+        phase=Phase.ACTION,
+        galaxy={System(id=i, command_tokens=()) for i in range(60)},
+    )
+    assert deep_getsizeof(large) > deep_getsizeof(small)